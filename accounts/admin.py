@@ -5,6 +5,7 @@ Admin configuration for accounts app with CRM-style enhancements.
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User, Group
+from django.db.models import Count, Q
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.utils import timezone
@@ -12,6 +13,31 @@ from .models import Profile
 from core.admin_utils import ROLE_COLORS, create_role_badge, UserBookingInline
 
 
+def booking_count_annotations(prefix=""):
+    """
+    Return total, upcoming and completed booking count annotations.
+
+    Args:
+        prefix (str): Lookup path to the user, e.g. 'user__' from Profile
+    """
+    bookings = f"{prefix}bookings"
+    return {
+        "booking_total": Count(bookings),
+        "upcoming_booking_total": Count(
+            bookings,
+            filter=Q(
+                **{
+                    f"{bookings}__session_slot__start_datetime__gte": timezone.now(),
+                    f"{bookings}__status__in": ["PENDING", "CONFIRMED"],
+                }
+            ),
+        ),
+        "completed_booking_total": Count(
+            bookings, filter=Q(**{f"{bookings}__status": "COMPLETED"})
+        ),
+    }
+
+
 class ProfileInline(admin.StackedInline):
     """Inline admin for Profile model within User admin."""
 
@@ -166,6 +192,15 @@ class UserAdmin(BaseUserAdmin):
         ),
     )
 
+    def get_queryset(self, request):
+        """Load profiles and booking counts with the user rows."""
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("profile")
+            .annotate(**booking_count_annotations())
+        )
+
     def get_full_name_display(self, obj):
         """Display user's full name."""
         full_name = obj.get_full_name()
@@ -187,11 +222,8 @@ class UserAdmin(BaseUserAdmin):
 
     def get_booking_count(self, obj):
         """Display user's booking count."""
-        total = obj.bookings.count()
-        upcoming = obj.bookings.filter(
-            session_slot__start_datetime__gte=timezone.now(),
-            status__in=["PENDING", "CONFIRMED"],
-        ).count()
+        total = obj.booking_total
+        upcoming = obj.upcoming_booking_total
 
         if total == 0:
             return format_html('<span style="color: #6c757d;">0</span>')
@@ -250,6 +282,15 @@ class ProfileAdmin(admin.ModelAdmin):
         ),
     )
 
+    def get_queryset(self, request):
+        """Load users and booking counts with the profile rows."""
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("user")
+            .annotate(**booking_count_annotations("user__"))
+        )
+
     def get_user_link(self, obj):
         """Display clickable link to user."""
         from django.urls import reverse
@@ -269,12 +310,9 @@ class ProfileAdmin(admin.ModelAdmin):
 
     def get_booking_count(self, obj):
         """Display booking statistics."""
-        total = obj.user.bookings.count()
-        upcoming = obj.user.bookings.filter(
-            session_slot__start_datetime__gte=timezone.now(),
-            status__in=["PENDING", "CONFIRMED"],
-        ).count()
-        completed = obj.user.bookings.filter(status="COMPLETED").count()
+        total = obj.booking_total
+        upcoming = obj.upcoming_booking_total
+        completed = obj.completed_booking_total
 
         return format_html(
             '<strong>{}</strong> total (<span style="color: #007bff;">{} upcoming</span>, <span style="color: #6c757d;">{} completed</span>)',
@@ -0,0 +1,27 @@
+"""
+Authentication backend that loads the user's profile with the user.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+
+class ProfileBackend(ModelBackend):
+    """
+    ModelBackend that fetches ``user.profile`` in the same query as the user.
+
+    The role checks in core.decorators and the role badge in the header all
+    read ``request.user.profile``; loading it here makes them free after the
+    one query that restores the user from the session.
+    """
+
+    def get_user(self, user_id):
+        try:
+            user = UserModel._default_manager.select_related("profile").get(
+                pk=user_id
+            )
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
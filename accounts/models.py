@@ -5,6 +5,37 @@ User account models for authentication and role management.
 from django.contrib.auth.models import User
 from django.db import models
 
+# Fields whose changes do not make a profile worth saving on their own
+UNTRACKED_PROFILE_FIELDS = ("id", "user_id", "created_at", "updated_at")
+
+
+class ProfileManager(models.Manager):
+    """Custom Manager for Profile model."""
+
+    def create_missing(self, user_ids=None, batch_size=1000):
+        """
+        Bulk create driver profiles for users that have none.
+
+        Users added with ``bulk_create`` skip the post_save signal that
+        normally creates their profile.
+
+        Args:
+            user_ids (iterable): Users to check; all users when None
+            batch_size (int): Rows per INSERT
+
+        Returns:
+            int: Number of profiles created
+        """
+        users = User.objects.filter(profile__isnull=True)
+        if user_ids is not None:
+            users = users.filter(pk__in=list(user_ids))
+        profiles = [
+            self.model(user_id=pk, role="DRIVER")
+            for pk in users.values_list("pk", flat=True)
+        ]
+        self.bulk_create(profiles, batch_size=batch_size)
+        return len(profiles)
+
 
 class Profile(models.Model):
     """
@@ -31,6 +62,8 @@ class Profile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProfileManager()
+
     class Meta:
         ordering = ["-created_at"]
         verbose_name = "User Profile"
@@ -39,6 +72,39 @@ class Profile(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.get_role_display()}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded values so changes can be detected."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Save the profile and treat the saved values as unchanged."""
+        super().save(*args, **kwargs)
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+        }
+
+    def get_changed_fields(self):
+        """
+        Return the names of fields changed since the profile was loaded.
+
+        Profiles that were never loaded or saved report every field.
+        """
+        loaded = getattr(self, "_loaded_values", None)
+        return [
+            field.attname
+            for field in self._meta.concrete_fields
+            if field.attname not in UNTRACKED_PROFILE_FIELDS
+            and (
+                loaded is None
+                or field.attname not in loaded
+                or getattr(self, field.attname) != loaded[field.attname]
+            )
+        ]
+
     def is_manager(self):
         """Check if user has manager role."""
         return self.role == "MANAGER"
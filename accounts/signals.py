@@ -1,5 +1,5 @@
 """
-Signal handlers for automatic profile creation.
+Signal handlers for automatic profile creation and saving.
 """
 
 from django.db.models.signals import post_save
@@ -18,10 +18,20 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
+def save_user_profile(sender, instance, created, **kwargs):
     """
-    Automatically save the Profile when the User is saved.
-    Only saves if profile exists to avoid RelatedObjectDoesNotExist errors.
+    Save the User's loaded Profile when its fields have been changed.
+
+    Profiles that were never loaded, or are unchanged, are left alone, so
+    routine User saves such as the last_login update on every login do not
+    write the profile too.
     """
-    if hasattr(instance, 'profile'):
-        instance.profile.save()
+    related = User.profile.related
+    if created or not related.is_cached(instance):
+        return
+    profile = related.get_cached_value(instance)
+    if profile is None or profile.pk is None:
+        return
+    changed = profile.get_changed_fields()
+    if changed:
+        profile.save(update_fields=changed + ["updated_at"])
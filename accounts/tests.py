@@ -303,3 +303,106 @@ class AuthenticationFlowTests(TestCase):
         # User should be logged out
         response = self.client.get(reverse("core:home"))
         self.assertFalse(response.context["user"].is_authenticated)
+
+
+class ProfileBackendTests(TestCase):
+    """Test that the authentication backend loads profiles with users."""
+
+    def setUp(self):
+        """Create a manager."""
+        self.manager = User.objects.create_user(
+            username="manager", password="testpass123"
+        )
+        self.manager.profile.role = "MANAGER"
+        self.manager.profile.save()
+
+    def test_get_user_loads_profile_in_one_query(self):
+        """Test that get_user() fetches the profile with the user."""
+        from .backends import ProfileBackend
+
+        with self.assertNumQueries(1):
+            user = ProfileBackend().get_user(self.manager.pk)
+            self.assertTrue(user.profile.is_manager())
+
+    def test_role_checks_do_not_query_profile(self):
+        """Test that role checks during a request reuse the loaded profile."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.client.login(username="manager", password="testpass123")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("bookings:booking_list"))
+
+        self.assertEqual(response.status_code, 200)
+        profile_queries = [
+            q["sql"]
+            for q in queries.captured_queries
+            if q["sql"].startswith('SELECT "accounts_profile"')
+        ]
+        self.assertEqual(profile_queries, [])
+
+    def test_sessions_from_model_backend_stay_signed_in(self):
+        """Test that sessions recorded against ModelBackend are still restored."""
+        self.client.force_login(
+            self.manager, backend="django.contrib.auth.backends.ModelBackend"
+        )
+        response = self.client.get(reverse("core:home"))
+        self.assertEqual(response.context["user"], self.manager)
+
+
+class ProfilePropagationTests(TestCase):
+    """Test that User saves only write the Profile when it has changed."""
+
+    def setUp(self):
+        """Create a driver."""
+        self.user = User.objects.create_user(username="driver", password="testpass123")
+
+    def profile_updates(self, func):
+        """Run func and return the UPDATE statements it ran on profiles."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            func()
+        return [
+            q["sql"]
+            for q in queries.captured_queries
+            if q["sql"].startswith('UPDATE "accounts_profile"')
+        ]
+
+    def test_login_does_not_write_profile(self):
+        """Test that the last_login update on login leaves the profile alone."""
+        updated_at = self.user.profile.updated_at
+        updates = self.profile_updates(
+            lambda: self.client.login(username="driver", password="testpass123")
+        )
+        self.assertEqual(updates, [])
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.user.profile.updated_at, updated_at)
+
+    def test_unchanged_profile_is_not_saved(self):
+        """Test that saving a user with a loaded, unchanged profile skips it."""
+        user = User.objects.select_related("profile").get(pk=self.user.pk)
+        user.first_name = "Alex"
+        self.assertEqual(self.profile_updates(user.save), [])
+
+    def test_changed_profile_is_saved_with_user(self):
+        """Test that profile changes are still saved through user.save()."""
+        user = User.objects.get(pk=self.user.pk)
+        user.profile.role = "MARSHAL"
+        updates = self.profile_updates(user.save)
+
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"role"', updates[0])
+        self.assertNotIn('"phone_number"', updates[0])
+        self.assertEqual(Profile.objects.get(user=user).role, "MARSHAL")
+
+    def test_create_missing_profiles_for_bulk_created_users(self):
+        """Test that bulk-created users get driver profiles in bulk."""
+        User.objects.bulk_create([User(username=f"bulk{i}") for i in range(3)])
+
+        self.assertEqual(Profile.objects.create_missing(), 3)
+        self.assertEqual(Profile.objects.create_missing(), 0)
+        self.assertTrue(
+            Profile.objects.filter(user__username="bulk0", role="DRIVER").exists()
+        )
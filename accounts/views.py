@@ -22,7 +22,7 @@ def register(request):
             user = form.save()
 
             # Log the user in automatically
-            login(request, user)
+            login(request, user, backend="accounts.backends.ProfileBackend")
 
             messages.success(
                 request,
@@ -6,8 +6,11 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
+from .exports import BOOKING_EXPORT_COLUMNS, booking_export_rows
 from .models import Booking
-from core.admin_utils import create_status_badge
+from core.exports import stream_export
+from core.admin_utils import create_status_badge, enqueue_admin_job
+from core.paginators import EstimatedCountPaginator
 
 
 @admin.register(Booking)
@@ -42,8 +45,11 @@ class BookingAdmin(admin.ModelAdmin):
     )
     readonly_fields = ("created_at", "updated_at", "get_booking_summary")
     date_hierarchy = "created_at"
+    date_hierarchy_rollup = "booking_count"
     ordering = ("-created_at",)
     list_per_page = 25
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     list_select_related = (
         "driver",
         "session_slot",
@@ -71,7 +77,13 @@ class BookingAdmin(admin.ModelAdmin):
         ),
     )
 
-    actions = ["confirm_bookings", "cancel_bookings", "complete_bookings"]
+    actions = [
+        "confirm_bookings",
+        "cancel_bookings",
+        "complete_bookings",
+        "export_csv",
+        "export_jsonl",
+    ]
 
     def get_driver_link(self, obj):
         """Display clickable driver link."""
@@ -137,76 +149,45 @@ class BookingAdmin(admin.ModelAdmin):
     get_status_badge.short_description = "Status"
 
     def confirm_bookings(self, request, queryset):
-        """Bulk action to confirm pending bookings."""
-        from django.db import transaction
-
-        confirmed_count = 0
-        for booking in queryset.filter(status="PENDING"):
-            if booking.can_be_confirmed():
-                # Wrap in transaction for data consistency
-                try:
-                    with transaction.atomic():
-                        # Try to assign kart
-                        if booking.assign_random_kart():
-                            booking.status = "CONFIRMED"
-                            booking.save()
-                            confirmed_count += 1
-                        else:
-                            self.message_user(
-                                request,
-                                f"Booking #{booking.id}: No available karts",
-                                level="warning",
-                            )
-                except Exception as e:
-                    self.message_user(
-                        request,
-                        f"Booking #{booking.id}: Error - {str(e)}",
-                        level="error",
-                    )
-
-        if confirmed_count:
-            self.message_user(request, f"{confirmed_count} booking(s) confirmed.")
+        """Bulk action to confirm pending bookings in the background."""
+        return enqueue_admin_job(
+            self, request, queryset, "bookings.confirm", "Confirm selected bookings"
+        )
 
     confirm_bookings.short_description = "Confirm selected bookings"
 
     def cancel_bookings(self, request, queryset):
-        """Bulk action to cancel bookings."""
-        cancelled_count = 0
-        for booking in queryset:
-            if booking.can_be_cancelled():
-                booking.status = "CANCELLED"
-                booking.save()
-                cancelled_count += 1
-
-        if cancelled_count:
-            self.message_user(request, f"{cancelled_count} booking(s) cancelled.")
-        else:
-            self.message_user(
-                request,
-                "No bookings could be cancelled (check if sessions have already started)",
-                level="warning",
-            )
+        """Bulk action to cancel bookings in the background."""
+        return enqueue_admin_job(
+            self, request, queryset, "bookings.cancel", "Cancel selected bookings"
+        )
 
     cancel_bookings.short_description = "Cancel selected bookings"
 
     def complete_bookings(self, request, queryset):
-        """Bulk action to mark bookings as completed."""
-        completed_count = 0
-        for booking in queryset.filter(status="CONFIRMED"):
-            if booking.can_be_completed():
-                booking.status = "COMPLETED"
-                booking.save()
-                completed_count += 1
-
-        if completed_count:
-            self.message_user(
-                request, f"{completed_count} booking(s) marked as completed."
-            )
-        else:
-            self.message_user(
-                request,
-                "No bookings could be completed (sessions must have ended)",
-                level="warning",
-            )
+        """Bulk action to mark bookings as completed in the background."""
+        return enqueue_admin_job(
+            self,
+            request,
+            queryset,
+            "bookings.complete",
+            "Mark selected bookings as completed",
+        )
 
     complete_bookings.short_description = "Mark selected bookings as completed"
+
+    def export_csv(self, request, queryset):
+        """Stream the selected bookings as CSV."""
+        return stream_export(
+            BOOKING_EXPORT_COLUMNS, booking_export_rows(queryset), "csv", "bookings"
+        )
+
+    export_csv.short_description = "Export selected bookings as CSV"
+
+    def export_jsonl(self, request, queryset):
+        """Stream the selected bookings as JSON Lines."""
+        return stream_export(
+            BOOKING_EXPORT_COLUMNS, booking_export_rows(queryset), "jsonl", "bookings"
+        )
+
+    export_jsonl.short_description = "Export selected bookings as JSON Lines"
@@ -0,0 +1,67 @@
+"""
+Streaming export of bookings for accounting.
+"""
+
+from core.exports import EXPORT_CHUNK_SIZE
+
+BOOKING_EXPORT_COLUMNS = [
+    "booking_id",
+    "status",
+    "created_at",
+    "driver_username",
+    "driver_email",
+    "driver_name",
+    "session_id",
+    "session_type",
+    "session_start",
+    "session_end",
+    "price",
+    "chosen_kart_number",
+    "assigned_kart_number",
+]
+
+
+def booking_export_rows(queryset):
+    """
+    Yield one tuple per booking in BOOKING_EXPORT_COLUMNS order.
+
+    Joins driver, session and kart in the same query and streams results
+    in chunks so the full result set is never held in memory.
+    """
+    queryset = (
+        queryset.select_related(None)
+        .select_related("driver", "session_slot", "assigned_kart")
+        .only(
+            "id",
+            "status",
+            "created_at",
+            "chosen_kart_number",
+            "driver__username",
+            "driver__email",
+            "driver__first_name",
+            "driver__last_name",
+            "session_slot__session_type",
+            "session_slot__start_datetime",
+            "session_slot__end_datetime",
+            "session_slot__price",
+            "assigned_kart__number",
+        )
+        .order_by("session_slot__start_datetime", "id")
+    )
+    for booking in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        session = booking.session_slot
+        yield (
+            booking.id,
+            booking.status,
+            booking.created_at.isoformat(),
+            booking.driver.username,
+            booking.driver.email,
+            booking.driver.get_full_name(),
+            booking.session_slot_id,
+            session.session_type,
+            session.start_datetime.isoformat(),
+            session.end_datetime.isoformat(),
+            session.price,
+            booking.chosen_kart_number,
+            booking.assigned_kart.number if booking.assigned_kart else None,
+        )
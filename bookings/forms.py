@@ -4,7 +4,8 @@ Forms for booking management.
 
 from django import forms
 from .models import Booking
-from karts.models import Kart
+from karts.roster import get_active_numbers, get_kart
+from core.forms import ExportFilterForm
 
 
 class BookingForm(forms.ModelForm):
@@ -41,11 +42,9 @@ class BookingForm(forms.ModelForm):
         self.fields["driver_notes"].required = False
 
         # Get list of active karts for help text
-        active_karts = Kart.objects.filter(status="ACTIVE").values_list(
-            "number", flat=True
-        )
+        active_karts = get_active_numbers()
         if active_karts:
-            kart_list = ", ".join(str(k) for k in sorted(active_karts))
+            kart_list = ", ".join(str(k) for k in active_karts)
             self.fields["chosen_kart_number"].help_text = (
                 f"Available karts: {kart_list}"
             )
@@ -56,18 +55,19 @@ class BookingForm(forms.ModelForm):
         """Validate chosen kart exists and is active."""
         kart_number = self.cleaned_data.get("chosen_kart_number")
         if kart_number:
-            try:
-                kart = Kart.objects.get(number=kart_number)
-                if not kart.is_available():
-                    raise forms.ValidationError(
-                        f"Kart #{kart_number} is currently in maintenance. "
-                        "Please choose another kart or leave blank for "
-                        "automatic assignment."
-                    )
-            except Kart.DoesNotExist:
+            kart = get_kart(kart_number)
+            if kart is None:
                 raise forms.ValidationError(
                     f"Kart #{kart_number} does not exist. "
-                    "Please choose from the available karts."
+                    "Please choose from the available karts.",
+                    code="kart",
+                )
+            if not kart.is_available():
+                raise forms.ValidationError(
+                    f"Kart #{kart_number} is currently in maintenance. "
+                    "Please choose another kart or leave blank for "
+                    "automatic assignment.",
+                    code="kart",
                 )
         return kart_number
 
@@ -82,3 +82,20 @@ class BookingForm(forms.ModelForm):
         # Skip the parent's _post_clean which calls instance.full_clean()
         # We'll validate manually in the view after all fields are set
         pass
+
+
+class BookingExportForm(ExportFilterForm):
+    """Filters for the streaming booking export."""
+
+    status = forms.MultipleChoiceField(
+        choices=Booking.STATUS_CHOICES,
+        required=False,
+        help_text="Limit to these statuses (default: all)",
+    )
+
+    def filter_queryset(self, queryset):
+        """Apply the date range and status filters."""
+        queryset = self.filter_date_range(queryset, "session_slot__start_datetime")
+        if self.cleaned_data.get("status"):
+            queryset = queryset.filter(status__in=self.cleaned_data["status"])
+        return queryset
@@ -0,0 +1,70 @@
+"""
+Background jobs for bulk booking actions queued from the admin.
+"""
+
+from django.db import transaction
+from core.jobs import register_job
+from .models import Booking
+
+
+@register_job("bookings.confirm")
+def confirm_bookings(job, ids):
+    """Confirm pending bookings and assign karts, one transaction per booking."""
+    for batch in job.batches(ids):
+        confirmed = 0
+        bookings = Booking.objects.filter(
+            pk__in=batch, status="PENDING"
+        ).select_related("session_slot", "driver")
+        for booking in bookings:
+            if not booking.can_be_confirmed():
+                continue
+            try:
+                with transaction.atomic():
+                    if booking.assign_random_kart():
+                        booking.status = "CONFIRMED"
+                        booking.save()
+                        confirmed += 1
+                    else:
+                        job.message(
+                            f"Booking #{booking.id}: No available karts", "warning"
+                        )
+            except Exception as e:
+                job.message(f"Booking #{booking.id}: Error - {str(e)}", "error")
+        job.advance(len(batch), confirmed=confirmed)
+
+
+@register_job("bookings.cancel")
+def cancel_bookings(job, ids):
+    """
+    Cancel bookings whose sessions have not started yet.
+
+    Saves each booking rather than updating in bulk, so the model checks
+    and the post_save receivers (pre-rendered pages and the like) still run.
+    """
+    for batch in job.batches(ids):
+        cancelled = 0
+        bookings = Booking.objects.filter(
+            pk__in=batch, status__in=["PENDING", "CONFIRMED"]
+        ).select_related("session_slot")
+        for booking in bookings:
+            if booking.can_be_cancelled():
+                booking.status = "CANCELLED"
+                booking.save()
+                cancelled += 1
+        job.advance(len(batch), cancelled=cancelled)
+
+
+@register_job("bookings.complete")
+def complete_bookings(job, ids):
+    """Mark confirmed bookings as completed once their sessions have ended."""
+    for batch in job.batches(ids):
+        completed = 0
+        bookings = Booking.objects.filter(
+            pk__in=batch, status="CONFIRMED"
+        ).select_related("session_slot")
+        for booking in bookings:
+            if booking.can_be_completed():
+                booking.status = "COMPLETED"
+                booking.save()
+                completed += 1
+        job.advance(len(batch), completed=completed)
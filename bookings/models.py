@@ -8,6 +8,7 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from sessions.models import SessionSlot
 from karts.models import Kart
+from karts.roster import get_kart
 
 
 class BookingQuerySet(models.QuerySet):
@@ -152,6 +153,8 @@ class Booking(models.Model):
             models.Index(fields=["driver", "session_slot"]),
             models.Index(fields=["session_slot", "status"]),
             models.Index(fields=["driver", "status"]),
+            # Admin changelist ordering and date hierarchy drill-down
+            models.Index(fields=["created_at"]),
         ]
 
     def __str__(self):
@@ -194,7 +197,10 @@ class Booking(models.Model):
         if self.session_slot and self.status in ["PENDING", "CONFIRMED"]:
             if self.session_slot.is_past():
                 raise ValidationError({
-                    "session_slot": "Cannot create bookings for sessions that have already ended."
+                    "session_slot": ValidationError(
+                        "Cannot create bookings for sessions that have already ended.",
+                        code="past",
+                    )
                 })
 
         # Confirmed bookings must have an assigned kart
@@ -211,7 +217,11 @@ class Booking(models.Model):
 
             if existing_bookings.count() >= self.session_slot.capacity:
                 raise ValidationError(
-                    {"session_slot": "This session is at full capacity."}
+                    {
+                        "session_slot": ValidationError(
+                            "This session is at full capacity.", code="full"
+                        )
+                    }
                 )
 
         # Check for driver overlap (same driver, overlapping time)
@@ -225,27 +235,33 @@ class Booking(models.Model):
 
             if overlapping.exists():
                 raise ValidationError(
-                    {"session_slot": "You already have a booking during this time."}
+                    {
+                        "session_slot": ValidationError(
+                            "You already have a booking during this time.",
+                            code="overlap",
+                        )
+                    }
                 )
 
         # Validate chosen kart exists and is active
         if self.chosen_kart_number:
-            try:
-                kart = Kart.objects.get(number=self.chosen_kart_number)
-                if not kart.is_available():
-                    raise ValidationError(
-                        {
-                            "chosen_kart_number": (
-                                f"Kart #{self.chosen_kart_number} is "
-                                "currently in maintenance."
-                            )
-                        }
-                    )
-            except Kart.DoesNotExist:
+            kart = get_kart(self.chosen_kart_number)
+            if kart is None:
                 raise ValidationError(
                     {
-                        "chosen_kart_number": (
-                            f"Kart #{self.chosen_kart_number} does not exist."
+                        "chosen_kart_number": ValidationError(
+                            f"Kart #{self.chosen_kart_number} does not exist.",
+                            code="kart",
+                        )
+                    }
+                )
+            if not kart.is_available():
+                raise ValidationError(
+                    {
+                        "chosen_kart_number": ValidationError(
+                            f"Kart #{self.chosen_kart_number} is "
+                            "currently in maintenance.",
+                            code="kart",
                         )
                     }
                 )
@@ -289,9 +305,11 @@ class Booking(models.Model):
 
         Uses row-level locking to prevent race conditions.
         Checks for time-overlapping sessions to prevent double-booking.
+        Kart status comes from the locked query, never the cached roster.
         """
         import random
         from django.db.models import Q
+        from core.metrics import lock_wait_timer, registry
 
         # Get all active karts with row-level lock to prevent race conditions
         available_karts = Kart.objects.filter(status="ACTIVE").select_for_update()
@@ -316,19 +334,21 @@ class Booking(models.Model):
 
         available_karts = available_karts.exclude(id__in=assigned_kart_ids)
 
+        # Lock and load the free karts in one query, timing the lock wait
+        with lock_wait_timer("assign_random_kart"):
+            karts_list = list(available_karts)
+
         # If driver chose a specific kart, try to assign it
         if self.chosen_kart_number:
-            try:
-                chosen_kart = available_karts.get(number=self.chosen_kart_number)
-                self.assigned_kart = chosen_kart
-                return True
-            except Kart.DoesNotExist:
-                pass
+            for kart in karts_list:
+                if kart.number == self.chosen_kart_number:
+                    self.assigned_kart = kart
+                    return True
 
         # Otherwise assign random available kart
-        if available_karts.exists():
-            karts_list = list(available_karts)
+        if karts_list:
             self.assigned_kart = random.choice(karts_list)
             return True
 
+        registry.inc("kartcontrol_kart_assignment_failures_total")
         return False
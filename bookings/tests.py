@@ -190,6 +190,22 @@ class BookingModelTests(TestCase):
         self.assertFalse(result)
         self.assertIsNone(booking.assigned_kart)
 
+    def test_assign_random_kart_checks_database_on_empty_roster(self):
+        """Test that a stale empty roster does not refuse a kart."""
+        from karts.roster import get_active_numbers
+
+        # Another worker loaded the roster while every kart was down
+        Kart.objects.all().update(status="MAINTENANCE")
+        self.assertEqual(get_active_numbers(), [])
+        # The karts came back without this process seeing a version bump
+        Kart.objects.all().update(status="ACTIVE")
+
+        booking = Booking.objects.create(
+            session_slot=self.future_session, driver=self.driver, status="PENDING"
+        )
+        self.assertTrue(booking.assign_random_kart())
+        self.assertEqual(booking.assigned_kart.status, "ACTIVE")
+
     def test_cancelled_bookings_skip_validation(self):
         """Test that cancelled bookings skip capacity validation."""
         # Fill session to capacity
@@ -405,3 +421,273 @@ class BookingViewTests(TestCase):
         )
 
         self.assertEqual(response.status_code, 200)
+
+
+class BookingBulkJobTests(TestCase):
+    """Test admin bulk actions queued as background jobs."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.track = Track.objects.create(
+            name="Test Track",
+            address="123 Test St",
+            phone="555-1234",
+        )
+        self.admin = User.objects.create_superuser(
+            username="admin", password="adminpass123", email="admin@test.com"
+        )
+        self.kart = Kart.objects.create(number=1, status="ACTIVE")
+        self.session = SessionSlot.objects.create(
+            track=self.track,
+            session_type="OPEN_SESSION",
+            start_datetime=timezone.now() + timedelta(days=1),
+            end_datetime=timezone.now() + timedelta(days=1, hours=1),
+            capacity=10,
+            price=25.00,
+        )
+        self.bookings = [
+            Booking.objects.create(
+                session_slot=self.session,
+                driver=User.objects.create_user(username=f"driver{i}"),
+            )
+            for i in range(3)
+        ]
+        self.client.force_login(self.admin)
+
+    def run_action(self, action):
+        """Post an admin action for all bookings and return the response."""
+        return self.client.post(
+            reverse("admin:bookings_booking_changelist"),
+            {
+                "action": action,
+                "_selected_action": [b.pk for b in self.bookings],
+            },
+        )
+
+    def test_action_enqueues_job_without_touching_rows(self):
+        """Test that a bulk action only queues a job."""
+        from core.models import Job
+
+        response = self.run_action("cancel_bookings")
+        job = Job.objects.get()
+        self.assertRedirects(
+            response,
+            reverse("admin:core_job_change", args=[job.pk]),
+            fetch_redirect_response=False,
+        )
+        self.assertEqual(job.status, "QUEUED")
+        self.assertEqual(job.total, 3)
+        self.assertEqual(Booking.objects.filter(status="PENDING").count(), 3)
+
+    def test_worker_processes_job_in_batches(self):
+        """Test that the worker applies the action and records progress."""
+        from io import StringIO
+        from django.core.management import call_command
+        from django.test import override_settings
+        from core.models import Job
+
+        self.run_action("cancel_bookings")
+        with override_settings(JOB_BATCH_SIZE=2):
+            call_command("run_worker", "--once", stdout=StringIO())
+
+        job = Job.objects.get()
+        self.assertEqual(job.status, "SUCCEEDED")
+        self.assertEqual(job.processed, 3)
+        self.assertEqual(job.result["counts"]["cancelled"], 3)
+        self.assertEqual(Booking.objects.filter(status="CANCELLED").count(), 3)
+
+        response = self.client.get(reverse("admin:core_job_change", args=[job.pk]))
+        self.assertContains(response, "Succeeded")
+
+    def test_cancel_job_saves_each_booking(self):
+        """Test that the cancel job runs post_save receivers for each row."""
+        from django.db.models.signals import post_save
+        from core.jobs import run_next_job
+
+        saved = []
+
+        def record(sender, instance, **kwargs):
+            saved.append(instance.pk)
+
+        post_save.connect(record, sender=Booking)
+        self.addCleanup(post_save.disconnect, record, sender=Booking)
+        self.run_action("cancel_bookings")
+        job = run_next_job()
+
+        self.assertEqual(job.result["counts"]["cancelled"], 3)
+        self.assertEqual(sorted(saved), sorted(b.pk for b in self.bookings))
+
+    def test_confirm_job_reports_kart_shortage(self):
+        """Test that rows without a free kart are reported, not failed."""
+        from core.jobs import run_next_job
+
+        self.run_action("confirm_bookings")
+        job = run_next_job()
+
+        self.assertEqual(job.status, "SUCCEEDED")
+        self.assertEqual(job.result["counts"]["confirmed"], 1)
+        self.assertEqual(len(job.result["messages"]), 2)
+        self.assertEqual(Booking.objects.filter(status="CONFIRMED").count(), 1)
+
+    def test_stale_running_job_is_failed(self):
+        """Test that a job left RUNNING by a dead worker is failed."""
+        from django.test import override_settings
+        from core.jobs import claim_next_job
+        from core.models import Job
+
+        self.run_action("cancel_bookings")
+        self.run_action("complete_bookings")
+        stale, fresh = Job.objects.order_by("pk")
+        Job.objects.filter(pk=stale.pk).update(
+            status="RUNNING", updated_at=timezone.now() - timedelta(hours=1)
+        )
+
+        with override_settings(JOB_STALE_TIMEOUT=600):
+            claimed = claim_next_job()
+
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, "FAILED")
+        self.assertIn("no progress", stale.error)
+        self.assertIsNotNone(stale.finished_at)
+        self.assertEqual(claimed.pk, fresh.pk)
+        self.assertEqual(claimed.status, "RUNNING")
+
+    def test_late_finish_keeps_stale_failure(self):
+        """Test that a worker finishing after its job was failed does not revive it."""
+        from core.jobs import claim_next_job, fail_stale_jobs, run_job
+        from core.models import Job
+
+        self.run_action("cancel_bookings")
+        job = claim_next_job()
+        Job.objects.filter(pk=job.pk).update(
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+        fail_stale_jobs()
+
+        job = run_job(job)
+        self.assertEqual(job.status, "FAILED")
+        self.assertEqual(Job.objects.get(pk=job.pk).status, "FAILED")
+
+    def test_manager_without_job_permission_sees_status_page(self):
+        """Test that a manager is not refused the page a queued job redirects to."""
+        from django.contrib.auth.models import Permission
+
+        manager = User.objects.create_user(username="manager", is_staff=True)
+        manager.profile.role = "MANAGER"
+        manager.profile.save()
+        manager.user_permissions.add(
+            *Permission.objects.filter(
+                codename__in=["view_booking", "change_booking"]
+            )
+        )
+        self.client.force_login(manager)
+
+        response = self.run_action("cancel_bookings")
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.client.get(response["Location"]).status_code, 200)
+
+
+class BookingExportTests(TestCase):
+    """Test streaming booking exports."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.track = Track.objects.create(
+            name="Test Track",
+            address="123 Test St",
+            phone="555-1234",
+        )
+        self.manager = User.objects.create_user(
+            username="manager", password="testpass123"
+        )
+        self.manager.profile.role = "MANAGER"
+        self.manager.profile.save()
+        self.driver = User.objects.create_user(
+            username="testdriver", password="testpass123", email="d@test.com"
+        )
+        self.kart = Kart.objects.create(number=7, status="ACTIVE")
+        self.session = SessionSlot.objects.create(
+            track=self.track,
+            session_type="GRAND_PRIX",
+            start_datetime=timezone.now() + timedelta(days=1),
+            end_datetime=timezone.now() + timedelta(days=1, hours=1),
+            capacity=10,
+            price=55.00,
+        )
+        self.confirmed = Booking.objects.create(
+            session_slot=self.session,
+            driver=self.driver,
+            status="CONFIRMED",
+            assigned_kart=self.kart,
+        )
+        self.cancelled = Booking.objects.create(
+            session_slot=self.session,
+            driver=User.objects.create_user(username="other"),
+            status="CANCELLED",
+        )
+
+    def read_stream(self, response):
+        """Join a streaming response body into text."""
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_requires_manager(self):
+        """Test that drivers cannot export bookings."""
+        self.client.login(username="testdriver", password="testpass123")
+        response = self.client.get(reverse("bookings:booking_export"))
+        self.assertEqual(response.status_code, 302)
+
+    def test_export_csv_with_status_filter(self):
+        """Test CSV export streams filtered rows with related fields."""
+        self.client.login(username="manager", password="testpass123")
+        response = self.client.get(
+            reverse("bookings:booking_export"), {"status": "CONFIRMED"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        lines = self.read_stream(response).strip().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith("booking_id,status"))
+        self.assertIn("testdriver,d@test.com", lines[1])
+        self.assertTrue(lines[1].endswith(",7"))
+
+    def test_export_jsonl_date_range(self):
+        """Test JSON Lines export and an empty date range."""
+        import json
+
+        self.client.login(username="manager", password="testpass123")
+        response = self.client.get(
+            reverse("bookings:booking_export"), {"format": "jsonl"}
+        )
+        rows = [json.loads(line) for line in self.read_stream(response).splitlines()]
+        self.assertEqual(
+            {r["booking_id"] for r in rows}, {self.confirmed.pk, self.cancelled.pk}
+        )
+
+        past = (timezone.localdate() - timedelta(days=10)).isoformat()
+        response = self.client.get(
+            reverse("bookings:booking_export"),
+            {"format": "jsonl", "start": past, "end": past},
+        )
+        self.assertEqual(self.read_stream(response), "")
+
+    def test_export_invalid_filters(self):
+        """Test that bad filters are rejected."""
+        self.client.login(username="manager", password="testpass123")
+        response = self.client.get(
+            reverse("bookings:booking_export"), {"status": "BOGUS"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_admin_export_action(self):
+        """Test the admin export action streams the selected bookings."""
+        admin_user = User.objects.create_superuser(
+            username="admin", password="adminpass123", email="admin@test.com"
+        )
+        self.client.force_login(admin_user)
+        response = self.client.post(
+            reverse("admin:bookings_booking_changelist"),
+            {"action": "export_csv", "_selected_action": [self.confirmed.pk]},
+        )
+        lines = self.read_stream(response).strip().splitlines()
+        self.assertEqual(len(lines), 2)
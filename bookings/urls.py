@@ -16,4 +16,5 @@ urlpatterns = [
     # Manager actions (now handled via Django admin)
     path("<int:pk>/confirm/", views.booking_confirm, name="booking_confirm"),
     path("<int:pk>/complete/", views.booking_complete, name="booking_complete"),
+    path("export/", views.booking_export, name="booking_export"),
 ]
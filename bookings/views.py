@@ -6,10 +6,32 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.core.exceptions import ValidationError
+from django.http import HttpResponseBadRequest
+from .exports import BOOKING_EXPORT_COLUMNS, booking_export_rows
 from .models import Booking
-from .forms import BookingForm
+from .forms import BookingExportForm, BookingForm
 from sessions.models import SessionSlot
 from core.decorators import is_manager
+from core.exports import stream_export
+from core.metrics import lock_wait_timer, record_admission
+
+# ValidationError codes raised by Booking.clean() that have a metrics reason
+ADMISSION_REJECTION_CODES = ("full", "overlap", "past", "kart")
+
+
+def get_rejection_reason(error_dict):
+    """
+    Return the admission metrics reason for a failed booking.
+
+    Args:
+        error_dict (dict): Field name to list of ValidationError, as in
+            ``form.errors.as_data()`` or ``ValidationError.error_dict``
+    """
+    for errors in error_dict.values():
+        for error in errors:
+            if error.code in ADMISSION_REJECTION_CODES:
+                return error.code
+    return "invalid"
 
 
 @login_required
@@ -61,6 +83,8 @@ def booking_create(request, session_id):
 
     # Check if session is in the past
     if session.is_past():
+        if request.method == "POST":
+            record_admission("rejected", "past")
         messages.error(request, "Cannot book past sessions.")
         return redirect("sessions:session_detail", pk=session_id)
 
@@ -76,7 +100,10 @@ def booking_create(request, session_id):
                 # Use atomic transaction with row locking to prevent race conditions
                 with transaction.atomic():
                     # Lock the session row to prevent concurrent bookings
-                    session = SessionSlot.objects.select_for_update().get(pk=session_id)
+                    with lock_wait_timer("booking_create"):
+                        session = SessionSlot.objects.select_for_update().get(
+                            pk=session_id
+                        )
 
                     # Check capacity inside transaction
                     existing_count = session.bookings.filter(
@@ -84,6 +111,7 @@ def booking_create(request, session_id):
                     ).count()
 
                     if existing_count >= session.capacity:
+                        record_admission("rejected", "full")
                         messages.error(request, "This session is fully booked.")
                         return redirect("sessions:session_detail", pk=session_id)
 
@@ -96,6 +124,7 @@ def booking_create(request, session_id):
                     # Save the booking
                     booking.save()
 
+                record_admission("accepted")
                 messages.success(
                     request,
                     "Your booking has been created successfully. "
@@ -104,6 +133,9 @@ def booking_create(request, session_id):
                 return redirect("bookings:booking_detail", pk=booking.pk)
 
             except ValidationError as e:
+                record_admission(
+                    "rejected", get_rejection_reason(getattr(e, "error_dict", {}))
+                )
                 # Display validation errors from model
                 if hasattr(e, 'message_dict'):
                     for field, errors in e.message_dict.items():
@@ -111,6 +143,8 @@ def booking_create(request, session_id):
                             messages.error(request, error)
                 else:
                     messages.error(request, str(e))
+        else:
+            record_admission("rejected", get_rejection_reason(form.errors.as_data()))
     else:
         form = BookingForm()
 
@@ -248,3 +282,23 @@ def booking_complete(request, pk):
         request, f"Booking for {booking.driver.username} has been marked as completed."
     )
     return redirect("bookings:booking_detail", pk=booking.pk)
+
+
+@login_required
+@user_passes_test(is_manager)
+def booking_export(request):
+    """
+    Stream bookings as CSV or JSON Lines for accounting.
+    Manager-only. Filters: format, start, end (session dates) and status.
+    """
+    form = BookingExportForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest(form.errors.as_text())
+
+    bookings = form.filter_queryset(Booking.objects.all())
+    return stream_export(
+        BOOKING_EXPORT_COLUMNS,
+        booking_export_rows(bookings),
+        form.cleaned_data["format"],
+        "bookings",
+    )
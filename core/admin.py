@@ -2,8 +2,23 @@
 Custom admin configuration with operational dashboard.
 """
 
+import json
+
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import FileResponse, Http404, HttpResponse
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
 from django.utils import timezone
+from django.utils.html import format_html, format_html_join
 from datetime import timedelta
+from .admin_utils import create_job_status_badge
+from .decorators import is_manager
+from .models import Job
+from .profiling import format_profile, get_profile_path, list_profiles
+from .sqlstats import query_stats
 
 
 def setup_admin_dashboard(site):
@@ -24,7 +39,8 @@ def setup_admin_dashboard(site):
 
         # Today's sessions
         todays_sessions = (
-            SessionSlot.objects.filter(start_datetime__date=today)
+            SessionSlot.objects.with_booking_counts()
+            .filter(start_datetime__date=today)
             .select_related("track")
             .prefetch_related("bookings")
             .order_by("start_datetime")
@@ -39,9 +55,8 @@ def setup_admin_dashboard(site):
 
         # Upcoming sessions (next 7 days)
         upcoming_sessions = (
-            SessionSlot.objects.filter(
-                start_datetime__gte=now, start_datetime__lte=next_week
-            )
+            SessionSlot.objects.with_booking_counts()
+            .filter(start_datetime__gte=now, start_datetime__lte=next_week)
             .select_related("track")
             .prefetch_related("bookings")
             .order_by("start_datetime")[:20]
@@ -90,3 +105,186 @@ def setup_admin_dashboard(site):
 
     # Replace index method
     site.index = custom_index
+
+    def sql_stats(request):
+        """Manager-only page of SQL fingerprint statistics."""
+        if not is_manager(request.user):
+            raise PermissionDenied
+        if request.method == "POST":
+            query_stats.reset()
+            messages.success(request, "SQL statistics reset.")
+            return redirect("admin:sql_stats")
+
+        snapshot = query_stats.snapshot()
+        if request.GET.get("format") == "json":
+            response = HttpResponse(
+                json.dumps(snapshot, indent=2, cls=DjangoJSONEncoder),
+                content_type="application/json",
+            )
+            filename = f"sql-stats-{timezone.now():%Y%m%d-%H%M%S}.json"
+            response["Content-Disposition"] = f'attachment; filename="{filename}"'
+            return response
+
+        context = {
+            **site.each_context(request),
+            "title": "SQL Statistics",
+            "stats": snapshot,
+        }
+        return TemplateResponse(request, "admin/sql_stats.html", context)
+
+    def profiles(request):
+        """Manager-only list of saved request profiles."""
+        if not is_manager(request.user):
+            raise PermissionDenied
+        context = {
+            **site.each_context(request),
+            "title": "Request Profiles",
+            "profiles": list_profiles(),
+        }
+        return TemplateResponse(request, "admin/profiles.html", context)
+
+    def profile_detail(request, name):
+        """Download a saved profile, or show it as text with ?format=text."""
+        if not is_manager(request.user):
+            raise PermissionDenied
+        profile_path = get_profile_path(name)
+        if profile_path is None:
+            raise Http404("Profile not found")
+        if request.GET.get("format") == "text":
+            sort = request.GET.get("sort", "cumulative")
+            if sort not in ("cumulative", "tottime", "calls"):
+                sort = "cumulative"
+            return HttpResponse(
+                format_profile(profile_path, sort=sort),
+                content_type="text/plain; charset=utf-8",
+            )
+        return FileResponse(open(profile_path, "rb"), as_attachment=True)
+
+    # Add the SQL statistics and profile pages to the admin URLs
+    original_get_urls = site.get_urls
+
+    def get_urls():
+        return [
+            path("sql-stats/", site.admin_view(sql_stats), name="sql_stats"),
+            path("profiles/", site.admin_view(profiles), name="profiles"),
+            path(
+                "profiles/<str:name>/",
+                site.admin_view(profile_detail),
+                name="profile_detail",
+            ),
+        ] + original_get_urls()
+
+    site.get_urls = get_urls
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """Read-only status pages for background jobs queued by admin actions."""
+
+    list_display = (
+        "id",
+        "description",
+        "get_status_badge",
+        "get_progress",
+        "created_by",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("status", "name")
+    list_select_related = ("created_by",)
+    readonly_fields = (
+        "name",
+        "description",
+        "get_status_badge",
+        "get_progress",
+        "get_results",
+        "error",
+        "created_by",
+        "created_at",
+        "started_at",
+        "finished_at",
+    )
+    fieldsets = (
+        (None, {"fields": ("description", "get_status_badge", "get_progress")}),
+        ("Results", {"fields": ("get_results", "error")}),
+        (
+            "Details",
+            {
+                "fields": (
+                    "name",
+                    "created_by",
+                    "created_at",
+                    "started_at",
+                    "finished_at",
+                ),
+                "classes": ("collapse",),
+            },
+        ),
+    )
+
+    def has_add_permission(self, request):
+        """Jobs are only created by admin actions."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """Jobs are read-only once queued."""
+        return False
+
+    def has_view_permission(self, request, obj=None):
+        """Managers can always follow a queued job to its status page."""
+        return is_manager(request.user) or super().has_view_permission(request, obj)
+
+    def get_status_badge(self, obj):
+        """Display status with color badge."""
+        return create_job_status_badge(obj.status, obj.get_status_display())
+
+    get_status_badge.short_description = "Status"
+    get_status_badge.admin_order_field = "status"
+
+    def get_progress(self, obj):
+        """Display processed rows as a progress bar."""
+        percent = obj.get_progress_percent()
+        return format_html(
+            '<div style="background: #e9ecef; border-radius: 4px; width: 200px;">'
+            '<div style="background: #007bff; color: white; border-radius: 4px; '
+            'padding: 2px 6px; width: {}%; white-space: nowrap;">{}%</div></div>'
+            '<small>{} of {} rows</small>',
+            percent,
+            percent,
+            obj.processed,
+            obj.total,
+        )
+
+    get_progress.short_description = "Progress"
+
+    def get_results(self, obj):
+        """Display result counts and per-row messages."""
+        counts = obj.result.get("counts", {})
+        messages = obj.result.get("messages", [])
+        if not counts and not messages:
+            return format_html('<span style="color: #999;">No results yet</span>')
+        return format_html(
+            "<ul>{}</ul><ul>{}</ul>",
+            format_html_join(
+                "",
+                "<li><strong>{}</strong>: {}</li>",
+                (
+                    (key.replace("_", " ").capitalize(), value)
+                    for key, value in counts.items()
+                ),
+            ),
+            format_html_join(
+                "",
+                "<li>{}: {}</li>",
+                ((m["level"].upper(), m["text"]) for m in messages),
+            ),
+        )
+
+    get_results.short_description = "Results"
+
+    def change_view(self, request, object_id, form_url="", extra_context=None):
+        """Refresh the status page automatically until the job finishes."""
+        job = self.get_object(request, object_id)
+        extra_context = extra_context or {}
+        extra_context["auto_refresh"] = bool(job and not job.is_finished())
+        return super().change_view(request, object_id, form_url, extra_context)
@@ -6,9 +6,12 @@ This module provides reusable utilities for:
 - Badge generation for status/role displays
 - Summary box generation for admin views
 - Shared admin inline classes
+- Queuing admin actions as background jobs
 """
 
 from django.contrib import admin
+from django.shortcuts import redirect
+from django.urls import reverse
 from django.utils.html import format_html
 
 # =============================================================================
@@ -39,6 +42,13 @@ SESSION_TYPE_COLORS = {
     'GRAND_PRIX': '#ffc107',    # Warning yellow
 }
 
+JOB_STATUS_COLORS = {
+    'QUEUED': '#6c757d',      # Gray
+    'RUNNING': '#007bff',     # Blue
+    'SUCCEEDED': '#28a745',   # Green
+    'FAILED': '#dc3545',      # Red
+}
+
 
 # =============================================================================
 # BADGE GENERATION UTILITIES
@@ -151,6 +161,26 @@ def create_session_type_badge(session_type, type_display=None):
     return create_badge(display_text, color, title=f'Session type: {display_text}')
 
 
+def create_job_status_badge(status, status_display=None):
+    """
+    Create a badge for a background job status.
+
+    Args:
+        status (str): The status code (e.g., 'QUEUED', 'RUNNING')
+        status_display (str, optional): Human-readable status text
+
+    Returns:
+        SafeString: HTML-safe formatted job status badge
+
+    Example:
+        >>> create_job_status_badge('RUNNING', 'Running')
+        '<span style="...">Running</span>'
+    """
+    color = JOB_STATUS_COLORS.get(status, '#6c757d')  # Default to gray
+    display_text = status_display or status
+    return create_badge(display_text, color, title=f'Job status: {display_text}')
+
+
 # =============================================================================
 # SUMMARY BOX GENERATION UTILITIES
 # =============================================================================
@@ -255,3 +285,44 @@ class SessionBookingInline(BaseBookingInline):
     model = Booking
     fields = ("driver", "status", "assigned_kart", "created_at")
     verbose_name_plural = "Bookings for this Session"
+
+
+# =============================================================================
+# BACKGROUND JOB ACTIONS
+# =============================================================================
+
+def enqueue_admin_job(modeladmin, request, queryset, name, description, **payload):
+    """
+    Queue an admin bulk action as a background job.
+
+    Args:
+        modeladmin (ModelAdmin): The admin running the action
+        request (HttpRequest): The current request
+        queryset (QuerySet): The selected rows
+        name (str): Registered job handler name
+        description (str): Summary shown on the job status page
+        **payload: Extra keyword arguments passed to the handler
+
+    Returns:
+        HttpResponseRedirect: Redirect to the job status page
+
+    Example:
+        >>> enqueue_admin_job(self, request, queryset, 'bookings.cancel',
+        ...                   'Cancel selected bookings')
+    """
+    from core.jobs import enqueue
+
+    ids = list(queryset.values_list('pk', flat=True))
+    job = enqueue(
+        name,
+        payload={'ids': ids, **payload},
+        description=description,
+        total=len(ids),
+        user=request.user,
+    )
+    modeladmin.message_user(
+        request,
+        f'Queued job #{job.pk} for {len(ids)} row(s). '
+        'Progress is shown below and updates automatically.',
+    )
+    return redirect(reverse('admin:core_job_change', args=[job.pk]))
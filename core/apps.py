@@ -0,0 +1,20 @@
+"""
+Core app configuration.
+"""
+
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    """Configuration for the core app."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "core"
+
+    def ready(self):
+        """Import signals and register background job handlers."""
+        from django.utils.module_loading import autodiscover_modules
+
+        import core.signals  # noqa: F401
+
+        autodiscover_modules("jobs")
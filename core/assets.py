@@ -0,0 +1,162 @@
+"""
+Minified, fingerprinted CSS and JavaScript bundles for the site.
+
+ASSET_BUNDLES maps each bundle name to its source files in the static
+directories. ``BundledManifestStaticFilesStorage`` builds the bundles during
+``collectstatic``, then hashes and compresses them with every other static
+file. Templates link a bundle with the ``{% bundle %}`` tag (see
+core.templatetags.assets). The tag emits the one hashed file once
+collectstatic has built it, and otherwise the source files one by one, as in
+development and tests. WhiteNoise
+serves hashed files with a far-future ``immutable`` Cache-Control header, so
+browsers never ask for them again.
+"""
+
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.files.base import ContentFile
+from django.templatetags.static import static
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+# Directory under STATIC_ROOT that built bundles are written to
+BUNDLE_DIR = "bundles"
+
+DEFAULT_ASSET_BUNDLES = {
+    "site.css": ["css/style.css"],
+    "site.js": ["js/main.js"],
+    "admin.css": ["css/admin-custom.css"],
+}
+
+# Bootstrap and Font Awesome files linked from base.html
+CDN_ASSETS = [
+    "https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css",
+    "https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js",
+    "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css",
+]
+
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_STRING = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""")
+_CSS_PUNCTUATION = re.compile(r"\s*([{};,>])\s*")
+
+
+def get_bundles():
+    """Return the configured bundles as {name: [source paths]}."""
+    return getattr(settings, "ASSET_BUNDLES", DEFAULT_ASSET_BUNDLES)
+
+
+def get_bundle_path(name):
+    """Return the static path a bundle is built to."""
+    return f"{BUNDLE_DIR}/{name}"
+
+
+def minify_css(source):
+    """Strip comments and whitespace from CSS, leaving quoted strings alone."""
+    parts = _CSS_STRING.split(_CSS_COMMENT.sub("", source))
+    # Even indexes are CSS, odd ones the strings split out between them
+    for index in range(0, len(parts), 2):
+        text = re.sub(r"\s+", " ", parts[index])
+        parts[index] = _CSS_PUNCTUATION.sub(r"\1", text).replace(";}", "}")
+    return "".join(parts).strip()
+
+
+def _ends_in_template(line, in_template):
+    """Return True if a JavaScript line ends inside a template literal."""
+    quote = "`" if in_template else None
+    index = 0
+    while index < len(line):
+        char = line[index]
+        if char == "\\":
+            index += 2
+            continue
+        if quote is None:
+            if char in "'\"`":
+                quote = char
+            elif line.startswith("//", index):
+                break
+        elif char == quote:
+            quote = None
+        index += 1
+    return quote == "`"
+
+
+def minify_js(source):
+    """
+    Drop comment-only lines, indentation and blank lines from JavaScript.
+
+    Deliberately conservative: statements are never rewritten, and lines
+    inside a multi-line template literal are kept exactly as written, so the
+    output behaves like the source. Backticks inside regex literals or
+    ``${...}`` expressions are not tracked, so avoid them in bundled files.
+    """
+    lines = []
+    in_template = False
+    for line in source.splitlines():
+        if in_template:
+            lines.append(line)
+            in_template = _ends_in_template(line, True)
+        elif line.strip() and not line.lstrip().startswith("//"):
+            in_template = _ends_in_template(line, False)
+            # Trailing spaces of a line that opens a literal belong to it
+            lines.append(line.lstrip() if in_template else line.strip())
+    return "\n".join(lines)
+
+
+def build_bundle(name, read):
+    """
+    Concatenate and minify a bundle's sources.
+
+    Args:
+        name (str): Bundle name; its extension picks the minifier
+        read (callable): Returns the text of a static path
+
+    Returns:
+        str: Bundle content
+    """
+    if name.endswith(".css"):
+        return "\n".join(minify_css(read(path)) for path in get_bundles()[name])
+    # A semicolon between files stops one file's last statement running on
+    return ";\n".join(minify_js(read(path)) for path in get_bundles()[name])
+
+
+def is_bundle_built(name):
+    """Return True if collectstatic built and hashed the bundle."""
+    if not getattr(staticfiles_storage, "builds_bundles", False):
+        return False
+    return get_bundle_path(name) in staticfiles_storage.hashed_files
+
+
+def get_bundle_urls(name):
+    """Return the URLs a template should load for a bundle."""
+    if is_bundle_built(name):
+        return [static(get_bundle_path(name))]
+    return [static(path) for path in get_bundles()[name]]
+
+
+class BundledManifestStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """
+    WhiteNoise's compressed manifest storage that also builds ASSET_BUNDLES
+    from the collected sources before hashing.
+    """
+
+    builds_bundles = True
+
+    # Fall back to unhashed names rather than failing the page when
+    # collectstatic has not run (the cause of past 500s on Heroku)
+    manifest_strict = False
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            for name in get_bundles():
+                path = get_bundle_path(name)
+                content = build_bundle(name, self._read_text)
+                if self.exists(path):
+                    self.delete(path)
+                self._save(path, ContentFile(content.encode()))
+                paths[path] = (self, path)
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+
+    def _read_text(self, path):
+        with self.open(path) as source:
+            return source.read().decode()
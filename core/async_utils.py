@@ -0,0 +1,27 @@
+"""
+Helpers for the async views served under ASGI (see ASYNC_VIEWS).
+
+Async views read the schedule with the async ORM (``aiterator``,
+``acount``) so the event loop is free while the database answers. Anything
+that may still touch the database synchronously, such as resolving
+``request.user``, context processors and templates, is run in a thread.
+"""
+
+from asgiref.sync import sync_to_async
+from django.shortcuts import render
+
+
+async def aget_user(request):
+    """Return request.user, loading it from the session in a thread."""
+
+    def load_user():
+        # Evaluates the lazy object so later reads need no query
+        request.user.is_authenticated
+        return request.user
+
+    return await sync_to_async(load_user)()
+
+
+async def arender(request, template_name, context=None):
+    """Async counterpart of django.shortcuts.render."""
+    return await sync_to_async(render)(request, template_name, context)
@@ -0,0 +1,220 @@
+"""
+Benchmark harness for the hot views.
+
+Drives each view through the Django test client, recording wall time
+percentiles, query counts and query time. Reports are plain dicts so they
+can be written as JSON and compared against a stored baseline.
+"""
+
+import platform
+import statistics
+import time
+
+import django
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from bookings.models import Booking
+from sessions.models import SessionSlot
+from .stats import percentile
+
+# Relative slowdown of a view's p95 time that counts as a regression
+DEFAULT_REGRESSION_THRESHOLD = 0.25
+
+# Timings below this are treated as noise when comparing reports
+MIN_COMPARABLE_MS = 5.0
+
+BENCHMARK_USERNAMES = {
+    "manager": "benchmark_manager",
+    "admin": "benchmark_admin",
+}
+
+
+def get_benchmark_users():
+    """
+    Return a user per role, creating the manager and admin accounts.
+
+    The driver is the one with the most bookings, so driver views are
+    measured at their worst.
+    """
+    manager, created = User.objects.get_or_create(
+        username=BENCHMARK_USERNAMES["manager"]
+    )
+    if created or not manager.profile.is_manager():
+        manager.profile.role = "MANAGER"
+        manager.profile.save()
+    admin = User.objects.filter(username=BENCHMARK_USERNAMES["admin"]).first()
+    if admin is None:
+        admin = User.objects.create_superuser(
+            username=BENCHMARK_USERNAMES["admin"], email="", password=None
+        )
+    driver = (
+        User.objects.filter(profile__role="DRIVER")
+        .annotate(booking_total=Count("bookings"))
+        .order_by("-booking_total")
+        .first()
+    )
+    return {"anonymous": None, "driver": driver, "manager": manager, "admin": admin}
+
+
+def get_benchmark_views():
+    """
+    Return the (name, role, url) cases to measure.
+
+    Session detail uses the busiest upcoming session.
+    """
+    session = (
+        SessionSlot.objects.filter(start_datetime__gte=timezone.now())
+        .annotate(booking_total=Count("bookings"))
+        .order_by("-booking_total", "start_datetime")
+        .first()
+    )
+    views = [
+        ("home", "anonymous", reverse("core:home")),
+        ("home", "driver", reverse("core:home")),
+        ("session_list", "anonymous", reverse("sessions:session_list")),
+        ("session_list", "driver", reverse("sessions:session_list")),
+        ("session_feed", "anonymous", reverse("sessions:session_feed")),
+        ("booking_list", "driver", reverse("bookings:booking_list")),
+        ("admin_index", "admin", reverse("admin:index")),
+        (
+            "admin_booking_changelist",
+            "admin",
+            reverse("admin:bookings_booking_changelist"),
+        ),
+        (
+            "admin_session_changelist",
+            "admin",
+            reverse("admin:session_slots_sessionslot_changelist"),
+        ),
+    ]
+    if session:
+        url = reverse("sessions:session_detail", args=[session.pk])
+        views[5:5] = [
+            ("session_detail", "anonymous", url),
+            ("session_detail", "driver", url),
+        ]
+    return views
+
+
+def measure_view(client, url, iterations, warmup=1):
+    """
+    Request a URL repeatedly and summarise the timings.
+
+    Returns:
+        dict: Status code, wall time percentiles, per-request query stats
+        and the size of the last response body as sent
+    """
+    for _ in range(warmup):
+        client.get(url)
+
+    wall_ms = []
+    query_counts = []
+    query_ms = []
+    status = None
+    size = 0
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = client.get(url)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            wall_ms.append((time.perf_counter() - started) * 1000)
+        status = response.status_code
+        size = 0 if response.streaming else len(response.content)
+        query_counts.append(len(queries.captured_queries))
+        query_ms.append(
+            sum(float(q["time"]) for q in queries.captured_queries) * 1000
+        )
+
+    return {
+        "url": url,
+        "status": status,
+        "iterations": iterations,
+        "p50_ms": round(percentile(wall_ms, 50), 2),
+        "p95_ms": round(percentile(wall_ms, 95), 2),
+        "mean_ms": round(statistics.fmean(wall_ms), 2),
+        "max_ms": round(max(wall_ms), 2),
+        "queries": max(query_counts),
+        "query_ms": round(statistics.fmean(query_ms), 2),
+        "bytes": size,
+    }
+
+
+def run_benchmarks(iterations=20, warmup=1, only=None, accept_encoding=""):
+    """
+    Measure every benchmark view.
+
+    Args:
+        iterations (int): Timed requests per view
+        warmup (int): Untimed requests per view before measuring
+        only (list, optional): Substrings; run only views whose key matches
+        accept_encoding (str): Accept-Encoding header to send, e.g. 'gzip'
+            to measure response compression
+
+    Returns:
+        dict: Report with environment metadata and per-view results
+    """
+    users = get_benchmark_users()
+    clients = {}
+    results = {}
+    for name, role, url in get_benchmark_views():
+        key = f"{name}:{role}"
+        if only and not any(part in key for part in only):
+            continue
+        if role not in clients:
+            clients[role] = Client(HTTP_ACCEPT_ENCODING=accept_encoding)
+            if users[role] is not None:
+                clients[role].force_login(users[role])
+        results[key] = measure_view(clients[role], url, iterations, warmup)
+
+    return {
+        "meta": {
+            "created_at": timezone.now().isoformat(),
+            "django": django.get_version(),
+            "python": platform.python_version(),
+            "database": connection.vendor,
+            "bookings": Booking.objects.count(),
+            "sessions": SessionSlot.objects.count(),
+            "iterations": iterations,
+            "accept_encoding": accept_encoding,
+        },
+        "views": results,
+    }
+
+
+def compare_reports(current, baseline, threshold=DEFAULT_REGRESSION_THRESHOLD):
+    """
+    Compare a report against a baseline.
+
+    A view regresses when it issues more queries than in the baseline, or
+    when its p95 time grows by more than ``threshold`` (a fraction) and by
+    more than MIN_COMPARABLE_MS.
+
+    Returns:
+        list: Human-readable regression descriptions, empty if none
+    """
+    regressions = []
+    for key, before in baseline.get("views", {}).items():
+        after = current["views"].get(key)
+        if after is None:
+            continue
+        if after["queries"] > before["queries"]:
+            regressions.append(
+                f"{key}: {after['queries']} queries (baseline {before['queries']})"
+            )
+        limit = before["p95_ms"] * (1 + threshold)
+        if (
+            after["p95_ms"] > limit
+            and after["p95_ms"] - before["p95_ms"] > MIN_COMPARABLE_MS
+        ):
+            regressions.append(
+                f"{key}: p95 {after['p95_ms']:.1f}ms "
+                f"(baseline {before['p95_ms']:.1f}ms, limit {limit:.1f}ms)"
+            )
+    return regressions
@@ -0,0 +1,298 @@
+"""
+Concurrent booking-rush load test.
+
+Seeds a handful of overlapping Grand Prix sessions, then fires booking and
+confirmation requests at a live server from a thread pool, the way a sell-out
+looks in production. After the rush the database is checked for the booking
+invariants that ``booking_create`` and ``assign_random_kart`` are meant to
+hold under concurrency: no session over capacity, no driver in two
+overlapping sessions and no kart assigned twice across overlapping sessions.
+"""
+
+import random
+import re
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from accounts.models import Profile
+from bookings.models import Booking
+from karts.models import Kart
+from sessions.models import SessionSlot, Track
+from .stats import percentile
+
+# Username prefix of the drivers created for a rush
+RUSH_USER_PREFIX = "rush_driver_"
+RUSH_MANAGER_USERNAME = "rush_manager"
+
+# Minutes between session starts; sessions last an hour, so neighbours overlap
+RUSH_SESSION_SPACING = 30
+
+REQUEST_TIMEOUT = 30
+
+ACTIVE_STATUSES = ["PENDING", "CONFIRMED"]
+
+_BOOKING_DETAIL = re.compile(r"/bookings/\d+/$")
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Return redirects as responses instead of following them."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+_opener = urllib.request.build_opener(_NoRedirect)
+
+
+def seed_rush(drivers=200, sessions=4, capacity=20, karts=25):
+    """
+    Create the drivers, manager, karts and sessions for a rush.
+
+    Sessions start tomorrow at 10:00, RUSH_SESSION_SPACING minutes apart,
+    so each overlaps its neighbours and competes for the same karts.
+
+    Returns:
+        dict: 'drivers', 'manager' and 'sessions' (lists of model instances)
+    """
+    track = Track.objects.first() or Track.objects.create(
+        name="Rush Circuit", address="1 Pit Lane"
+    )
+    for number in range(1, karts + 1):
+        Kart.objects.get_or_create(number=number, defaults={"status": "ACTIVE"})
+
+    manager, _ = User.objects.get_or_create(username=RUSH_MANAGER_USERNAME)
+    Profile.objects.filter(user=manager).update(role="MANAGER")
+
+    driver_users = [
+        User.objects.get_or_create(username=f"{RUSH_USER_PREFIX}{i:05d}")[0]
+        for i in range(1, drivers + 1)
+    ]
+
+    tomorrow = timezone.localdate() + timedelta(days=1)
+    first_start = timezone.make_aware(
+        datetime.combine(tomorrow, datetime.min.time()) + timedelta(hours=10)
+    )
+    slots = []
+    for index in range(sessions):
+        start = first_start + timedelta(minutes=RUSH_SESSION_SPACING * index)
+        slot, _ = SessionSlot.objects.get_or_create(
+            track=track,
+            start_datetime=start,
+            session_type="GRAND_PRIX",
+            defaults={
+                "end_datetime": start + timedelta(hours=1),
+                "capacity": capacity,
+                "price": 45,
+            },
+        )
+        slots.append(slot)
+    return {"drivers": driver_users, "manager": manager, "sessions": slots}
+
+
+def login_cookie(user):
+    """
+    Return a Cookie header that signs the user in and satisfies CSRF.
+
+    Builds the session the same way ``Client.force_login`` does, so no
+    password hashing or login requests are needed.
+    """
+    engine = import_module(settings.SESSION_ENGINE)
+    session = engine.SessionStore()
+    session[SESSION_KEY] = user._meta.pk.value_to_string(user)
+    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.save()
+    csrf_secret = get_random_string(32)
+    return (
+        f"{settings.SESSION_COOKIE_NAME}={session.session_key}; "
+        f"{settings.CSRF_COOKIE_NAME}={csrf_secret}"
+    ), csrf_secret
+
+
+def post(url, cookie, csrf_token, data=None):
+    """
+    POST a form and return (status, location, milliseconds).
+
+    Status is 0 when the request failed without an HTTP response.
+    """
+    body = urllib.parse.urlencode(
+        {"csrfmiddlewaretoken": csrf_token, **(data or {})}
+    ).encode()
+    request = urllib.request.Request(
+        url,
+        data=body,
+        headers={
+            "Cookie": cookie,
+            "Content-Type": "application/x-www-form-urlencoded",
+        },
+    )
+    started = time.perf_counter()
+    try:
+        with _opener.open(request, timeout=REQUEST_TIMEOUT) as response:
+            status, location = response.status, ""
+    except urllib.error.HTTPError as e:
+        status, location = e.code, e.headers.get("Location", "")
+    except OSError:
+        status, location = 0, ""
+    return status, location, (time.perf_counter() - started) * 1000
+
+
+def _run_phase(requests, threads):
+    """Send (url, cookie, csrf_token, classify) tasks concurrently."""
+
+    def send(task):
+        url, cookie, csrf_token, classify = task
+        status, location, duration = post(url, cookie, csrf_token)
+        return classify(status, location), duration
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(send, requests))
+    elapsed = time.perf_counter() - started
+
+    outcomes = {}
+    for outcome, _ in results:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    durations = [duration for _, duration in results]
+    return {
+        "requests": len(results),
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(results) / elapsed, 1) if elapsed else 0,
+        "p50_ms": round(percentile(durations, 50), 1),
+        "p95_ms": round(percentile(durations, 95), 1),
+        "p99_ms": round(percentile(durations, 99), 1),
+        "max_ms": round(max(durations, default=0), 1),
+        "outcomes": outcomes,
+    }
+
+
+def _classify_booking(status, location):
+    if status == 302 and _BOOKING_DETAIL.search(urllib.parse.urlparse(location).path):
+        return "accepted"
+    if status in (200, 302):
+        return "rejected"
+    return f"error_{status}"
+
+
+def _classify_confirm(status, location):
+    return "done" if status == 302 else f"error_{status}"
+
+
+def run_rush(base_url, data, attempts=2, threads=16, seed=42):
+    """
+    Fire the booking rush, then confirm every pending booking concurrently.
+
+    Args:
+        base_url (str): Live server URL, e.g. 'http://127.0.0.1:8081'
+        data (dict): Output of seed_rush()
+        attempts (int): Sessions each driver tries to book
+        threads (int): Concurrent client threads
+        seed (int): Random seed for session choice and request order
+
+    Returns:
+        dict: 'book' and 'confirm' phase reports, plus the 'booked' and
+        'confirmed' counts found in the database afterwards
+    """
+    rng = random.Random(seed)
+    slots = data["sessions"]
+    requests = []
+    for driver in data["drivers"]:
+        cookie, token = login_cookie(driver)
+        for slot in rng.sample(slots, min(attempts, len(slots))):
+            url = base_url + reverse("bookings:booking_create", args=[slot.pk])
+            requests.append((url, cookie, token, _classify_booking))
+    rng.shuffle(requests)
+    report = {"book": _run_phase(requests, threads)}
+    report["booked"] = Booking.objects.filter(
+        session_slot__in=slots, status__in=ACTIVE_STATUSES
+    ).count()
+
+    cookie, token = login_cookie(data["manager"])
+    pending = Booking.objects.filter(
+        session_slot__in=slots, status="PENDING"
+    ).values_list("pk", flat=True)
+    requests = [
+        (
+            base_url + reverse("bookings:booking_confirm", args=[pk]),
+            cookie,
+            token,
+            _classify_confirm,
+        )
+        for pk in pending
+    ]
+    rng.shuffle(requests)
+    report["confirm"] = _run_phase(requests, threads)
+    report["confirmed"] = Booking.objects.filter(
+        session_slot__in=slots, status="CONFIRMED"
+    ).count()
+    return report
+
+
+def _overlaps(first, second):
+    return (
+        first.start_datetime < second.end_datetime
+        and second.start_datetime < first.end_datetime
+    )
+
+
+def check_invariants(sessions):
+    """
+    Check the booking invariants for a set of sessions.
+
+    Returns:
+        list: One message per violation; empty when all invariants hold
+    """
+    slot_ids = [slot.pk for slot in sessions]
+    slots = {
+        slot.pk: slot
+        for slot in SessionSlot.objects.filter(pk__in=slot_ids).with_booking_counts()
+    }
+    violations = [
+        f"Session #{slot.pk} has {slot.get_booked_count()} active bookings "
+        f"for {slot.capacity} places"
+        for slot in slots.values()
+        if slot.get_booked_count() > slot.capacity
+    ]
+
+    bookings = list(
+        Booking.objects.filter(session_slot_id__in=slot_ids).values(
+            "pk", "driver_id", "session_slot_id", "status", "assigned_kart_id"
+        )
+    )
+    active = [b for b in bookings if b["status"] in ACTIVE_STATUSES]
+    karted = [
+        b
+        for b in bookings
+        if b["status"] in ("CONFIRMED", "COMPLETED") and b["assigned_kart_id"]
+    ]
+    for index, first in enumerate(active):
+        for second in active[index + 1:]:
+            if first["driver_id"] == second["driver_id"] and _overlaps(
+                slots[first["session_slot_id"]], slots[second["session_slot_id"]]
+            ):
+                violations.append(
+                    f"Driver #{first['driver_id']} has overlapping bookings "
+                    f"#{first['pk']} and #{second['pk']}"
+                )
+    for index, first in enumerate(karted):
+        for second in karted[index + 1:]:
+            if first["assigned_kart_id"] == second["assigned_kart_id"] and _overlaps(
+                slots[first["session_slot_id"]], slots[second["session_slot_id"]]
+            ):
+                violations.append(
+                    f"Kart #{first['assigned_kart_id']} is assigned to overlapping "
+                    f"bookings #{first['pk']} and #{second['pk']}"
+                )
+    return violations
@@ -0,0 +1,125 @@
+"""
+Compression and conditional GET for dynamic HTML and JSON responses.
+
+Each eligible response gets a weak ETag computed from its uncompressed
+content, so a repeat request with a matching ``If-None-Match`` header gets a
+304 with no body. The body is then gzipped if the client accepts it.
+Compressed bodies are cached under the ETag and encoding, so an unchanged
+page is compressed once. Pages that embed a CSRF token are compressed fresh
+each time with random padding, as Django's GZipMiddleware does, so the token
+cannot be recovered by comparing compressed sizes (BREACH).
+"""
+
+import hashlib
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.text import compress_string
+
+# Responses smaller than this are sent as they are
+DEFAULT_COMPRESSION_MIN_SIZE = 1024
+
+# Seconds a compressed body is kept for reuse
+DEFAULT_COMPRESSION_CACHE_TIMEOUT = 300
+
+# Random bytes added to pages that embed a CSRF token
+CSRF_PAGE_RANDOM_BYTES = 100
+
+COMPRESSIBLE_TYPES = ("text/html", "application/json")
+
+_ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+
+def compression_enabled():
+    """Return True when responses should be compressed and tagged."""
+    return getattr(settings, "COMPRESSION_ENABLED", True)
+
+
+def is_eligible(request, response):
+    """Return True for successful, buffered HTML or JSON responses."""
+    content_type = response.get("Content-Type", "").split(";")[0].strip()
+    return (
+        request.method in ("GET", "HEAD")
+        and response.status_code == 200
+        and not response.streaming
+        and not response.has_header("Content-Encoding")
+        and content_type in COMPRESSIBLE_TYPES
+    )
+
+
+def get_content_etag(content):
+    """Return a weak ETag for a response body."""
+    return f'W/"{hashlib.md5(content, usedforsecurity=False).hexdigest()}"'
+
+
+def choose_encoding(request):
+    """Return 'gzip' or None depending on what the client accepts."""
+    accepted = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    if _ACCEPTS_GZIP.search(accepted):
+        return "gzip"
+    return None
+
+
+def compress(content, encoding, random_bytes=0):
+    """Compress a body with the given encoding."""
+    return compress_string(content, max_random_bytes=random_bytes)
+
+
+def uses_csrf_token(response):
+    """
+    Return True if the page embeds a CSRF token.
+
+    CsrfViewMiddleware sets the CSRF cookie on every response whose view
+    asked for a token, so the cookie marks pages carrying one.
+    """
+    return settings.CSRF_COOKIE_NAME in response.cookies
+
+
+def get_compressed(response, content, etag, encoding):
+    """Return the compressed body, reusing a cached copy when it is safe."""
+    if uses_csrf_token(response):
+        return compress(content, encoding, CSRF_PAGE_RANDOM_BYTES)
+    key = f"compressed:{encoding}:{etag}"
+    compressed = cache.get(key)
+    if compressed is not None:
+        return compressed
+    compressed = compress(content, encoding)
+    timeout = getattr(
+        settings, "COMPRESSION_CACHE_TIMEOUT", DEFAULT_COMPRESSION_CACHE_TIMEOUT
+    )
+    cache.set(key, compressed, timeout)
+    return compressed
+
+
+def optimize_response(request, response):
+    """
+    Tag an eligible response with an ETag, answer conditional requests with
+    304 and compress the body if it is large enough and the client agrees.
+    """
+    if not compression_enabled() or not is_eligible(request, response):
+        return response
+
+    content = response.content
+    if not response.has_header("ETag"):
+        response["ETag"] = get_content_etag(content)
+    conditional = get_conditional_response(
+        request, etag=response["ETag"], response=response
+    )
+    if conditional is not response:
+        return conditional
+
+    patch_vary_headers(response, ("Accept-Encoding",))
+    min_size = getattr(settings, "COMPRESSION_MIN_SIZE", DEFAULT_COMPRESSION_MIN_SIZE)
+    encoding = choose_encoding(request)
+    if encoding is None or len(content) < min_size:
+        return response
+
+    compressed = get_compressed(response, content, response["ETag"], encoding)
+    if len(compressed) >= len(content):
+        return response
+    response.content = compressed
+    response["Content-Length"] = str(len(compressed))
+    response["Content-Encoding"] = encoding
+    return response
@@ -58,3 +58,43 @@ class ContactForm(forms.Form):
             }
         )
     )
+
+
+class ExportFilterForm(forms.Form):
+    """
+    Base filter form for streaming data exports.
+    Subclasses add model-specific filters such as status.
+    """
+
+    format = forms.ChoiceField(
+        choices=[("csv", "CSV"), ("jsonl", "JSON Lines")],
+        required=False,
+        initial="csv",
+    )
+    start = forms.DateField(required=False, help_text="First session date")
+    end = forms.DateField(required=False, help_text="Last session date")
+
+    def clean_format(self):
+        """Default to CSV when no format is given."""
+        return self.cleaned_data.get("format") or "csv"
+
+    def clean(self):
+        """Validate the date range order."""
+        cleaned_data = super().clean()
+        start = cleaned_data.get("start")
+        end = cleaned_data.get("end")
+        if start and end and start > end:
+            raise forms.ValidationError({"end": "End date must not be before start."})
+        return cleaned_data
+
+    def filter_date_range(self, queryset, field):
+        """Restrict a queryset to the selected local-date range on a field."""
+        from core.models import day_bounds
+
+        start = self.cleaned_data.get("start")
+        end = self.cleaned_data.get("end")
+        if start:
+            queryset = queryset.filter(**{f"{field}__gte": day_bounds(start)[0]})
+        if end:
+            queryset = queryset.filter(**{f"{field}__lt": day_bounds(end)[1]})
+        return queryset
@@ -0,0 +1,159 @@
+"""
+Per-request instrumentation of database, template and cache activity.
+
+``RequestTimingMiddleware`` opens a ``RequestTiming`` record for sampled
+requests. Hooks installed by ``install_hooks()`` add to the active record
+and return straight to the original code when no record is open, so
+unsampled requests pay almost nothing.
+"""
+
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.template.base import Template
+
+_current = ContextVar("request_timing", default=None)
+
+_hooks_installed = False
+
+_MISSING = object()
+
+
+class RequestTiming:
+    """Timings collected while handling one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = []
+        self.template_ms = 0.0
+        self.template_depth = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def total_ms(self):
+        """Return milliseconds since the request started."""
+        return (time.perf_counter() - self.started) * 1000
+
+    @property
+    def db_ms(self):
+        """Return total milliseconds spent in database queries."""
+        return sum(duration for _, duration in self.queries)
+
+    def record_query(self, sql, duration_ms):
+        """Record an executed SQL statement and its duration."""
+        self.queries.append((sql, duration_ms))
+
+    def record_cache(self, hits, misses):
+        """Record cache lookups."""
+        self.cache_hits += hits
+        self.cache_misses += misses
+
+
+def get_current_timing():
+    """Return the active RequestTiming, or None outside a sampled request."""
+    return _current.get()
+
+
+def start_timing():
+    """Open a RequestTiming for the current request and return a reset token."""
+    timing = RequestTiming()
+    return timing, _current.set(timing)
+
+
+def stop_timing(token):
+    """Close the RequestTiming opened with start_timing()."""
+    _current.reset(token)
+
+
+def query_timer(execute, sql, params, many, context):
+    """
+    Database execute wrapper that times each query.
+
+    Install with ``connection.execute_wrapper(query_timer)``.
+    """
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.record_query(sql, (time.perf_counter() - started) * 1000)
+
+
+def _wrap_template_render(render):
+    """Time the outermost template render of a request."""
+
+    def timed_render(self, context):
+        timing = _current.get()
+        if timing is None:
+            return render(self, context)
+        timing.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            timing.template_depth -= 1
+            if timing.template_depth == 0:
+                timing.template_ms += (time.perf_counter() - started) * 1000
+
+    return timed_render
+
+
+def _wrap_cache_get(get):
+    """Count hits and misses of cache.get()."""
+
+    def counted_get(self, key, default=None, version=None):
+        timing = _current.get()
+        if timing is None:
+            return get(self, key, default, version)
+        value = get(self, key, _MISSING, version)
+        if value is _MISSING:
+            timing.record_cache(0, 1)
+            return default
+        timing.record_cache(1, 0)
+        return value
+
+    return counted_get
+
+
+def _wrap_cache_get_many(get_many):
+    """Count hits and misses of cache.get_many()."""
+
+    def counted_get_many(self, keys, version=None):
+        timing = _current.get()
+        if timing is None:
+            return get_many(self, keys, version)
+        keys = list(keys)
+        found = get_many(self, keys, version)
+        timing.record_cache(len(found), len(keys) - len(found))
+        return found
+
+    return counted_get_many
+
+
+def install_hooks():
+    """
+    Install the template and cache hooks, once per process.
+
+    Cache backends are patched per class, for each backend in CACHES.
+    """
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    Template.render = _wrap_template_render(Template.render)
+    patched = set()
+    for alias in settings.CACHES:
+        backend = type(caches[alias])
+        if backend in patched:
+            continue
+        backend.get = _wrap_cache_get(backend.get)
+        # The base get_many() calls get() per key, which is already counted
+        if backend.get_many is not BaseCache.get_many:
+            backend.get_many = _wrap_cache_get_many(backend.get_many)
+        patched.add(backend)
+    _hooks_installed = True
@@ -0,0 +1,195 @@
+"""
+Database-backed background job queue.
+
+Apps register handlers in a ``jobs.py`` module:
+
+    @register_job("bookings.confirm")
+    def confirm_bookings(job, ids):
+        for batch in job.batches(ids):
+            ...
+            job.advance(len(batch), confirmed=n)
+
+Admin actions call ``enqueue()`` and the ``run_worker`` management command
+claims and runs queued jobs one at a time.
+"""
+
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Rows processed per transaction/progress update
+DEFAULT_JOB_BATCH_SIZE = 200
+
+# Cap on per-row messages kept in a job result
+MAX_JOB_MESSAGES = 100
+
+# Seconds a running job may go without progress before it is failed
+DEFAULT_JOB_STALE_TIMEOUT = 1800
+
+_registry = {}
+
+
+def register_job(name):
+    """Register a handler function under a job name."""
+
+    def decorator(func):
+        _registry[name] = func
+        return func
+
+    return decorator
+
+
+def get_handler(name):
+    """Return the handler for a job name, or None if unknown."""
+    return _registry.get(name)
+
+
+def enqueue(name, payload=None, description="", total=0, user=None):
+    """
+    Queue a job for the worker.
+
+    Args:
+        name (str): Registered handler name
+        payload (dict): JSON-serialisable keyword arguments for the handler
+        description (str): Summary shown on the job status page
+        total (int): Number of rows the job will process
+        user (User, optional): User who requested the job
+
+    Returns:
+        Job: The queued job
+    """
+    if name not in _registry:
+        raise ValueError(f"Unknown job: {name}")
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        description=description,
+        total=total,
+        created_by=user if user and user.is_authenticated else None,
+    )
+
+
+class JobRun:
+    """Progress reporter handed to a job handler while it runs."""
+
+    def __init__(self, job):
+        self.job = job
+        self.counts = dict(job.result.get("counts", {}))
+        self.messages = list(job.result.get("messages", []))
+
+    @property
+    def batch_size(self):
+        """Return the configured batch size."""
+        return getattr(settings, "JOB_BATCH_SIZE", DEFAULT_JOB_BATCH_SIZE)
+
+    def batches(self, items):
+        """Yield successive bounded slices of a list of ids."""
+        for i in range(0, len(items), self.batch_size):
+            yield items[i:i + self.batch_size]
+
+    def message(self, text, level="info"):
+        """Record a per-row message, keeping at most MAX_JOB_MESSAGES."""
+        if len(self.messages) < MAX_JOB_MESSAGES:
+            self.messages.append({"level": level, "text": text})
+
+    def advance(self, processed, **counts):
+        """Record a finished batch and persist progress."""
+        for key, value in counts.items():
+            self.counts[key] = self.counts.get(key, 0) + value
+        self.job.processed += processed
+        self.job.result = {"counts": self.counts, "messages": self.messages}
+        Job.objects.filter(pk=self.job.pk).update(
+            processed=self.job.processed,
+            result=self.job.result,
+            updated_at=timezone.now(),
+        )
+
+
+def fail_stale_jobs():
+    """
+    Fail running jobs that have made no progress for JOB_STALE_TIMEOUT seconds.
+
+    A worker killed mid-job (restart, deploy, SIGKILL) leaves its job
+    RUNNING. Such jobs are failed rather than requeued because a handler may
+    already have applied some of its batches.
+
+    Returns:
+        int: Number of jobs failed
+    """
+    timeout = getattr(settings, "JOB_STALE_TIMEOUT", DEFAULT_JOB_STALE_TIMEOUT)
+    now = timezone.now()
+    failed = Job.objects.filter(
+        status="RUNNING", updated_at__lt=now - timedelta(seconds=timeout)
+    ).update(
+        status="FAILED",
+        error=f"Worker stopped: no progress for {timeout} seconds",
+        finished_at=now,
+        updated_at=now,
+    )
+    if failed:
+        logger.warning("Failed %s stale running job(s)", failed)
+    return failed
+
+
+def claim_next_job():
+    """
+    Atomically claim the oldest queued job.
+
+    Uses a conditional UPDATE rather than row locks so several workers can
+    poll the same table on any database backend. Stale running jobs are
+    failed first, so a job whose worker died does not stay RUNNING forever.
+    """
+    fail_stale_jobs()
+    for job in Job.objects.filter(status="QUEUED").order_by("created_at")[:5]:
+        now = timezone.now()
+        claimed = Job.objects.filter(pk=job.pk, status="QUEUED").update(
+            status="RUNNING", started_at=now, updated_at=now
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+    return None
+
+
+def run_job(job):
+    """Run a claimed job and record its outcome."""
+    handler = get_handler(job.name)
+    run = JobRun(job)
+    try:
+        if handler is None:
+            raise ValueError(f"Unknown job: {job.name}")
+        handler(run, **job.payload)
+    except Exception:
+        logger.exception("Job %s (%s) failed", job.pk, job.name)
+        job.status = "FAILED"
+        job.error = traceback.format_exc()
+    else:
+        job.status = "SUCCEEDED"
+    job.result = {"counts": run.counts, "messages": run.messages}
+    job.finished_at = timezone.now()
+    # A job failed as stale while its worker was still going keeps that status
+    finished = Job.objects.filter(pk=job.pk, status="RUNNING").update(
+        status=job.status,
+        error=job.error,
+        result=job.result,
+        finished_at=job.finished_at,
+        updated_at=job.finished_at,
+    )
+    if not finished:
+        logger.warning("Job %s (%s) finished after being failed", job.pk, job.name)
+        job.refresh_from_db()
+    return job
+
+
+def run_next_job():
+    """Claim and run one job. Returns the job, or None if the queue is empty."""
+    job = claim_next_job()
+    if job:
+        run_job(job)
+    return job
@@ -0,0 +1,290 @@
+"""
+Synthetic data generation for load tests and benchmarks.
+
+Builds drivers, karts, a schedule and bookings with ``bulk_create`` so
+production-sized datasets (100k+ bookings) can be created in seconds.
+Output is deterministic for a given seed.
+"""
+
+import random
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import DateTimeField, ExpressionWrapper, F, OuterRef, Subquery
+from django.db.models.functions import Least
+from django.utils import timezone
+
+from accounts.models import Profile
+from bookings.models import Booking
+from karts.models import Kart
+from sessions.models import ScheduleRule, SessionSlot, Track
+from .models import DailyRollup
+from .signals import rollups_suspended
+
+# Rows per INSERT while generating load data
+LOAD_BATCH_SIZE = 2000
+
+# Username prefix that marks generated drivers, so they can be cleared
+LOAD_USER_PREFIX = "load_driver_"
+
+# Booking status weights for sessions that have already run
+PAST_STATUS_WEIGHTS = {"COMPLETED": 85, "CANCELLED": 12, "CONFIRMED": 3}
+
+# Booking status weights for upcoming sessions
+FUTURE_STATUS_WEIGHTS = {"CONFIRMED": 55, "PENDING": 35, "CANCELLED": 10}
+
+# How far ahead of the session generated bookings were made
+BOOKING_LEAD_TIME = timedelta(days=3)
+
+FIRST_NAMES = ["Alex", "Sam", "Jamie", "Chris", "Pat", "Robin", "Casey", "Morgan"]
+LAST_NAMES = ["Murphy", "Kelly", "Byrne", "Ryan", "Walsh", "Smith", "Doyle", "Lynch"]
+
+
+def clear_load_data(prefix=LOAD_USER_PREFIX):
+    """
+    Delete generated drivers and, through cascades, their bookings.
+
+    Returns the number of drivers deleted.
+    """
+    drivers = User.objects.filter(username__startswith=prefix)
+    count = drivers.count()
+    with rollups_suspended():
+        drivers.delete()
+    DailyRollup.objects.rebuild()
+    return count
+
+
+def _create_drivers(count, prefix, batch_size):
+    """Bulk create driver users and profiles; return their ids."""
+    existing = set(
+        User.objects.filter(username__startswith=prefix).values_list(
+            "username", flat=True
+        )
+    )
+    password = make_password(None)
+    users = [
+        User(
+            username=f"{prefix}{i:06d}",
+            first_name=FIRST_NAMES[i % len(FIRST_NAMES)],
+            last_name=LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)],
+            email=f"{prefix}{i:06d}@example.com",
+            password=password,
+        )
+        for i in range(1, count + 1)
+        if f"{prefix}{i:06d}" not in existing
+    ]
+    User.objects.bulk_create(users, batch_size=batch_size)
+
+    # bulk_create skips the post_save signal that normally adds profiles
+    ids = list(
+        User.objects.filter(username__startswith=prefix)
+        .order_by("username")
+        .values_list("id", flat=True)[:count]
+    )
+    Profile.objects.create_missing(ids, batch_size=batch_size)
+    return ids, len(users)
+
+
+def _create_karts(count):
+    """Ensure karts 1..count exist, every tenth one in maintenance."""
+    existing = set(Kart.objects.values_list("number", flat=True))
+    karts = [
+        Kart(number=number, status="MAINTENANCE" if number % 10 == 0 else "ACTIVE")
+        for number in range(1, count + 1)
+        if number not in existing
+    ]
+    Kart.objects.bulk_create(karts)
+    return len(karts)
+
+
+def _create_sessions(track, first_day, last_day, batch_size):
+    """
+    Bulk create sessions from the schedule rules' timetables.
+
+    Unlike rule materialization this covers past days too, so there is
+    booking history to report on.
+    """
+    rules = list(ScheduleRule.objects.filter(is_active=True))
+    if not rules:
+        raise ValueError("No active schedule rules to build sessions from")
+
+    slots = []
+    day = first_day
+    while day <= last_day:
+        for rule in rules:
+            if day.weekday() not in rule.get_weekdays():
+                continue
+            for hour in rule.get_hours():
+                start = timezone.make_aware(datetime.combine(day, time(hour=hour)))
+                slots.append(
+                    SessionSlot(
+                        track=track,
+                        schedule_rule=rule,
+                        session_type=rule.session_type,
+                        start_datetime=start,
+                        end_datetime=start + timedelta(minutes=rule.duration_minutes),
+                        capacity=rule.capacity,
+                        price=rule.price,
+                    )
+                )
+        day += timedelta(days=1)
+
+    before = SessionSlot.objects.count()
+    SessionSlot.objects.bulk_create(slots, batch_size=batch_size, ignore_conflicts=True)
+    return SessionSlot.objects.count() - before
+
+
+def _pick_status(rng, weights):
+    """Pick a status from a {status: weight} mapping."""
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _build_bookings(sessions, driver_ids, kart_ids, fill, rng):
+    """
+    Yield unsaved bookings for the given sessions, one day at a time.
+
+    Respects the same invariants as the booking views: active bookings
+    never exceed capacity, a driver never holds overlapping sessions, and
+    a kart is never assigned to two overlapping sessions.
+    """
+    now = timezone.now()
+    day = None
+    for session_id, start, end, capacity in sessions:
+        if timezone.localdate(start) != day:
+            day = timezone.localdate(start)
+            driver_free_at = {}
+            kart_free_at = {}
+
+        seats = min(capacity, round(capacity * fill * rng.uniform(0.6, 1.4)))
+        if seats <= 0:
+            continue
+        weights = PAST_STATUS_WEIGHTS if end < now else FUTURE_STATUS_WEIGHTS
+
+        candidates = rng.sample(driver_ids, min(len(driver_ids), seats * 2))
+        drivers = [
+            pk for pk in candidates if driver_free_at.get(pk, start) <= start
+        ][:seats]
+        karts = [pk for pk in kart_ids if kart_free_at.get(pk, start) <= start]
+        rng.shuffle(karts)
+
+        for driver_id in drivers:
+            status = _pick_status(rng, weights)
+            kart_id = None
+            if status in ["CONFIRMED", "COMPLETED"]:
+                if not karts:
+                    # No kart free: leave it unconfirmed, as the admin would
+                    status = "PENDING" if end >= now else "CANCELLED"
+                else:
+                    kart_id = karts.pop()
+                    kart_free_at[kart_id] = end
+            if status != "CANCELLED":
+                driver_free_at[driver_id] = end
+            yield Booking(
+                session_slot_id=session_id,
+                driver_id=driver_id,
+                assigned_kart_id=kart_id,
+                status=status,
+            )
+
+
+def generate_load_data(
+    drivers=2000,
+    days=30,
+    history=365,
+    karts=20,
+    fill=0.7,
+    seed=42,
+    batch_size=LOAD_BATCH_SIZE,
+    prefix=LOAD_USER_PREFIX,
+):
+    """
+    Generate a synthetic dataset.
+
+    Args:
+        drivers (int): Number of driver accounts
+        days (int): Days of upcoming schedule, starting today
+        history (int): Days of past schedule before today
+        karts (int): Number of karts
+        fill (float): Average share of each session's capacity that is booked
+        seed (int): Random seed; the same seed gives the same bookings
+        batch_size (int): Rows per INSERT
+        prefix (str): Username prefix for generated drivers
+
+    Returns:
+        dict: Counts of created drivers, karts, sessions and bookings
+    """
+    rng = random.Random(seed)
+    track = Track.objects.first()
+    if track is None:
+        track = Track.objects.create(
+            name="KartControl Racing Track",
+            address="Naas Road\nDublin 12\nIreland",
+            phone="+353 1 234 5678",
+            email="info@kartcontrol.com",
+        )
+
+    today = timezone.localdate()
+    first_day = today - timedelta(days=history)
+    last_day = today + timedelta(days=days - 1)
+
+    with transaction.atomic(), rollups_suspended():
+        driver_ids, created_drivers = _create_drivers(drivers, prefix, batch_size)
+        created_karts = _create_karts(karts)
+        created_sessions = _create_sessions(track, first_day, last_day, batch_size)
+
+        kart_ids = list(
+            Kart.objects.filter(status="ACTIVE", number__lte=karts)
+            .order_by("number")
+            .values_list("id", flat=True)
+        )
+        sessions = list(
+            SessionSlot.objects.filter(
+                start_datetime__gte=timezone.make_aware(
+                    datetime.combine(first_day, time.min)
+                ),
+                start_datetime__lt=timezone.make_aware(
+                    datetime.combine(last_day + timedelta(days=1), time.min)
+                ),
+                bookings__isnull=True,
+            )
+            .order_by("start_datetime", "pk")
+            .values_list("id", "start_datetime", "end_datetime", "capacity")
+        )
+
+        created_bookings = 0
+        batch = []
+        for booking in _build_bookings(sessions, driver_ids, kart_ids, fill, rng):
+            batch.append(booking)
+            if len(batch) >= batch_size:
+                Booking.objects.bulk_create(batch, batch_size=batch_size)
+                created_bookings += len(batch)
+                batch = []
+        Booking.objects.bulk_create(batch, batch_size=batch_size)
+        created_bookings += len(batch)
+
+        # auto_now_add stamps every row with "now"; backdate generated
+        # bookings to a few days before their session in one UPDATE
+        Booking.objects.filter(driver__username__startswith=prefix).update(
+            created_at=Least(
+                ExpressionWrapper(
+                    Subquery(
+                        SessionSlot.objects.filter(
+                            pk=OuterRef("session_slot_id")
+                        ).values("start_datetime")[:1]
+                    )
+                    - BOOKING_LEAD_TIME,
+                    output_field=DateTimeField(),
+                ),
+                F("updated_at"),
+            )
+        )
+
+    DailyRollup.objects.rebuild()
+    return {
+        "drivers": created_drivers,
+        "karts": created_karts,
+        "sessions": created_sessions,
+        "bookings": created_bookings,
+    }
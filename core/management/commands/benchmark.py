@@ -0,0 +1,171 @@
+"""
+Management command to benchmark the hot views against a seeded dataset.
+"""
+
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from core.benchmark import (
+    DEFAULT_REGRESSION_THRESHOLD,
+    compare_reports,
+    run_benchmarks,
+)
+from core.load_data import generate_load_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a throwaway test database, times the hot views through the "
+        "test client and writes a JSON report. Exits non-zero when a view "
+        "regresses against --baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help="Timed requests per view (default: 20)",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=2,
+            help="Untimed requests per view first (default: 2)",
+        )
+        parser.add_argument(
+            "--drivers", type=int, default=500, help="Drivers to seed (default: 500)"
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=14,
+            help="Days of upcoming schedule to seed (default: 14)",
+        )
+        parser.add_argument(
+            "--history",
+            type=int,
+            default=60,
+            help="Days of booking history to seed (default: 60)",
+        )
+        parser.add_argument(
+            "--fill",
+            type=float,
+            default=0.7,
+            help="Share of session capacity booked (default: 0.7)",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=42, help="Random seed (default: 42)"
+        )
+        parser.add_argument(
+            "--only",
+            action="append",
+            help="Only run views whose name:role contains this (repeatable)",
+        )
+        parser.add_argument(
+            "--session-store",
+            choices=sorted(settings.SESSION_ENGINES),
+            help="Session storage to benchmark with (default: SESSION_STORE)",
+        )
+        parser.add_argument(
+            "--accept-encoding",
+            default="",
+            help=(
+                "Accept-Encoding header to send, e.g. 'gzip, br', to measure "
+                "compressed responses (default: none)"
+            ),
+        )
+        parser.add_argument(
+            "--output",
+            default="benchmark.json",
+            help="Report file to write (default: benchmark.json)",
+        )
+        parser.add_argument(
+            "--baseline", help="Baseline report to compare against"
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=DEFAULT_REGRESSION_THRESHOLD,
+            help=(
+                "Allowed p95 slowdown as a fraction "
+                f"(default: {DEFAULT_REGRESSION_THRESHOLD})"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["baseline"]:
+            try:
+                baseline = json.loads(Path(options["baseline"]).read_text())
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot read baseline: {e}")
+
+        report = self.run_in_test_database(options)
+        Path(options["output"]).write_text(json.dumps(report, indent=2) + "\n")
+
+        self.stdout.write(
+            f"{'view':<36} {'p50 ms':>8} {'p95 ms':>8} {'queries':>8} "
+            f"{'query ms':>9} {'kB':>7}"
+        )
+        for key, result in report["views"].items():
+            self.stdout.write(
+                f"{key:<36} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+                f"{result['queries']:>8} {result['query_ms']:>9.1f} "
+                f"{result['bytes'] / 1024:>7.1f}"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"✓ Report written to {options['output']}")
+        )
+
+        if baseline is not None:
+            regressions = compare_reports(report, baseline, options["threshold"])
+            if regressions:
+                for line in regressions:
+                    self.stderr.write(self.style.ERROR(f"  {line}"))
+                raise CommandError(f"{len(regressions)} benchmark regression(s)")
+            self.stdout.write(self.style.SUCCESS("✓ No regressions against baseline"))
+
+    def run_in_test_database(self, options):
+        """Seed and benchmark inside a test database that is destroyed after."""
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            counts = generate_load_data(
+                drivers=options["drivers"],
+                days=options["days"],
+                history=options["history"],
+                fill=options["fill"],
+                seed=options["seed"],
+            )
+            self.stdout.write(
+                f"Seeded {counts['bookings']} bookings, {counts['sessions']} sessions"
+            )
+            session_store = options["session_store"] or settings.SESSION_STORE
+            with override_settings(
+                SESSION_ENGINE=settings.SESSION_ENGINES[session_store]
+            ):
+                report = run_benchmarks(
+                    iterations=options["iterations"],
+                    warmup=options["warmup"],
+                    only=options["only"],
+                    accept_encoding=options["accept_encoding"],
+                )
+            report["meta"]["session_store"] = session_store
+            report["meta"]["dataset"] = {
+                key: options[key]
+                for key in ("drivers", "days", "history", "fill", "seed")
+            }
+            return report
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
@@ -0,0 +1,162 @@
+"""
+Management command to load test booking under a concurrent sell-out.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from django.contrib.staticfiles.handlers import StaticFilesHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.testcases import LiveServerThread
+from django.test.utils import (
+    modify_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from core.booking_rush import check_invariants, run_rush, seed_rush
+
+LIVE_SERVER_HOST = "127.0.0.1"
+
+# Server errors are counted in the report rather than logged one by one
+request_logger = logging.getLogger("django.request")
+
+
+class Command(BaseCommand):
+    help = (
+        "Starts a live server on a throwaway test database and fires "
+        "concurrent booking and confirmation requests at a few overlapping "
+        "sessions. Reports throughput and latency, then exits non-zero if "
+        "any session is overbooked, any driver is double-booked or any kart "
+        "is assigned twice."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--drivers", type=int, default=200, help="Drivers (default: 200)"
+        )
+        parser.add_argument(
+            "--sessions",
+            type=int,
+            default=4,
+            help="Overlapping sessions to fight over (default: 4)",
+        )
+        parser.add_argument(
+            "--capacity", type=int, default=20, help="Places per session (default: 20)"
+        )
+        parser.add_argument(
+            "--karts", type=int, default=25, help="Active karts (default: 25)"
+        )
+        parser.add_argument(
+            "--attempts",
+            type=int,
+            default=2,
+            help="Sessions each driver tries to book (default: 2)",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=16,
+            help="Concurrent client threads (default: 16)",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=42, help="Random seed (default: 42)"
+        )
+        parser.add_argument("--output", help="Also write the report as JSON here")
+
+    def handle(self, *args, **options):
+        report = self.run_in_test_database(options)
+
+        for phase in ("book", "confirm"):
+            result = report[phase]
+            outcomes = ", ".join(
+                f"{name} {count}" for name, count in sorted(result["outcomes"].items())
+            )
+            self.stdout.write(
+                f"{phase:<8} {result['requests']:>5} requests in "
+                f"{result['seconds']:.2f}s ({result['throughput_rps']} req/s)  "
+                f"p50 {result['p50_ms']}ms  p95 {result['p95_ms']}ms  "
+                f"p99 {result['p99_ms']}ms  [{outcomes}]"
+            )
+        self.stdout.write(
+            f"Active bookings: {report['booked']}, "
+            f"confirmed with a kart: {report['confirmed']}"
+        )
+
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(report, indent=2) + "\n")
+            self.stdout.write(f"Report written to {options['output']}")
+
+        if report["violations"]:
+            for line in report["violations"]:
+                self.stderr.write(self.style.ERROR(f"  {line}"))
+            raise CommandError(
+                f"{len(report['violations'])} booking invariant violation(s)"
+            )
+        self.stdout.write(self.style.SUCCESS("✓ All booking invariants held"))
+
+    def run_in_test_database(self, options):
+        """Seed, serve and rush a test database that is destroyed after."""
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        test_settings = connection.settings_dict.setdefault("TEST", {})
+        old_test_name = test_settings.get("NAME")
+        if connection.vendor == "sqlite":
+            # An on-disk database lets each server thread use its own
+            # connection, as a real multi-worker deployment would
+            handle, test_settings["NAME"] = tempfile.mkstemp(suffix=".sqlite3")
+            os.close(handle)
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        allowed_hosts = modify_settings(ALLOWED_HOSTS={"append": LIVE_SERVER_HOST})
+        allowed_hosts.enable()
+        old_log_level = request_logger.level
+        request_logger.setLevel(logging.CRITICAL)
+        server = None
+        try:
+            data = seed_rush(
+                drivers=options["drivers"],
+                sessions=options["sessions"],
+                capacity=options["capacity"],
+                karts=options["karts"],
+            )
+            server = LiveServerThread(LIVE_SERVER_HOST, StaticFilesHandler)
+            server.daemon = True
+            server.start()
+            server.is_ready.wait()
+            if server.error:
+                raise server.error
+
+            report = run_rush(
+                f"http://{LIVE_SERVER_HOST}:{server.port}",
+                data,
+                attempts=options["attempts"],
+                threads=options["threads"],
+                seed=options["seed"],
+            )
+            report["violations"] = check_invariants(data["sessions"])
+            report["meta"] = {
+                key: options[key]
+                for key in (
+                    "drivers",
+                    "sessions",
+                    "capacity",
+                    "karts",
+                    "attempts",
+                    "threads",
+                    "seed",
+                )
+            }
+            report["meta"]["database"] = connection.vendor
+            return report
+        finally:
+            if server is not None:
+                server.terminate()
+            allowed_hosts.disable()
+            request_logger.setLevel(old_log_level)
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            if connection.vendor == "sqlite":
+                test_settings["NAME"] = old_test_name
+            teardown_test_environment()
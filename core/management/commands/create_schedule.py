@@ -4,12 +4,20 @@ Management command to create a proper recurring session schedule.
 
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from datetime import datetime, timedelta, time
-from sessions.models import Track, SessionSlot
+from datetime import timedelta
+from core.models import DailyRollup
+from core.signals import rollups_suspended
+from sessions.models import ScheduleRule, SessionSlot, Track
+from sessions.scheduling import (
+    SCHEDULE_BATCH_SIZE,
+    build_rule_slots,
+    materialize_slots,
+    schedule_summary,
+)
 
 
 class Command(BaseCommand):
-    help = "Creates a recurring schedule of sessions (9am-10pm hourly)"
+    help = "Creates sessions from the active schedule rules"
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -23,10 +31,23 @@ class Command(BaseCommand):
             action="store_true",
             help="Clear existing future sessions before creating new ones",
         )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be created without writing anything",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=SCHEDULE_BATCH_SIZE,
+            help=f"Rows per INSERT (default: {SCHEDULE_BATCH_SIZE})",
+        )
 
     def handle(self, *args, **options):
         days_ahead = options["days"]
         clear_existing = options["clear"]
+        dry_run = options["dry_run"]
+        batch_size = options["batch_size"]
 
         # Get or create track
         track = Track.objects.first()
@@ -36,113 +57,80 @@ class Command(BaseCommand):
             )
             return
 
+        now = timezone.now()
+
         # Clear existing future sessions if requested
         if clear_existing:
-            future_sessions = SessionSlot.objects.filter(
-                start_datetime__gte=timezone.now()
-            )
-            count = future_sessions.count()
-            future_sessions.delete()
+            future_sessions = SessionSlot.objects.filter(start_datetime__gte=now)
+            if dry_run:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Would delete {future_sessions.count()} existing "
+                        "future sessions"
+                    )
+                )
+            else:
+                count = future_sessions.count()
+                with rollups_suspended():
+                    future_sessions.delete()
+                # Cascaded bookings may have been created on any past day
+                DailyRollup.objects.rebuild()
+                self.stdout.write(
+                    self.style.WARNING(f"Deleted {count} existing future sessions")
+                )
+
+        rules = list(ScheduleRule.objects.filter(is_active=True))
+        if not rules:
             self.stdout.write(
-                self.style.WARNING(f"Deleted {count} existing future sessions")
+                self.style.ERROR(
+                    "No active schedule rules. Add some under Sessions > "
+                    "Schedule Rules first."
+                )
             )
-
-        # Session configuration
-        HOURLY_SLOTS = list(range(9, 23))  # 9am to 10pm (9, 10, 11, ..., 22)
-        WEEKDAY_GRAND_PRIX_HOUR = 18  # 6pm
-        WEEKEND_GRAND_PRIX_HOURS = [12, 15, 18]  # 12pm, 3pm, 6pm
-
-        OPEN_SESSION_DURATION = 60  # minutes
-        GRAND_PRIX_DURATION = 90  # minutes
-
-        OPEN_SESSION_CAPACITY = 10
-        GRAND_PRIX_CAPACITY = 12
-
-        OPEN_SESSION_PRICE = 35.00
-        GRAND_PRIX_PRICE = 55.00
-
-        created_count = 0
-        skipped_count = 0
+            return
 
         # Get timezone-aware starting point
-        now = timezone.now()
-        start_date = now.date()
+        start_date = timezone.localdate(now)
+        days = [start_date + timedelta(days=offset) for offset in range(days_ahead)]
 
         self.stdout.write(
             f"Creating schedule for {days_ahead} days starting from {start_date}..."
         )
 
-        for day_offset in range(days_ahead):
-            current_date = start_date + timedelta(days=day_offset)
-            weekday = current_date.weekday()  # 0=Monday, 6=Sunday
-            is_weekend = weekday >= 5  # Saturday or Sunday
-
-            for hour in HOURLY_SLOTS:
-                # Determine if this should be a Grand Prix session
-                if is_weekend:
-                    is_grand_prix = hour in WEEKEND_GRAND_PRIX_HOURS
-                else:
-                    is_grand_prix = hour == WEEKDAY_GRAND_PRIX_HOUR
-
-                # Set session parameters
-                if is_grand_prix:
-                    session_type = "GRAND_PRIX"
-                    duration = GRAND_PRIX_DURATION
-                    capacity = GRAND_PRIX_CAPACITY
-                    price = GRAND_PRIX_PRICE
-                else:
-                    session_type = "OPEN_SESSION"
-                    duration = OPEN_SESSION_DURATION
-                    capacity = OPEN_SESSION_CAPACITY
-                    price = OPEN_SESSION_PRICE
-
-                # Create datetime objects (timezone-aware)
-                start_dt = timezone.make_aware(
-                    datetime.combine(current_date, time(hour=hour, minute=0))
-                )
-                end_dt = start_dt + timedelta(minutes=duration)
-
-                # Skip if in the past
-                if start_dt < now:
-                    skipped_count += 1
-                    continue
-
-                # Create session
-                session, created = SessionSlot.objects.get_or_create(
-                    track=track,
-                    session_type=session_type,
-                    start_datetime=start_dt,
-                    defaults={
-                        "end_datetime": end_dt,
-                        "capacity": capacity,
-                        "price": price,
-                    },
-                )
+        # Past start times on the first day are skipped by build_rule_slots
+        slots = []
+        for rule in rules:
+            slots.extend(build_rule_slots(rule, track, days))
 
-                if created:
-                    created_count += 1
+        # Insert only the missing slots, in batches
+        created = materialize_slots(slots, batch_size=batch_size, dry_run=dry_run)
+        created_grand_prix = sum(1 for s in created if s.session_type == "GRAND_PRIX")
 
-        self.stdout.write(
-            self.style.SUCCESS(f"\n✓ Created {created_count} new sessions")
-        )
-        if skipped_count > 0:
-            self.stdout.write(f"  Skipped {skipped_count} past time slots")
-
-        # Summary statistics
-        total_sessions = SessionSlot.objects.filter(start_datetime__gte=now).count()
-        open_sessions = SessionSlot.objects.filter(
-            start_datetime__gte=now, session_type="OPEN_SESSION"
-        ).count()
-        grand_prix = SessionSlot.objects.filter(
-            start_datetime__gte=now, session_type="GRAND_PRIX"
-        ).count()
+        if dry_run:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"\n[dry run] Would create {len(created)} new sessions "
+                    f"({len(created) - created_grand_prix} Open Sessions, "
+                    f"{created_grand_prix} Grand Prix)"
+                )
+            )
+            self.stdout.write(
+                f"  {len(slots) - len(created)} slots already exist"
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f"\n✓ Created {len(created)} new sessions")
+            )
+
+        # Summary statistics (single aggregate query)
+        summary = schedule_summary(now)
 
         self.stdout.write(self.style.SUCCESS("\n=== Schedule Summary ==="))
-        self.stdout.write(f"Total upcoming sessions: {total_sessions}")
-        self.stdout.write(f"  • Open Sessions: {open_sessions}")
-        self.stdout.write(f"  • Grand Prix: {grand_prix}")
-        self.stdout.write("\nSchedule:")
-        self.stdout.write("  • Monday-Friday: Hourly 9am-10pm (6pm = Grand Prix)")
-        self.stdout.write(
-            "  • Saturday-Sunday: Hourly 9am-10pm (12pm, 3pm, 6pm = Grand Prix)"
-        )
+        self.stdout.write(f"Total upcoming sessions: {summary['total']}")
+        self.stdout.write(f"  • Open Sessions: {summary['open_sessions']}")
+        self.stdout.write(f"  • Grand Prix: {summary['grand_prix']}")
+        self.stdout.write("\nSchedule rules:")
+        for rule in rules:
+            self.stdout.write(
+                f"  • {rule.name}: {rule.get_weekdays_display()} at {rule.hours}"
+            )
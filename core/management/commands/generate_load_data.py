@@ -0,0 +1,92 @@
+"""
+Management command to generate a large synthetic dataset for load testing.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from core.load_data import (
+    LOAD_BATCH_SIZE,
+    LOAD_USER_PREFIX,
+    clear_load_data,
+    generate_load_data,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates drivers, karts, sessions and bookings in bulk for load "
+        "testing and benchmarks. Output is deterministic for a given seed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--drivers",
+            type=int,
+            default=2000,
+            help="Number of drivers (default: 2000)",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Days of upcoming schedule (default: 30)",
+        )
+        parser.add_argument(
+            "--history",
+            type=int,
+            default=365,
+            help="Days of past schedule with booking history (default: 365)",
+        )
+        parser.add_argument(
+            "--karts", type=int, default=20, help="Number of karts (default: 20)"
+        )
+        parser.add_argument(
+            "--fill",
+            type=float,
+            default=0.7,
+            help="Average share of session capacity booked, 0-1 (default: 0.7)",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=42, help="Random seed (default: 42)"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=LOAD_BATCH_SIZE,
+            help=f"Rows per INSERT (default: {LOAD_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete previously generated drivers and their bookings first",
+        )
+
+    def handle(self, *args, **options):
+        if not 0 <= options["fill"] <= 1:
+            raise CommandError("--fill must be between 0 and 1")
+        if not 1 <= options["karts"] <= 99:
+            raise CommandError("--karts must be between 1 and 99")
+
+        if options["clear"]:
+            count = clear_load_data(LOAD_USER_PREFIX)
+            self.stdout.write(self.style.WARNING(f"Deleted {count} generated drivers"))
+
+        started = time.perf_counter()
+        try:
+            counts = generate_load_data(
+                drivers=options["drivers"],
+                days=options["days"],
+                history=options["history"],
+                karts=options["karts"],
+                fill=options["fill"],
+                seed=options["seed"],
+                batch_size=options["batch_size"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - started
+
+        for name, count in counts.items():
+            self.stdout.write(self.style.SUCCESS(f"✓ Created {count} {name}"))
+        self.stdout.write(f"Finished in {elapsed:.1f}s")
@@ -0,0 +1,32 @@
+"""
+Management command to extend rule-based sessions to the rolling horizon.
+"""
+
+from django.core.management.base import BaseCommand
+from sessions.scheduling import get_schedule_horizon, materialize_schedule
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates sessions from the active schedule rules up to the horizon. "
+        "Only days not generated yet are touched, so it is safe to run daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--horizon",
+            type=int,
+            help=f"Days ahead to generate (default: {get_schedule_horizon()})",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be created without writing anything",
+        )
+
+    def handle(self, *args, **options):
+        created = materialize_schedule(
+            horizon_days=options["horizon"], dry_run=options["dry_run"]
+        )
+        verb = "Would create" if options["dry_run"] else "Created"
+        self.stdout.write(self.style.SUCCESS(f"✓ {verb} {len(created)} new sessions"))
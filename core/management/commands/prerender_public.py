@@ -0,0 +1,37 @@
+"""
+Management command to write pre-rendered snapshots of the public pages.
+"""
+
+from django.core.management.base import BaseCommand
+from core.prerender import prerender, prerender_enabled
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders the home, about and session list pages and every upcoming "
+        "session's detail page for anonymous visitors into the database. "
+        "Run after deploys and from the scheduler; the worker keeps the "
+        "snapshots up to date as sessions and bookings change."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths",
+            nargs="*",
+            help="URL paths to render, e.g. /sessions/ (default: all public pages)",
+        )
+
+    def handle(self, *args, **options):
+        counts = prerender(options["paths"] or None)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ Rendered {counts['rendered']} pages and removed "
+                f"{counts['removed']} stale snapshots"
+            )
+        )
+        if not prerender_enabled():
+            self.stdout.write(
+                self.style.WARNING(
+                    "PRERENDER_ENABLED is off, so the snapshots are not served."
+                )
+            )
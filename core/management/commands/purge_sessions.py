@@ -0,0 +1,56 @@
+"""
+Management command to delete expired sessions in batches.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.session_cleanup import (
+    DEFAULT_PURGE_BATCH_SIZE,
+    purge_expired_sessions,
+    uses_session_table,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes expired rows from the session table in small batches. "
+        "Safe to run while the site is live; schedule it daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_PURGE_BATCH_SIZE,
+            help=(
+                "Sessions deleted per statement "
+                f"(default: {DEFAULT_PURGE_BATCH_SIZE})"
+            ),
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Seconds to sleep between batches (default: 0)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count expired sessions without deleting them",
+        )
+
+    def handle(self, *args, **options):
+        if not uses_session_table():
+            self.stdout.write(
+                f"{settings.SESSION_ENGINE} does not store sessions in the "
+                "database; nothing to purge."
+            )
+            return
+
+        count = purge_expired_sessions(
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+            dry_run=options["dry_run"],
+        )
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(f"✓ {verb} {count} expired sessions"))
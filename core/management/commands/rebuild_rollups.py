@@ -0,0 +1,32 @@
+"""
+Management command to rebuild the precomputed daily rollup table.
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from core.models import DailyRollup
+
+
+class Command(BaseCommand):
+    help = "Rebuilds per-day booking and session counts used by the admin"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start",
+            help="First day to rebuild (YYYY-MM-DD, default: all history)",
+        )
+        parser.add_argument(
+            "--end",
+            help="Last day to rebuild (YYYY-MM-DD, default: all future days)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options["start"]) if options["start"] else None
+            end = date.fromisoformat(options["end"]) if options["end"] else None
+        except ValueError as e:
+            raise CommandError(f"Invalid date: {e}")
+
+        days = DailyRollup.objects.rebuild(start=start, end=end)
+        self.stdout.write(self.style.SUCCESS(f"✓ Rebuilt rollups for {days} days"))
@@ -0,0 +1,48 @@
+"""
+Management command to run the background job worker.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from core.jobs import run_next_job
+
+
+class Command(BaseCommand):
+    help = "Processes queued background jobs (run as the Procfile worker)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=2.0,
+            help="Seconds to wait when the queue is empty (default: 2)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process all queued jobs and exit instead of polling",
+        )
+
+    def handle(self, *args, **options):
+        poll_interval = options["sleep"]
+        run_once = options["once"]
+
+        self.stdout.write("Worker started, waiting for jobs...")
+        while True:
+            close_old_connections()
+            job = run_next_job()
+            if job:
+                style = (
+                    self.style.SUCCESS
+                    if job.status == "SUCCEEDED"
+                    else self.style.ERROR
+                )
+                self.stdout.write(
+                    style(f"Job #{job.pk} {job.name}: {job.get_status_display()}")
+                )
+                continue
+            if run_once:
+                break
+            time.sleep(poll_interval)
@@ -0,0 +1,174 @@
+"""
+Management command to compare schedule page throughput under WSGI and ASGI.
+"""
+
+import importlib.util
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from core.load_data import generate_load_data
+from core.throughput import run_throughput
+
+SERVER_MODULES = {"wsgi": "gunicorn", "asgi": "uvicorn"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a throwaway test database, serves it with gunicorn sync "
+        "workers and with uvicorn running the async schedule views, and "
+        "fires concurrent requests at the home, session list and session "
+        "detail pages. Reports requests per second and latency for each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--server",
+            action="append",
+            choices=sorted(SERVER_MODULES),
+            help="Server to measure (repeatable; default: both)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=2,
+            help="Worker processes per server (default: 2)",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Timed requests per view (default: 200)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=32,
+            help="Requests in flight at once (default: 32)",
+        )
+        parser.add_argument(
+            "--drivers", type=int, default=500, help="Drivers to seed (default: 500)"
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=14,
+            help="Days of upcoming schedule to seed (default: 14)",
+        )
+        parser.add_argument(
+            "--history",
+            type=int,
+            default=60,
+            help="Days of booking history to seed (default: 60)",
+        )
+        parser.add_argument(
+            "--fill",
+            type=float,
+            default=0.7,
+            help="Share of session capacity booked (default: 0.7)",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=42, help="Random seed (default: 42)"
+        )
+        parser.add_argument("--output", help="Also write the report as JSON here")
+
+    def handle(self, *args, **options):
+        servers = options["server"] or ["wsgi", "asgi"]
+        for server in servers:
+            module = SERVER_MODULES[server]
+            if importlib.util.find_spec(module) is None:
+                raise CommandError(f"{module} is not installed (needed for {server})")
+
+        report = self.run_in_test_database(servers, options)
+
+        self.stdout.write(
+            f"{'server':<6} {'view':<26} {'req/s':>8} {'p50 ms':>8} "
+            f"{'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+        )
+        for server in servers:
+            for key, result in report["servers"][server].items():
+                self.stdout.write(
+                    f"{server:<6} {key:<26} {result['throughput_rps']:>8.1f} "
+                    f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+                    f"{result['p99_ms']:>8.1f} {result['errors']:>7}"
+                )
+        if len(servers) == 2:
+            for key, wsgi in report["servers"]["wsgi"].items():
+                asgi = report["servers"]["asgi"][key]
+                if wsgi["throughput_rps"]:
+                    ratio = asgi["throughput_rps"] / wsgi["throughput_rps"]
+                    self.stdout.write(f"asgi/wsgi {key:<26} {ratio:>6.2f}x")
+
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(report, indent=2) + "\n")
+            self.stdout.write(f"Report written to {options['output']}")
+
+        errors = sum(
+            result["errors"]
+            for results in report["servers"].values()
+            for result in results.values()
+        )
+        if errors:
+            raise CommandError(f"{errors} request(s) did not return 200")
+        self.stdout.write(self.style.SUCCESS("✓ Throughput benchmark complete"))
+
+    def run_in_test_database(self, servers, options):
+        """Seed and serve a test database that is destroyed after."""
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        test_settings = connection.settings_dict.setdefault("TEST", {})
+        old_test_name = test_settings.get("NAME")
+        if connection.vendor == "sqlite":
+            # The servers run in other processes, so the database must be
+            # on disk rather than in memory
+            handle, test_settings["NAME"] = tempfile.mkstemp(suffix=".sqlite3")
+            os.close(handle)
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            counts = generate_load_data(
+                drivers=options["drivers"],
+                days=options["days"],
+                history=options["history"],
+                fill=options["fill"],
+                seed=options["seed"],
+            )
+            self.stdout.write(
+                f"Seeded {counts['bookings']} bookings, {counts['sessions']} sessions"
+            )
+            with tempfile.TemporaryFile("w+") as log:
+                try:
+                    results = run_throughput(
+                        servers=servers,
+                        workers=options["workers"],
+                        requests=options["requests"],
+                        concurrency=options["concurrency"],
+                        log=log,
+                    )
+                except RuntimeError as e:
+                    log.seek(0)
+                    raise CommandError(f"{e}\n{log.read()[-2000:]}")
+            report = {"servers": results}
+            report["meta"] = {
+                key: options[key]
+                for key in (
+                    "workers",
+                    "requests",
+                    "concurrency",
+                    "drivers",
+                    "days",
+                    "history",
+                    "fill",
+                    "seed",
+                )
+            }
+            report["meta"]["database"] = connection.vendor
+            return report
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            if connection.vendor == "sqlite":
+                test_settings["NAME"] = old_test_name
+            teardown_test_environment()
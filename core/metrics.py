@@ -0,0 +1,383 @@
+"""
+Prometheus metrics shared between worker processes.
+
+Each process keeps its counters and histograms in memory and writes them to
+``METRICS_DIR/<pid>-<start>.json`` at most every METRICS_FLUSH_INTERVAL
+seconds and when it exits. The ``/metrics`` view flushes its own process,
+folds the files of processes that have exited into ``retired.json`` and
+merges the rest, then renders the Prometheus text exposition format, so any
+worker can answer a scrape and counters never go backwards as workers come
+and go. Nothing is recorded unless METRICS_ENABLED is on.
+"""
+
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Seconds between writes of a process's metrics file
+DEFAULT_FLUSH_INTERVAL = 5
+
+# Totals of processes that have exited
+RETIRED_FILENAME = "retired.json"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+LOCK_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+
+# name: (type, help, histogram buckets)
+METRICS = {
+    "kartcontrol_request_duration_seconds": (
+        "histogram",
+        "Request latency by view.",
+        LATENCY_BUCKETS,
+    ),
+    "kartcontrol_booking_admissions_total": (
+        "counter",
+        "Booking attempts by outcome and rejection reason.",
+        None,
+    ),
+    "kartcontrol_lock_wait_seconds": (
+        "histogram",
+        "Time to acquire select_for_update row locks.",
+        LOCK_WAIT_BUCKETS,
+    ),
+    "kartcontrol_kart_assignment_failures_total": (
+        "counter",
+        "Confirmations that found no kart to assign.",
+        None,
+    ),
+    "kartcontrol_cache_requests_total": (
+        "counter",
+        "Cache lookups made while handling requests, by result.",
+        None,
+    ),
+}
+
+
+def metrics_enabled():
+    """Return True when metrics should be recorded."""
+    return getattr(settings, "METRICS_ENABLED", False)
+
+
+def get_metrics_dir():
+    """Return the shared metrics directory, creating it if needed."""
+    directory = Path(
+        getattr(settings, "METRICS_DIR", None)
+        or os.path.join(tempfile.gettempdir(), "kartcontrol-metrics")
+    )
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def _label_key(labels):
+    return tuple(sorted((labels or {}).items()))
+
+
+def _serialize(counters, histograms):
+    return {
+        "counters": [
+            [name, dict(labels), value] for (name, labels), value in counters.items()
+        ],
+        "histograms": [
+            [name, dict(labels), series]
+            for (name, labels), series in histograms.items()
+        ],
+    }
+
+
+def _merge(counters, histograms, data):
+    """Add the values of one metrics file to the running totals."""
+    for name, labels, value in data["counters"]:
+        key = (name, _label_key(labels))
+        counters[key] = counters.get(key, 0) + value
+    for name, labels, series in data["histograms"]:
+        key = (name, _label_key(labels))
+        merged = histograms.setdefault(
+            key, {"buckets": [0] * len(series["buckets"]), "sum": 0.0, "count": 0}
+        )
+        merged["buckets"] = [
+            total + count for total, count in zip(merged["buckets"], series["buckets"])
+        ]
+        merged["sum"] += series["sum"]
+        merged["count"] += series["count"]
+
+
+def _read(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write(path, data):
+    # A unique temp file per write, so concurrent writers never share one
+    handle, temp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(handle, "w") as temp_file:
+            json.dump(data, temp_file)
+        os.replace(temp, path)
+    except BaseException:
+        try:
+            os.unlink(temp)
+        except OSError:
+            pass
+        raise
+
+
+class MetricsRegistry:
+    """Thread-safe in-process store of counters and histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Held while writing, so a later snapshot never lands before an
+        # earlier one
+        self._write_lock = threading.Lock()
+        self.reset()
+        atexit.register(self.flush_at_exit)
+
+    def reset(self):
+        """Discard this process's values."""
+        with self._lock:
+            self._start()
+
+    def _start(self):
+        self.pid = os.getpid()
+        # Unique per process, so a reused pid never overwrites an old file
+        self.filename = f"{self.pid}-{time.time_ns()}.json"
+        self.counters = {}
+        self.histograms = {}
+        self.last_flush = 0.0
+
+    def _check_fork(self):
+        # Values inherited from a parent process belong to the parent's file
+        if os.getpid() != self.pid:
+            self._start()
+
+    def inc(self, name, labels=None, value=1):
+        """Add to a counter."""
+        if not metrics_enabled():
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._check_fork()
+            self.counters[key] = self.counters.get(key, 0) + value
+        self.maybe_flush()
+
+    def observe(self, name, value, labels=None):
+        """Record one histogram observation."""
+        if not metrics_enabled():
+            return
+        buckets = METRICS[name][2]
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._check_fork()
+            series = self.histograms.get(key)
+            if series is None:
+                series = self.histograms[key] = {
+                    "buckets": [0] * len(buckets),
+                    "sum": 0.0,
+                    "count": 0,
+                }
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    series["buckets"][index] += 1
+                    break
+            series["sum"] += value
+            series["count"] += 1
+        self.maybe_flush()
+
+    def maybe_flush(self):
+        """
+        Write the metrics file if the flush interval has passed.
+
+        Only one thread claims each interval. Write errors are logged rather
+        than raised, so recording a metric never fails the request.
+        """
+        interval = getattr(settings, "METRICS_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL)
+        with self._lock:
+            now = time.monotonic()
+            if now - self.last_flush < interval:
+                return
+            self.last_flush = now
+        try:
+            self.flush()
+        except OSError:
+            logger.exception("Could not write metrics file")
+
+    def flush(self):
+        """Write this process's values to its file in the metrics directory."""
+        with self._write_lock:
+            with self._lock:
+                self._check_fork()
+                self.last_flush = time.monotonic()
+                data = _serialize(self.counters, self.histograms)
+                filename = self.filename
+            _write(get_metrics_dir() / filename, data)
+
+    def flush_at_exit(self):
+        """Write values recorded since the last flush before the process ends."""
+        if os.getpid() == self.pid and (self.counters or self.histograms):
+            self.flush()
+
+
+registry = MetricsRegistry()
+
+
+@contextmanager
+def lock_wait_timer(site):
+    """Time a select_for_update query as lock wait for the given call site."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.observe(
+            "kartcontrol_lock_wait_seconds",
+            time.perf_counter() - started,
+            {"site": site},
+        )
+
+
+def record_admission(outcome, reason=""):
+    """Count a booking attempt: 'accepted', or 'rejected' with a reason."""
+    labels = {"outcome": outcome}
+    if reason:
+        labels["reason"] = reason
+    registry.inc("kartcontrol_booking_admissions_total", labels)
+
+
+def is_process_alive(pid):
+    """Return True if a process with this pid is running on this host."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@contextmanager
+def _directory_lock(directory):
+    with open(directory / ".lock", "w") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        yield
+
+
+def retire_exited_processes(directory):
+    """
+    Fold the files of processes that have exited into ``retired.json``.
+
+    Returns:
+        int: Number of files retired
+    """
+    exited = [
+        path
+        for path in directory.glob("*.json")
+        if path.stem.split("-")[0].isdigit()
+        and not is_process_alive(int(path.stem.split("-")[0]))
+    ]
+    if not exited:
+        return 0
+    with _directory_lock(directory):
+        retired_path = directory / RETIRED_FILENAME
+        counters, histograms = {}, {}
+        retired = _read(retired_path)
+        if retired is not None:
+            _merge(counters, histograms, retired)
+        # Another scrape may have retired some of them while we waited
+        exited = [path for path in exited if path.exists()]
+        for path in exited:
+            data = _read(path)
+            if data is not None:
+                _merge(counters, histograms, data)
+        _write(retired_path, _serialize(counters, histograms))
+        for path in exited:
+            path.unlink(missing_ok=True)
+    return len(exited)
+
+
+def collect():
+    """
+    Merge the metrics files of all processes, including those that exited.
+
+    Returns:
+        tuple: (counters, histograms) keyed by (name, label tuple)
+    """
+    registry.flush()
+    directory = get_metrics_dir()
+    retire_exited_processes(directory)
+    counters = {}
+    histograms = {}
+    for path in directory.glob("*.json"):
+        data = _read(path)
+        if data is not None:
+            _merge(counters, histograms, data)
+    return counters, histograms
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in pairs
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def render_metrics():
+    """Return all metrics in the Prometheus text exposition format."""
+    counters, histograms = collect()
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "counter":
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+            continue
+        for (metric, labels), series in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets, series["buckets"]):
+                cumulative += count
+                lines.append(
+                    f"{name}_bucket{_format_labels(labels, [('le', bound)])} "
+                    f"{cumulative}"
+                )
+            lines.append(
+                f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} "
+                f"{series['count']}"
+            )
+            lines.append(f"{name}_sum{_format_labels(labels)} {series['sum']}")
+            lines.append(f"{name}_count{_format_labels(labels)} {series['count']}")
+
+    hits = counters.get(
+        ("kartcontrol_cache_requests_total", (("result", "hit"),)), 0
+    )
+    misses = counters.get(
+        ("kartcontrol_cache_requests_total", (("result", "miss"),)), 0
+    )
+    lines.append("# HELP kartcontrol_cache_hit_ratio Share of cache lookups that hit.")
+    lines.append("# TYPE kartcontrol_cache_hit_ratio gauge")
+    ratio = hits / (hits + misses) if hits + misses else 0
+    lines.append(f"kartcontrol_cache_hit_ratio {round(ratio, 4)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,331 @@
+"""
+Middleware for request timing, query instrumentation, metrics, profiling,
+response compression and serving pre-rendered public pages.
+"""
+
+import cProfile
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from .compression import optimize_response
+from .decorators import is_manager
+from .instrumentation import (
+    get_current_timing,
+    install_hooks,
+    query_timer,
+    start_timing,
+    stop_timing,
+)
+from .metrics import registry
+from .page_cache import has_visitor_state
+from .prerender import prerender_enabled, read_snapshot
+from .profiling import save_profile
+from .sqlstats import query_stats
+
+logger = logging.getLogger("kartcontrol.requests")
+
+# Requests slower than this log their full SQL list
+DEFAULT_SLOW_REQUEST_MS = 500
+
+
+class RequestTimingMiddleware:
+    """
+    Record view name, total time, query count, DB time, template render time
+    and cache hits/misses for a sample of requests.
+
+    Each sampled request is logged as one JSON line and, when
+    REQUEST_TIMING_HEADER is set, reported in a ``Server-Timing`` header.
+    Requests slower than REQUEST_TIMING_SLOW_MS also log every SQL
+    statement, and all sampled queries feed the SQL fingerprint statistics
+    (see core.sqlstats) unless SQL_STATS_ENABLED is off. When
+    REQUEST_TIMING_ENABLED is off the middleware removes itself from the
+    stack at startup.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_TIMING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "REQUEST_TIMING_SAMPLE_RATE", 1.0)
+        self.slow_ms = getattr(
+            settings, "REQUEST_TIMING_SLOW_MS", DEFAULT_SLOW_REQUEST_MS
+        )
+        self.add_header = getattr(settings, "REQUEST_TIMING_HEADER", True)
+        self.collect_sql_stats = getattr(settings, "SQL_STATS_ENABLED", True)
+        install_hooks()
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        timing, token = start_timing()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(query_timer))
+                response = self.get_response(request)
+        finally:
+            stop_timing(token)
+
+        self.report(request, response, timing)
+        return response
+
+    def report(self, request, response, timing):
+        """Log the request's timings and add the Server-Timing header."""
+        match = getattr(request, "resolver_match", None)
+        record = {
+            "view": match.view_name if match else None,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(timing.total_ms, 2),
+            "db_queries": len(timing.queries),
+            "db_ms": round(timing.db_ms, 2),
+            "template_ms": round(timing.template_ms, 2),
+            "cache_hits": timing.cache_hits,
+            "cache_misses": timing.cache_misses,
+        }
+        if self.collect_sql_stats:
+            query_stats.record_request(record["view"], timing.queries)
+
+        if record["total_ms"] >= self.slow_ms:
+            record["sql"] = [
+                {"sql": sql, "ms": round(duration, 2)}
+                for sql, duration in timing.queries
+            ]
+            logger.warning(json.dumps(record))
+        else:
+            logger.info(json.dumps(record))
+
+        if self.add_header:
+            response["Server-Timing"] = (
+                f"total;dur={record['total_ms']}, "
+                f'db;dur={record["db_ms"]};desc="{record["db_queries"]} queries", '
+                f"tpl;dur={record['template_ms']}, "
+                f'cache;desc="{record["cache_hits"]} hits, '
+                f'{record["cache_misses"]} misses"'
+            )
+
+
+class MetricsMiddleware:
+    """
+    Feed request latency and cache lookups into the Prometheus metrics.
+
+    Latency is recorded per view name. Cache hits and misses come from the
+    RequestTiming record, which this middleware opens itself when
+    RequestTimingMiddleware has not. Removed at startup unless
+    METRICS_ENABLED is on.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        install_hooks()
+
+    def __call__(self, request):
+        timing = get_current_timing()
+        token = None
+        if timing is None:
+            timing, token = start_timing()
+        try:
+            response = self.get_response(request)
+        finally:
+            if token is not None:
+                stop_timing(token)
+
+        match = getattr(request, "resolver_match", None)
+        registry.observe(
+            "kartcontrol_request_duration_seconds",
+            timing.total_ms / 1000,
+            {"view": match.view_name if match else "<unresolved>"},
+        )
+        if timing.cache_hits:
+            registry.inc(
+                "kartcontrol_cache_requests_total",
+                {"result": "hit"},
+                timing.cache_hits,
+            )
+        if timing.cache_misses:
+            registry.inc(
+                "kartcontrol_cache_requests_total",
+                {"result": "miss"},
+                timing.cache_misses,
+            )
+        return response
+
+
+class CompressionMiddleware:
+    """
+    Add weak ETags, answer matching conditional GETs with 304 and compress
+    HTML and JSON responses (see core.compression).
+
+    Listed near the top so it sees the final body of every inner
+    middleware and view. Under ASGI the compression runs in a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return optimize_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return await sync_to_async(optimize_response)(request, response)
+
+
+class ProfilerMiddleware:
+    """
+    Run a request under cProfile when a manager asks for it.
+
+    Add ``?_profile=1`` to the URL or send an ``X-Profile: 1`` header. The
+    stats are saved to the on-disk ring in core.profiling and listed at
+    /admin/profiles/. Other requests only pay for a substring check.
+    Must come after AuthenticationMiddleware. Under ASGI the profile covers
+    the event loop thread, so it leaves out work done in threads (ORM calls,
+    template rendering) and includes any other request running meanwhile.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.wants_profile(request):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active in this thread
+            return self.get_response(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        self.save(request, response, profiler, duration_ms)
+        return response
+
+    async def __acall__(self, request):
+        if not self.is_requested(request):
+            return await self.get_response(request)
+        if not await sync_to_async(self.wants_profile)(request):
+            return await self.get_response(request)
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            profiler.enable()
+        except ValueError:
+            return await self.get_response(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            profiler.disable()
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        await sync_to_async(self.save)(request, response, profiler, duration_ms)
+        return response
+
+    def is_requested(self, request):
+        """Check for ``?_profile=1`` or an ``X-Profile: 1`` header."""
+        if request.META.get("HTTP_X_PROFILE") == "1":
+            return True
+        # The substring check keeps QueryDict parsing off ordinary requests
+        return (
+            "_profile=" in request.META.get("QUERY_STRING", "")
+            and request.GET.get("_profile") == "1"
+        )
+
+    def wants_profile(self, request):
+        """Check for the opt-in trigger, then that the user is a manager."""
+        if not self.is_requested(request):
+            return False
+        return is_manager(request.user)
+
+    def save(self, request, response, profiler, duration_ms):
+        """Store the profile and point the response at it."""
+        match = getattr(request, "resolver_match", None)
+        label = match.view_name if match else request.path
+        response["X-Profile-Id"] = save_profile(profiler, label, duration_ms)
+
+
+class PrerenderedPageMiddleware:
+    """
+    Serve pre-rendered snapshots of public pages to anonymous visitors.
+
+    Only GET/HEAD requests with no query string and no session or messages
+    cookie are answered from the stored snapshots (see core.prerender); the
+    rest, and paths without a fresh snapshot, go to the view as usual.
+    Listed last so security and clickjacking headers are still applied.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if self.may_serve_snapshot(request):
+            response = self.serve_snapshot(request)
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if self.may_serve_snapshot(request):
+            response = await sync_to_async(self.serve_snapshot)(request)
+            if response is not None:
+                return response
+        return await self.get_response(request)
+
+    def may_serve_snapshot(self, request):
+        """Return True for anonymous GET/HEAD requests without a query."""
+        return (
+            prerender_enabled()
+            and request.method in ("GET", "HEAD")
+            and not request.META.get("QUERY_STRING")
+            and not has_visitor_state(request)
+        )
+
+    def serve_snapshot(self, request):
+        """Return the snapshot for the path, or None if there is none."""
+        content = read_snapshot(request.path_info)
+        if content is None:
+            return None
+        response = HttpResponse(content)
+        response["X-Prerendered"] = "1"
+        patch_vary_headers(response, ("Cookie",))
+        return response
@@ -0,0 +1,47 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_daily_rollup(apps, schema_editor):
+    """Populate the rollup table from existing bookings and sessions."""
+    DailyRollup = apps.get_model("core", "DailyRollup")
+    Booking = apps.get_model("bookings", "Booking")
+    SessionSlot = apps.get_model("session_slots", "SessionSlot")
+
+    counts = {}
+    for row in (
+        Booking.objects.annotate(day=TruncDate("created_at"))
+        .values("day")
+        .annotate(total=Count("id"))
+        .order_by()
+    ):
+        counts.setdefault(row["day"], [0, 0])[0] = row["total"]
+    for row in (
+        SessionSlot.objects.annotate(day=TruncDate("start_datetime"))
+        .values("day")
+        .annotate(total=Count("id"))
+        .order_by()
+    ):
+        counts.setdefault(row["day"], [0, 0])[1] = row["total"]
+
+    DailyRollup.objects.bulk_create(
+        [
+            DailyRollup(day=day, booking_count=b, session_count=s)
+            for day, (b, s) in counts.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+        ("bookings", "0003_add_created_at_index"),
+        ("session_slots", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_daily_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PageSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(help_text='URL path', max_length=255, unique=True)),
+                ('content', models.BinaryField(help_text='Rendered page')),
+                ('rendered_at', models.DateTimeField(help_text='When the page was rendered')),
+            ],
+            options={
+                'verbose_name': 'Page Snapshot',
+                'verbose_name_plural': 'Page Snapshots',
+                'ordering': ['path'],
+            },
+        ),
+    ]
@@ -0,0 +1,239 @@
+"""
+Shared models for cross-app reporting and background work.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+
+def day_bounds(day):
+    """Return the aware [start, end) datetimes of a local calendar day."""
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    end = timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+    return start, end
+
+
+class DailyRollupManager(models.Manager):
+    """Manager that keeps per-day counters in sync with their source tables."""
+
+    def refresh_day(self, day):
+        """
+        Recount bookings and sessions for a single local day.
+
+        Uses indexed range scans rather than date truncation so the
+        refresh stays cheap on large tables.
+        """
+        from bookings.models import Booking
+        from sessions.models import SessionSlot
+
+        start, end = day_bounds(day)
+        booking_count = Booking.objects.filter(
+            created_at__gte=start, created_at__lt=end
+        ).count()
+        session_count = SessionSlot.objects.filter(
+            start_datetime__gte=start, start_datetime__lt=end
+        ).count()
+
+        if booking_count or session_count:
+            self.update_or_create(
+                day=day,
+                defaults={
+                    "booking_count": booking_count,
+                    "session_count": session_count,
+                },
+            )
+        else:
+            self.filter(day=day).delete()
+
+    def add_bookings(self, day, delta):
+        """
+        Adjust a day's booking count by ``delta`` without recounting.
+
+        A single UPDATE with an F() expression, so concurrent bookings never
+        overwrite each other's counts.
+        """
+        rows = self.filter(day=day)
+        if delta < 0:
+            # Never below zero if the row has drifted; rebuild() corrects it
+            rows = rows.filter(booking_count__gte=-delta)
+        if rows.update(
+            booking_count=F("booking_count") + delta, updated_at=timezone.now()
+        ):
+            return
+        if delta > 0:
+            try:
+                with transaction.atomic():
+                    self.create(day=day, booking_count=delta)
+            except IntegrityError:
+                # Another booking created the row first
+                self.filter(day=day).update(
+                    booking_count=F("booking_count") + delta,
+                    updated_at=timezone.now(),
+                )
+
+    def rebuild(self, start=None, end=None):
+        """
+        Rebuild rollup rows from scratch, optionally limited to a date range.
+
+        Intended for use after bulk loads that bypass model signals.
+        Returns the number of days written.
+        """
+        from bookings.models import Booking
+        from sessions.models import SessionSlot
+
+        bookings = Booking.objects.all()
+        sessions = SessionSlot.objects.all()
+        rollups = self.all()
+        if start:
+            bookings = bookings.filter(created_at__gte=day_bounds(start)[0])
+            sessions = sessions.filter(start_datetime__gte=day_bounds(start)[0])
+            rollups = rollups.filter(day__gte=start)
+        if end:
+            bookings = bookings.filter(created_at__lt=day_bounds(end)[1])
+            sessions = sessions.filter(start_datetime__lt=day_bounds(end)[1])
+            rollups = rollups.filter(day__lte=end)
+
+        counts = {}
+        for row in (
+            bookings.annotate(day=TruncDate("created_at"))
+            .values("day")
+            .annotate(total=Count("id"))
+            .order_by()
+        ):
+            counts.setdefault(row["day"], [0, 0])[0] = row["total"]
+        for row in (
+            sessions.annotate(day=TruncDate("start_datetime"))
+            .values("day")
+            .annotate(total=Count("id"))
+            .order_by()
+        ):
+            counts.setdefault(row["day"], [0, 0])[1] = row["total"]
+
+        rollups.delete()
+        self.bulk_create(
+            [
+                self.model(day=day, booking_count=b, session_count=s)
+                for day, (b, s) in counts.items()
+            ],
+            batch_size=1000,
+        )
+        return len(counts)
+
+
+class DailyRollup(models.Model):
+    """
+    Precomputed per-day booking and session counts.
+
+    Drives the admin date hierarchy so drill-down never has to run a
+    DISTINCT date truncation over the full bookings or sessions table.
+    """
+
+    day = models.DateField(unique=True, help_text="Local calendar day")
+    booking_count = models.PositiveIntegerField(
+        default=0, help_text="Bookings created on this day"
+    )
+    session_count = models.PositiveIntegerField(
+        default=0, help_text="Sessions starting on this day"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = DailyRollupManager()
+
+    class Meta:
+        ordering = ["day"]
+        verbose_name = "Daily Rollup"
+        verbose_name_plural = "Daily Rollups"
+
+    def __str__(self):
+        return (
+            f"{self.day:%Y-%m-%d}: {self.booking_count} bookings, "
+            f"{self.session_count} sessions"
+        )
+
+
+class Job(models.Model):
+    """
+    A unit of background work queued from the admin.
+
+    Jobs are stored in the database and picked up by the ``run_worker``
+    management command, so long bulk actions never run inside a request.
+    """
+
+    STATUS_CHOICES = [
+        ("QUEUED", "Queued"),
+        ("RUNNING", "Running"),
+        ("SUCCEEDED", "Succeeded"),
+        ("FAILED", "Failed"),
+    ]
+
+    name = models.CharField(max_length=100, help_text="Registered job handler")
+    description = models.CharField(
+        max_length=200, blank=True, help_text="Human-readable summary"
+    )
+    payload = models.JSONField(default=dict, blank=True, help_text="Job arguments")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="QUEUED")
+    total = models.PositiveIntegerField(default=0, help_text="Rows to process")
+    processed = models.PositiveIntegerField(default=0, help_text="Rows processed")
+    result = models.JSONField(
+        default=dict, blank=True, help_text="Counts and messages"
+    )
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="jobs",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Background Job"
+        verbose_name_plural = "Background Jobs"
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        return (
+            f"#{self.pk} {self.description or self.name} "
+            f"({self.get_status_display()})"
+        )
+
+    def is_finished(self):
+        """Check if job has stopped running."""
+        return self.status in ["SUCCEEDED", "FAILED"]
+
+    def get_progress_percent(self):
+        """Return progress as a whole percentage."""
+        if not self.total:
+            return 100 if self.is_finished() else 0
+        return int(self.processed * 100 / self.total)
+
+
+class PageSnapshot(models.Model):
+    """
+    Pre-rendered HTML of a public page, as an anonymous visitor sees it.
+
+    Written by core.prerender and served by PrerenderedPageMiddleware. Kept
+    in the database so every web dyno serves what the worker rendered.
+    """
+
+    path = models.CharField(max_length=255, unique=True, help_text="URL path")
+    content = models.BinaryField(help_text="Rendered page")
+    rendered_at = models.DateTimeField(help_text="When the page was rendered")
+
+    class Meta:
+        ordering = ["path"]
+        verbose_name = "Page Snapshot"
+        verbose_name_plural = "Page Snapshots"
+
+    def __str__(self):
+        return f"{self.path} ({self.rendered_at:%Y-%m-%d %H:%M})"
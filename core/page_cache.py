@@ -0,0 +1,161 @@
+"""
+Full-page cache for anonymous GET requests to public pages.
+
+Pages are cached only for visitors with no session or messages cookie, so
+flash messages and anything tied to a session never leak between visitors.
+Responses that set cookies or use a CSRF token are never stored. Every key
+includes a generation number, and bumping it with
+``invalidate_public_pages()`` drops all cached pages at once. Track and
+schedule changes bump it (see core.signals). The counter lives in the
+default cache, so it only reaches every worker when that cache is shared.
+"""
+
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+PAGE_CACHE_GENERATION_KEY = "pagecache:generation"
+
+# Seconds a cached page is served for when the view does not say
+DEFAULT_PAGE_CACHE_TIMEOUT = 600
+
+# Cookies whose presence means the page may differ for this visitor
+PAGE_CACHE_BYPASS_COOKIES = ("messages",)
+
+
+def get_generation():
+    """Return the current page cache generation."""
+    generation = cache.get(PAGE_CACHE_GENERATION_KEY)
+    if generation is None:
+        cache.add(PAGE_CACHE_GENERATION_KEY, 1, None)
+        generation = cache.get(PAGE_CACHE_GENERATION_KEY, 1)
+    return generation
+
+
+def invalidate_public_pages():
+    """Drop every cached public page."""
+    try:
+        cache.incr(PAGE_CACHE_GENERATION_KEY)
+    except ValueError:
+        cache.set(PAGE_CACHE_GENERATION_KEY, 1, None)
+
+
+def get_page_key(request):
+    """
+    Return the cache key for a page.
+
+    The static manifest hash is part of the key, so pages linking the
+    fingerprinted files of an earlier deploy are never served.
+    """
+    static_version = getattr(staticfiles_storage, "manifest_hash", "")
+    return (
+        f"pagecache:{get_generation()}:{static_version}:{request.get_full_path()}"
+    )
+
+
+def has_visitor_state(request):
+    """Return True if the request carries a session or messages cookie."""
+    cookies = request.COOKIES
+    return settings.SESSION_COOKIE_NAME in cookies or any(
+        name in cookies for name in PAGE_CACHE_BYPASS_COOKIES
+    )
+
+
+def is_cacheable_request(request):
+    """Return True for anonymous GET/HEAD requests without session state."""
+    if not getattr(settings, "PAGE_CACHE_ENABLED", True):
+        return False
+    # Snapshots (core.prerender) must reflect the database, not the cache
+    if getattr(request, "prerendering", False):
+        return False
+    if request.method not in ("GET", "HEAD") or has_visitor_state(request):
+        return False
+    return not request.user.is_authenticated
+
+
+def is_cacheable_response(request, response):
+    """Return True if a response can be served to other visitors."""
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+    )
+
+
+def lookup_page(request):
+    """
+    Look a request up in the page cache.
+
+    Returns:
+        tuple: (key, response). The key is None when the request must not
+        be cached; the response is None on a miss.
+    """
+    if not is_cacheable_request(request):
+        return None, None
+    key = get_page_key(request)
+    cached = cache.get(key)
+    if cached is None:
+        return key, None
+    content, content_type = cached
+    response = HttpResponse(content, content_type=content_type)
+    response["X-Page-Cache"] = "HIT"
+    patch_vary_headers(response, ("Cookie",))
+    return key, response
+
+
+def store_page(key, request, response, timeout_setting):
+    """Cache a freshly rendered page if it can be served to other visitors."""
+    if is_cacheable_response(request, response):
+        seconds = getattr(settings, timeout_setting, DEFAULT_PAGE_CACHE_TIMEOUT)
+        cache.set(key, (response.content, response["Content-Type"]), seconds)
+        response["X-Page-Cache"] = "MISS"
+        patch_vary_headers(response, ("Cookie",))
+
+
+def cache_public_page(timeout_setting="PAGE_CACHE_TIMEOUT"):
+    """
+    Cache a view's response for anonymous visitors.
+
+    Authenticated users and visitors with a session fall through to the
+    view. Hits and misses are reported in an ``X-Page-Cache`` header. Async
+    views get an async wrapper that does the cache work in a thread.
+
+    Args:
+        timeout_setting (str): Name of the setting holding the number of
+            seconds to cache for
+    """
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                key, response = await sync_to_async(lookup_page)(request)
+                if response is None:
+                    response = await view_func(request, *args, **kwargs)
+                    if key is not None:
+                        await sync_to_async(store_page)(
+                            key, request, response, timeout_setting
+                        )
+                return response
+
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            key, response = lookup_page(request)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+                if key is not None:
+                    store_page(key, request, response, timeout_setting)
+            return response
+
+        return wrapper
+
+    return decorator
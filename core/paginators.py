@@ -0,0 +1,58 @@
+"""
+Paginators for large admin changelists.
+"""
+
+import json
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+# Above this many rows the planner's estimate is used instead of COUNT(*)
+DEFAULT_ESTIMATED_COUNT_THRESHOLD = 10000
+
+
+def estimate_count(queryset):
+    """
+    Return the query planner's row estimate for a queryset.
+
+    Only PostgreSQL exposes a usable estimate (via EXPLAIN); other
+    backends return None so callers fall back to an exact count.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that trusts the planner's estimate on very large result sets.
+
+    Small result sets (or backends without an estimate) still get an exact
+    COUNT(*), so page numbers stay accurate where it is cheap to do so.
+    Pair with ``show_full_result_count = False`` on the ModelAdmin to also
+    skip the unfiltered total count.
+    """
+
+    @cached_property
+    def count(self):
+        """Return an estimated count above the threshold, exact otherwise."""
+        threshold = getattr(
+            settings,
+            "ADMIN_ESTIMATED_COUNT_THRESHOLD",
+            DEFAULT_ESTIMATED_COUNT_THRESHOLD,
+        )
+        if hasattr(self.object_list, "query"):
+            estimate = estimate_count(self.object_list)
+            if estimate is not None and estimate > threshold:
+                return estimate
+        return super().count
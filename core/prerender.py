@@ -0,0 +1,189 @@
+"""
+Pre-rendered HTML snapshots of the public schedule pages.
+
+``prerender_public`` renders the home, about and session list pages and the
+detail page of every upcoming session as an anonymous visitor sees them,
+storing each as a ``PageSnapshot`` row. ``PrerenderedPageMiddleware`` serves
+those rows to anonymous visitors with one indexed query instead of the
+view's. When a session, booking or the track changes, only the affected
+paths are queued for the ``core.prerender`` job and rendered again; until
+then the previous snapshot keeps being served. Snapshots older than
+PRERENDER_MAX_AGE are not served, so pages that change with the clock (a
+session starting, the next day's schedule) fall back to the views if the
+scheduled full run stops. Nothing is written or served unless
+PRERENDER_ENABLED is on.
+"""
+
+import re
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import transaction
+from django.http import Http404, HttpRequest
+from django.urls import Resolver404, resolve, reverse
+from django.utils import timezone
+from sessions.models import SessionSlot
+from .jobs import enqueue, register_job
+from .models import Job, PageSnapshot
+from .page_cache import is_cacheable_response
+
+PRERENDER_JOB = "core.prerender"
+
+# URL names of the public pages that do not depend on a single session
+PRERENDER_PAGES = ("core:home", "core:about", "sessions:session_list")
+
+# Seconds a snapshot is served for after it was rendered
+DEFAULT_PRERENDER_MAX_AGE = 900
+
+# Only plain slash-terminated paths get snapshots
+_SNAPSHOT_PATH = re.compile(r"^/(?:[\w-]+/)*$")
+
+
+def prerender_enabled():
+    """Return True when snapshots should be written and served."""
+    return getattr(settings, "PRERENDER_ENABLED", False)
+
+
+def is_snapshot_path(path):
+    """Return True if a URL path can have a snapshot."""
+    return bool(_SNAPSHOT_PATH.match(path))
+
+
+def read_snapshot(path):
+    """Return the snapshot bytes for a URL path, or None if there is none."""
+    if not is_snapshot_path(path):
+        return None
+    max_age = getattr(settings, "PRERENDER_MAX_AGE", DEFAULT_PRERENDER_MAX_AGE)
+    content = (
+        PageSnapshot.objects.filter(
+            path=path, rendered_at__gte=timezone.now() - timedelta(seconds=max_age)
+        )
+        .values_list("content", flat=True)
+        .first()
+    )
+    # PostgreSQL returns a memoryview
+    return bytes(content) if content is not None else None
+
+
+def get_session_paths(session_id):
+    """Return the public paths that show a session's details or free places."""
+    return [reverse(name) for name in PRERENDER_PAGES] + [
+        reverse("sessions:session_detail", args=[session_id])
+    ]
+
+
+def get_public_paths():
+    """Return every public path that gets a snapshot."""
+    upcoming = SessionSlot.objects.filter(
+        start_datetime__gte=timezone.now()
+    ).values_list("pk", flat=True)
+    return [reverse(name) for name in PRERENDER_PAGES] + [
+        reverse("sessions:session_detail", args=[pk]) for pk in upcoming
+    ]
+
+
+def render_page(path):
+    """
+    Render a path as an anonymous visitor without a session.
+
+    Returns:
+        bytes: Page content, or None if the page is missing or cannot be
+        shared between visitors
+    """
+    request = HttpRequest()
+    request.method = "GET"
+    request.path = request.path_info = path
+    request.user = AnonymousUser()
+    request.prerendering = True
+    try:
+        request.resolver_match = match = resolve(path)
+        view = match.func
+        if iscoroutinefunction(view):
+            # Async views are routed when ASYNC_VIEWS is on
+            view = async_to_sync(view)
+        response = view(request, *match.args, **match.kwargs)
+    except (Resolver404, Http404):
+        return None
+    if hasattr(response, "render"):
+        response.render()
+    if not is_cacheable_response(request, response):
+        return None
+    return response.content
+
+
+def write_snapshot(path, content):
+    """Store the snapshot for a path, replacing any earlier one."""
+    PageSnapshot.objects.update_or_create(
+        path=path, defaults={"content": content, "rendered_at": timezone.now()}
+    )
+
+
+def prerender(paths=None):
+    """
+    Render public pages to snapshots.
+
+    Args:
+        paths (list, optional): URL paths to render. Defaults to every
+            public path, in which case snapshots of paths that are no
+            longer public (past or deleted sessions) are removed too.
+
+    Returns:
+        dict: Counts of 'rendered' and 'removed' snapshots
+    """
+    full = paths is None
+    if full:
+        paths = get_public_paths()
+
+    counts = {"rendered": 0, "removed": 0}
+    for path in paths:
+        if not is_snapshot_path(path):
+            continue
+        content = render_page(path)
+        if content is None:
+            counts["removed"] += PageSnapshot.objects.filter(path=path).delete()[0]
+            continue
+        write_snapshot(path, content)
+        counts["rendered"] += 1
+
+    if full:
+        counts["removed"] += PageSnapshot.objects.exclude(path__in=paths).delete()[0]
+    return counts
+
+
+def schedule_prerender(paths=None):
+    """
+    Queue paths, or every public page, to be rendered again after commit.
+
+    Changes made while a prerender job is still queued are merged into it,
+    so a burst of bookings renders each page once.
+    """
+    if not prerender_enabled():
+        return
+    transaction.on_commit(lambda: _queue_prerender(paths))
+
+
+def _queue_prerender(paths):
+    for job in Job.objects.filter(name=PRERENDER_JOB, status="QUEUED"):
+        queued = job.payload.get("paths")
+        merged = None if queued is None or paths is None else sorted(
+            set(queued) | set(paths)
+        )
+        # Only merge while the worker has not claimed the job
+        if Job.objects.filter(pk=job.pk, status="QUEUED").update(
+            payload={"paths": merged}
+        ):
+            return
+    enqueue(
+        PRERENDER_JOB,
+        {"paths": sorted(paths) if paths is not None else None},
+        description="Render public page snapshots",
+    )
+
+
+@register_job(PRERENDER_JOB)
+def prerender_pages(job, paths=None):
+    """Render queued public page snapshots."""
+    counts = prerender(paths)
+    job.advance(counts["rendered"] + counts["removed"], **counts)
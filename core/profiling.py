@@ -0,0 +1,95 @@
+"""
+On-disk ring of cProfile results for manager-triggered profiling.
+
+Profiles are written by ``ProfilerMiddleware`` as pstats files named
+``<timestamp>_<label>_<ms>ms.prof``. Only the newest PROFILE_RING_SIZE
+files are kept.
+"""
+
+import io
+import os
+import pstats
+import re
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+# Profiles kept on disk; older ones are deleted
+DEFAULT_PROFILE_RING_SIZE = 20
+
+_PROFILE_NAME = re.compile(r"^[\w.-]+\.prof$")
+_UNSAFE_CHARS = re.compile(r"[^\w-]+")
+
+
+def get_profile_dir():
+    """Return the profile directory, creating it if needed."""
+    directory = Path(
+        getattr(settings, "PROFILE_DIR", None)
+        or os.path.join(tempfile.gettempdir(), "kartcontrol-profiles")
+    )
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def save_profile(profiler, label, duration_ms):
+    """
+    Write a finished profiler's stats and trim the ring.
+
+    Args:
+        profiler (cProfile.Profile): Disabled profiler
+        label (str): View name or path the profile belongs to
+        duration_ms (float): Wall time of the profiled request
+
+    Returns:
+        str: File name of the saved profile
+    """
+    directory = get_profile_dir()
+    label = _UNSAFE_CHARS.sub("-", label).strip("-")[:60] or "request"
+    name = f"{timezone.now():%Y%m%dT%H%M%S%f}_{label}_{int(duration_ms)}ms.prof"
+    profiler.dump_stats(directory / name)
+
+    ring_size = getattr(settings, "PROFILE_RING_SIZE", DEFAULT_PROFILE_RING_SIZE)
+    for old in sorted(directory.glob("*.prof"), reverse=True)[ring_size:]:
+        old.unlink(missing_ok=True)
+    return name
+
+
+def list_profiles():
+    """Return saved profiles, newest first, as dicts for display."""
+    profiles = []
+    for path in sorted(get_profile_dir().glob("*.prof"), reverse=True):
+        stamp, _, rest = path.stem.partition("_")
+        label, _, duration = rest.rpartition("_")
+        try:
+            created = datetime.strptime(stamp, "%Y%m%dT%H%M%S%f")
+        except ValueError:
+            created = None
+        profiles.append(
+            {
+                "name": path.name,
+                "label": label,
+                "duration": duration,
+                "created": created,
+                "size": path.stat().st_size,
+            }
+        )
+    return profiles
+
+
+def get_profile_path(name):
+    """Return the path of a saved profile, or None if it does not exist."""
+    if not _PROFILE_NAME.match(name):
+        return None
+    path = get_profile_dir() / name
+    return path if path.is_file() else None
+
+
+def format_profile(path, sort="cumulative", limit=60):
+    """Return a pstats text summary of a saved profile."""
+    output = io.StringIO()
+    stats = pstats.Stats(str(path), stream=output)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return output.getvalue()
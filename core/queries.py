@@ -0,0 +1,30 @@
+"""
+SQL helpers shared by the query budget tests and query instrumentation.
+"""
+
+import re
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+_PLACEHOLDER = re.compile(r"%(?:\(\w+\))?s")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """
+    Normalise a SQL statement so repeats of the same query compare equal.
+
+    String and numeric literals and ``%s``/``%(name)s`` placeholders become
+    ``?``, ``IN (...)`` lists collapse to ``IN (?)`` and whitespace is
+    squeezed, e.g.::
+
+        SELECT ... WHERE "id" = 42 AND "status" IN ('A', 'B')
+        SELECT ... WHERE "id" = %s AND "status" IN (%s, %s)
+        SELECT ... WHERE "id" = ? AND "status" IN (?)
+    """
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _WHITESPACE.sub(" ", sql).strip()
+    return _IN_LIST.sub("IN (?)", sql)
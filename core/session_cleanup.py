@@ -0,0 +1,50 @@
+"""
+Batched removal of expired web sessions.
+
+Django's ``clearsessions`` deletes every expired row in one statement, which
+holds locks on ``django_session`` for as long as it runs. These helpers
+delete in small batches so logins and requests keep flowing during a purge.
+"""
+
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore as DBSessionStore
+from django.utils import timezone
+
+# Expired sessions deleted per statement
+DEFAULT_PURGE_BATCH_SIZE = 5000
+
+
+def uses_session_table():
+    """Return True when the session engine stores rows in the database."""
+    engine = import_module(settings.SESSION_ENGINE)
+    return issubclass(engine.SessionStore, DBSessionStore)
+
+
+def purge_expired_sessions(batch_size=DEFAULT_PURGE_BATCH_SIZE, pause=0, dry_run=False):
+    """
+    Delete expired database sessions in batches.
+
+    Args:
+        batch_size (int): Sessions deleted per statement
+        pause (float): Seconds to sleep between batches
+        dry_run (bool): Only count the expired sessions
+
+    Returns:
+        int: Number of sessions deleted, or that would be deleted
+    """
+    model = import_module(settings.SESSION_ENGINE).SessionStore.get_model_class()
+    expired = model.objects.filter(expire_date__lt=timezone.now())
+    if dry_run:
+        return expired.count()
+
+    deleted = 0
+    while True:
+        keys = list(expired.values_list("session_key", flat=True)[:batch_size])
+        if not keys:
+            return deleted
+        deleted += model.objects.filter(session_key__in=keys).delete()[0]
+        if pause and len(keys) == batch_size:
+            time.sleep(pause)
@@ -0,0 +1,133 @@
+"""
+Signal handlers that keep the daily rollup table, cached public pages and
+pre-rendered snapshots in sync.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from bookings.models import Booking
+from sessions.models import ScheduleRule, SessionSlot, Track
+from .models import DailyRollup
+from .page_cache import invalidate_public_pages
+from .prerender import get_session_paths, schedule_prerender
+
+_state = threading.local()
+
+
+@contextmanager
+def rollups_suspended():
+    """
+    Skip per-row rollup refreshes inside the block.
+
+    For bulk deletes and loads; callers must run
+    ``DailyRollup.objects.rebuild()`` for the affected range afterwards.
+    """
+    previous = getattr(_state, "suspended", False)
+    _state.suspended = True
+    try:
+        yield
+    finally:
+        _state.suspended = previous
+
+
+def _suspended():
+    return getattr(_state, "suspended", False)
+
+
+@receiver(post_save, sender=Booking)
+def rollup_booking_created(sender, instance, created, raw=False, **kwargs):
+    """
+    Count a new booking against the day it was created.
+
+    The increment runs after the booking commits, so the day's rollup row
+    is not locked for the rest of the booking transaction.
+    """
+    if created and not raw and not _suspended():
+        day = timezone.localdate(instance.created_at)
+        transaction.on_commit(lambda: DailyRollup.objects.add_bookings(day, 1))
+
+
+@receiver(post_delete, sender=Booking)
+def rollup_booking_deleted(sender, instance, **kwargs):
+    """Remove a deleted booking from its creation day."""
+    if not _suspended():
+        day = timezone.localdate(instance.created_at)
+        transaction.on_commit(lambda: DailyRollup.objects.add_bookings(day, -1))
+
+
+@receiver(pre_save, sender=SessionSlot)
+def remember_session_day(sender, instance, raw=False, **kwargs):
+    """
+    Remember the day an existing session started on before it is edited,
+    so a rescheduled session is removed from its old day as well.
+    """
+    instance._rollup_previous_day = None
+    if instance.pk and not raw and not _suspended():
+        previous = (
+            SessionSlot.objects.filter(pk=instance.pk)
+            .values_list("start_datetime", flat=True)
+            .first()
+        )
+        if previous:
+            instance._rollup_previous_day = timezone.localdate(previous)
+
+
+@receiver(post_save, sender=SessionSlot)
+def rollup_session_saved(sender, instance, raw=False, **kwargs):
+    """Count a new or rescheduled session against its start day."""
+    if raw or _suspended():
+        return
+    day = timezone.localdate(instance.start_datetime)
+    previous_day = getattr(instance, "_rollup_previous_day", None)
+    if previous_day == day:
+        return
+    DailyRollup.objects.refresh_day(day)
+    if previous_day:
+        DailyRollup.objects.refresh_day(previous_day)
+
+
+@receiver(post_delete, sender=SessionSlot)
+def rollup_session_deleted(sender, instance, **kwargs):
+    """Remove a deleted session from its start day."""
+    if not _suspended():
+        DailyRollup.objects.refresh_day(timezone.localdate(instance.start_datetime))
+
+
+@receiver(post_save, sender=Track)
+@receiver(post_delete, sender=Track)
+@receiver(post_save, sender=SessionSlot)
+@receiver(post_delete, sender=SessionSlot)
+@receiver(post_save, sender=ScheduleRule)
+@receiver(post_delete, sender=ScheduleRule)
+def invalidate_page_cache(sender, **kwargs):
+    """Drop cached public pages when the track or schedule changes."""
+    invalidate_public_pages()
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def prerender_booking_session(sender, instance, raw=False, **kwargs):
+    """Re-render the pages showing free places for a booking's session."""
+    if not raw:
+        schedule_prerender(get_session_paths(instance.session_slot_id))
+
+
+@receiver(post_save, sender=SessionSlot)
+@receiver(post_delete, sender=SessionSlot)
+def prerender_session(sender, instance, raw=False, **kwargs):
+    """Re-render the pages showing a changed session."""
+    if not raw:
+        schedule_prerender(get_session_paths(instance.pk))
+
+
+@receiver(post_save, sender=Track)
+@receiver(post_delete, sender=Track)
+def prerender_track(sender, raw=False, **kwargs):
+    """Re-render every public page when the track changes."""
+    if not raw:
+        schedule_prerender()
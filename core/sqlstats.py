@@ -0,0 +1,151 @@
+"""
+Process-wide SQL fingerprint statistics.
+
+Every request sampled by ``RequestTimingMiddleware`` is folded into
+``query_stats``. Queries are grouped by fingerprint (literals stripped) and
+tracked in total and per view. A view is flagged as a likely N+1 when one
+fingerprint runs more than SQL_REPEAT_THRESHOLD times in a single request.
+
+Statistics live in the memory of each worker process and reset on restart.
+"""
+
+import threading
+from collections import Counter, deque
+
+from django.conf import settings
+from django.utils import timezone
+from .queries import fingerprint
+from .stats import percentile
+
+# Same fingerprint repeated more than this in one request flags a view
+DEFAULT_SQL_REPEAT_THRESHOLD = 10
+
+# Fingerprints tracked per process; new ones beyond this are dropped
+MAX_FINGERPRINTS = 1000
+
+# Recent durations kept per fingerprint for percentile estimates
+DURATION_SAMPLES = 200
+
+
+class FingerprintStats:
+    """Call count, total time and recent durations of one fingerprint."""
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ms = 0.0
+        self.durations = deque(maxlen=DURATION_SAMPLES)
+
+    def add(self, duration_ms):
+        """Record one execution."""
+        self.calls += 1
+        self.total_ms += duration_ms
+        self.durations.append(duration_ms)
+
+    def as_dict(self):
+        """Return the statistics as a JSON-serialisable dict."""
+        return {
+            "calls": self.calls,
+            "total_ms": round(self.total_ms, 2),
+            "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else 0,
+            "p95_ms": round(percentile(list(self.durations), 95), 3),
+        }
+
+
+class QueryStats:
+    """Thread-safe aggregator of SQL fingerprint statistics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Discard all collected statistics."""
+        with self._lock:
+            self.started_at = timezone.now()
+            self.requests = 0
+            self.fingerprints = {}
+            self.views = {}
+            self.repeats = {}
+
+    @property
+    def repeat_threshold(self):
+        """Return the per-request repeat count that flags an N+1."""
+        return getattr(
+            settings, "SQL_REPEAT_THRESHOLD", DEFAULT_SQL_REPEAT_THRESHOLD
+        )
+
+    def record_request(self, view, queries):
+        """
+        Fold one request's queries into the statistics.
+
+        Args:
+            view (str): View name, or None when the URL did not resolve
+            queries (list): (sql, duration_ms) tuples in execution order
+        """
+        view = view or "<unresolved>"
+        timed = [(fingerprint(sql), duration) for sql, duration in queries]
+        per_request = Counter(fp for fp, _ in timed)
+        threshold = self.repeat_threshold
+
+        with self._lock:
+            self.requests += 1
+            view_stats = self.views.setdefault(view, {})
+            for fp, duration in timed:
+                stats = self.fingerprints.get(fp)
+                if stats is None:
+                    if len(self.fingerprints) >= MAX_FINGERPRINTS:
+                        continue
+                    stats = self.fingerprints[fp] = FingerprintStats()
+                stats.add(duration)
+                view_stats.setdefault(fp, FingerprintStats()).add(duration)
+
+            for fp, count in per_request.items():
+                if count <= threshold:
+                    continue
+                flag = self.repeats.setdefault(
+                    (view, fp), {"requests": 0, "max_repeats": 0}
+                )
+                flag["requests"] += 1
+                flag["max_repeats"] = max(flag["max_repeats"], count)
+                flag["last_seen"] = timezone.now().isoformat()
+
+    def snapshot(self, limit=50):
+        """
+        Return the statistics as a JSON-serialisable dict.
+
+        Fingerprints are ordered by total time, so the hottest come first.
+        """
+        with self._lock:
+            hot = sorted(
+                self.fingerprints.items(), key=lambda item: -item[1].total_ms
+            )[:limit]
+            views = {
+                view: sorted(
+                    (
+                        {"fingerprint": fp, **stats.as_dict()}
+                        for fp, stats in fingerprints.items()
+                    ),
+                    key=lambda row: -row["total_ms"],
+                )[:limit]
+                for view, fingerprints in sorted(self.views.items())
+            }
+            flagged = sorted(
+                (
+                    {"view": view, "fingerprint": fp, **flag}
+                    for (view, fp), flag in self.repeats.items()
+                ),
+                key=lambda row: -row["max_repeats"],
+            )
+            return {
+                "started_at": self.started_at.isoformat(),
+                "requests": self.requests,
+                "repeat_threshold": self.repeat_threshold,
+                "flagged": flagged,
+                "fingerprints": [
+                    {"fingerprint": fp, **stats.as_dict()} for fp, stats in hot
+                ],
+                "views": views,
+            }
+
+
+query_stats = QueryStats()
@@ -0,0 +1,15 @@
+"""
+Small statistics helpers shared by the request instrumentation and the
+benchmark tools.
+"""
+
+import math
+
+
+def percentile(values, pct):
+    """Return the nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
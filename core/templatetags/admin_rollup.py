@@ -0,0 +1,146 @@
+"""
+Admin template tags backed by the precomputed daily rollup table.
+"""
+
+import datetime
+
+from django.contrib.admin.templatetags.admin_list import date_hierarchy
+from django.contrib.admin.templatetags.base import InclusionAdminNode
+from django.contrib.admin.views.main import ALL_VAR, IS_POPUP_VAR, ORDER_VAR, PAGE_VAR
+from django.template import Library
+from django.utils import formats
+from django.utils.text import capfirst
+from django.utils.translation import gettext as _
+
+from core.models import DailyRollup
+
+register = Library()
+
+# Query string parameters that never narrow the changelist queryset
+NON_FILTER_PARAMS = {ALL_VAR, IS_POPUP_VAR, ORDER_VAR, PAGE_VAR}
+
+
+def _can_use_rollup(cl):
+    """
+    Return True when the rollup describes the changelist exactly.
+
+    The rollup holds whole-table counts, so any search or filter other
+    than the date hierarchy itself falls back to Django's live queries.
+    """
+    counter = getattr(cl.model_admin, "date_hierarchy_rollup", None)
+    if not counter or cl.query or cl.has_active_filters:
+        return False
+    field_generic = "%s__" % cl.date_hierarchy
+    return all(
+        key in NON_FILTER_PARAMS or key.startswith(field_generic)
+        for key in cl.params
+    )
+
+
+def rollup_date_hierarchy(cl):
+    """
+    Display the date hierarchy using the daily rollup table.
+
+    Mirrors ``django.contrib.admin``'s ``date_hierarchy`` tag, but reads the
+    available years, months and days from ``DailyRollup`` instead of running
+    a DISTINCT date truncation over the model's table.
+    """
+    if not cl.date_hierarchy:
+        return None
+    if not _can_use_rollup(cl):
+        return date_hierarchy(cl)
+
+    counter = cl.model_admin.date_hierarchy_rollup
+    days = DailyRollup.objects.filter(**{f"{counter}__gt": 0})
+
+    field_name = cl.date_hierarchy
+    year_field = "%s__year" % field_name
+    month_field = "%s__month" % field_name
+    day_field = "%s__day" % field_name
+    field_generic = "%s__" % field_name
+    year_lookup = cl.params.get(year_field)
+    month_lookup = cl.params.get(month_field)
+    day_lookup = cl.params.get(day_field)
+
+    def link(filters):
+        return cl.get_query_string(filters, [field_generic])
+
+    if not (year_lookup or month_lookup or day_lookup):
+        # Select the appropriate start level, as Django does
+        first = days.order_by("day").values_list("day", flat=True).first()
+        last = days.order_by("-day").values_list("day", flat=True).first()
+        if first and last and first.year == last.year:
+            year_lookup = first.year
+            if first.month == last.month:
+                month_lookup = first.month
+
+    if year_lookup and month_lookup and day_lookup:
+        day = datetime.date(int(year_lookup), int(month_lookup), int(day_lookup))
+        return {
+            "show": True,
+            "back": {
+                "link": link({year_field: year_lookup, month_field: month_lookup}),
+                "title": capfirst(formats.date_format(day, "YEAR_MONTH_FORMAT")),
+            },
+            "choices": [
+                {"title": capfirst(formats.date_format(day, "MONTH_DAY_FORMAT"))}
+            ],
+        }
+    elif year_lookup and month_lookup:
+        month_days = days.filter(
+            day__year=int(year_lookup), day__month=int(month_lookup)
+        ).dates("day", "day")
+        return {
+            "show": True,
+            "back": {
+                "link": link({year_field: year_lookup}),
+                "title": str(year_lookup),
+            },
+            "choices": [
+                {
+                    "link": link(
+                        {
+                            year_field: year_lookup,
+                            month_field: month_lookup,
+                            day_field: day.day,
+                        }
+                    ),
+                    "title": capfirst(formats.date_format(day, "MONTH_DAY_FORMAT")),
+                }
+                for day in month_days
+            ],
+        }
+    elif year_lookup:
+        months = days.filter(day__year=int(year_lookup)).dates("day", "month")
+        return {
+            "show": True,
+            "back": {"link": link({}), "title": _("All dates")},
+            "choices": [
+                {
+                    "link": link({year_field: year_lookup, month_field: month.month}),
+                    "title": capfirst(formats.date_format(month, "YEAR_MONTH_FORMAT")),
+                }
+                for month in months
+            ],
+        }
+    years = days.dates("day", "year")
+    return {
+        "show": True,
+        "back": None,
+        "choices": [
+            {"link": link({year_field: str(year.year)}), "title": str(year.year)}
+            for year in years
+        ],
+    }
+
+
+@register.tag(name="rollup_date_hierarchy")
+def rollup_date_hierarchy_tag(parser, token):
+    """Render the rollup-backed date hierarchy with the admin template."""
+    return InclusionAdminNode(
+        parser,
+        token,
+        func=rollup_date_hierarchy,
+        template_name="date_hierarchy.html",
+        takes_context=False,
+    )
@@ -0,0 +1,31 @@
+"""
+Template tags that link and preload the site's static bundles.
+"""
+
+from django.template import Library
+from django.utils.html import format_html_join
+
+from core.assets import get_bundle_urls
+
+register = Library()
+
+
+@register.simple_tag
+def bundle(name):
+    """Link a CSS or JavaScript bundle (see core.assets)."""
+    if name.endswith(".css"):
+        html = '<link rel="stylesheet" href="{}" />'
+    else:
+        html = '<script src="{}"></script>'
+    return format_html_join("\n", html, ((url,) for url in get_bundle_urls(name)))
+
+
+@register.simple_tag
+def preload_bundle(name):
+    """Emit preload hints so the browser fetches a bundle early."""
+    kind = "style" if name.endswith(".css") else "script"
+    return format_html_join(
+        "\n",
+        '<link rel="preload" href="{}" as="{}" />',
+        ((url, kind) for url in get_bundle_urls(name)),
+    )
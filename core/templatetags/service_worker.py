@@ -0,0 +1,34 @@
+"""
+Template tag that links the service worker for the signed-in user.
+"""
+
+from django.template import Library
+from django.urls import reverse
+from django.utils.crypto import salted_hmac
+from django.utils.http import urlencode
+
+register = Library()
+
+
+def get_cache_user(user):
+    """
+    Return an opaque id that names the user's page cache in the worker.
+
+    Empty for anonymous visitors, whose pages are the same for everyone.
+    """
+    if user is None or not user.is_authenticated:
+        return ""
+    return salted_hmac("core.service_worker", user.pk).hexdigest()[:16]
+
+
+@register.simple_tag(takes_context=True)
+def service_worker_url(context):
+    """
+    Return the service worker URL, carrying the user's cache id.
+
+    A different user means a different script URL, so the browser installs
+    the worker again and its activation deletes the previous user's pages.
+    """
+    url = reverse("core:service_worker")
+    cache_user = get_cache_user(context.get("user"))
+    return f"{url}?{urlencode({'user': cache_user})}" if cache_user else url
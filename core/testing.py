@@ -0,0 +1,134 @@
+"""
+Query budget harness for tests.
+
+Renders every public, driver and manager page and every admin changelist,
+recording the SQL each one runs, so tests can assert that query counts do
+not grow with the number of rows on the page.
+"""
+
+from collections import Counter
+
+from django.contrib import admin
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from bookings.models import Booking
+from sessions.models import SessionSlot
+from .queries import fingerprint
+
+
+def get_query_budget_pages(driver):
+    """
+    Return the (name, role, url) pages covered by the query budget.
+
+    Data-dependent pages use the driver's most recent booking and the
+    next upcoming session.
+    """
+    session = (
+        SessionSlot.objects.filter(start_datetime__gte=timezone.now())
+        .order_by("start_datetime")
+        .first()
+    )
+    booking = Booking.objects.filter(driver=driver).order_by("-created_at").first()
+
+    public = [
+        "core:home",
+        "core:about",
+        "core:contact",
+        "core:privacy_policy",
+        "core:terms_of_service",
+        "sessions:session_list",
+        "accounts:login",
+        "accounts:register",
+    ]
+    driver_pages = [
+        "core:home",
+        "sessions:session_list",
+        "bookings:booking_list",
+        "accounts:profile",
+        "accounts:profile_edit",
+    ]
+    manager_pages = ["core:home", "sessions:session_list", "bookings:booking_list"]
+
+    pages = [(name, "anonymous", reverse(name)) for name in public]
+    pages += [(name, "driver", reverse(name)) for name in driver_pages]
+    pages += [(name, "manager", reverse(name)) for name in manager_pages]
+    if session:
+        detail = reverse("sessions:session_detail", args=[session.pk])
+        pages += [
+            ("sessions:session_detail", "anonymous", detail),
+            ("sessions:session_detail", "driver", detail),
+            (
+                "bookings:booking_create",
+                "driver",
+                reverse("bookings:booking_create", args=[session.pk]),
+            ),
+        ]
+    if booking:
+        pages += [
+            (
+                "bookings:booking_detail",
+                role,
+                reverse("bookings:booking_detail", args=[booking.pk]),
+            )
+            for role in ("driver", "manager")
+        ]
+
+    pages.append(("admin:index", "admin", reverse("admin:index")))
+    for model in admin.site._registry:
+        opts = model._meta
+        name = f"admin:{opts.app_label}_{opts.model_name}_changelist"
+        pages.append((name, "admin", reverse(name)))
+    return pages
+
+
+def capture_page_queries(users, driver):
+    """
+    Request every query budget page and record the SQL it ran.
+
+    Args:
+        users (dict): Role name to user; 'anonymous' maps to None
+        driver (User): Driver whose booking pages are rendered
+
+    Returns:
+        dict: 'name:role' to list of executed SQL statements
+    """
+    clients = {}
+    captured = {}
+    for name, role, url in get_query_budget_pages(driver):
+        if role not in clients:
+            clients[role] = Client()
+            if users[role] is not None:
+                clients[role].force_login(users[role])
+        with CaptureQueriesContext(connection) as queries:
+            response = clients[role].get(url)
+        if response.status_code != 200:
+            raise AssertionError(f"{name} as {role} returned {response.status_code}")
+        captured[f"{name}:{role}"] = [q["sql"] for q in queries.captured_queries]
+    return captured
+
+
+def query_growth(small, large):
+    """
+    Describe pages whose query count grew between two captures.
+
+    Returns:
+        list: One message per page, listing the fingerprints that repeat
+        more often at the larger data size
+    """
+    problems = []
+    for key, large_sql in large.items():
+        small_sql = small.get(key, [])
+        if len(large_sql) <= len(small_sql):
+            continue
+        extra = Counter(map(fingerprint, large_sql)) - Counter(
+            map(fingerprint, small_sql)
+        )
+        lines = [f"  +{count} x {sql}" for sql, count in extra.most_common(5)]
+        problems.append(
+            f"{key}: {len(small_sql)} -> {len(large_sql)} queries\n" + "\n".join(lines)
+        )
+    return problems
@@ -2,7 +2,7 @@
 Tests for core app - Homepage, about, contact, and general views.
 """
 
-from django.test import TestCase, Client
+from django.test import Client, LiveServerTestCase, TestCase, override_settings
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.utils import timezone
@@ -240,3 +240,1266 @@ class URLRoutingTests(TestCase):
         """Test that contact URL resolves correctly."""
         response = self.client.get(reverse("core:contact"))
         self.assertEqual(response.status_code, 200)
+
+
+class DailyRollupTests(TestCase):
+    """Test the precomputed per-day rollup and admin changelist paging."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.track = Track.objects.create(
+            name="Test Track",
+            address="123 Test St",
+            phone="555-1234",
+            email="test@track.com",
+        )
+        self.start = timezone.now() + timedelta(days=3)
+        self.session = SessionSlot.objects.create(
+            track=self.track,
+            session_type="OPEN_SESSION",
+            start_datetime=self.start,
+            end_datetime=self.start + timedelta(hours=1),
+            capacity=10,
+            price=25.00,
+        )
+        self.driver = User.objects.create_user(username="driver", password="pass123")
+
+    def test_signals_keep_rollup_in_sync(self):
+        """Test that creating and moving rows updates the daily counts."""
+        from bookings.models import Booking
+        from core.models import DailyRollup
+
+        with self.captureOnCommitCallbacks(execute=True):
+            booking = Booking.objects.create(
+                session_slot=self.session, driver=self.driver
+            )
+        session_day = DailyRollup.objects.get(day=timezone.localdate(self.start))
+        booking_day = DailyRollup.objects.get(
+            day=timezone.localdate(booking.created_at)
+        )
+        self.assertEqual(session_day.session_count, 1)
+        self.assertEqual(booking_day.booking_count, 1)
+
+        # Rescheduling a session moves it to the new day
+        self.session.start_datetime += timedelta(days=2)
+        self.session.end_datetime += timedelta(days=2)
+        self.session.save()
+        self.assertFalse(
+            DailyRollup.objects.filter(
+                day=timezone.localdate(self.start), session_count__gt=0
+            ).exists()
+        )
+        self.assertEqual(
+            DailyRollup.objects.get(
+                day=timezone.localdate(self.session.start_datetime)
+            ).session_count,
+            1,
+        )
+
+    def test_booking_counts_are_incremented(self):
+        """Test that bookings adjust the day's count and deletions reverse it."""
+        from bookings.models import Booking
+        from core.models import DailyRollup
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first = Booking.objects.create(
+                session_slot=self.session, driver=self.driver
+            )
+            Booking.objects.create(
+                session_slot=self.session,
+                driver=User.objects.create_user(username="other", password="pass"),
+            )
+        day = timezone.localdate(first.created_at)
+        self.assertEqual(DailyRollup.objects.get(day=day).booking_count, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(DailyRollup.objects.get(day=day).booking_count, 1)
+
+    def test_rebuild_matches_signal_maintained_rows(self):
+        """Test that a full rebuild reproduces the same counts."""
+        from core.models import DailyRollup
+
+        before = list(DailyRollup.objects.values_list("day", "session_count"))
+        DailyRollup.objects.all().delete()
+        DailyRollup.objects.rebuild()
+        after = list(DailyRollup.objects.values_list("day", "session_count"))
+        self.assertEqual(before, after)
+
+    def test_estimated_paginator_falls_back_to_exact_count(self):
+        """Test that backends without planner estimates still count exactly."""
+        from core.paginators import EstimatedCountPaginator
+
+        paginator = EstimatedCountPaginator(SessionSlot.objects.all(), 25)
+        self.assertEqual(paginator.count, 1)
+
+    def test_estimated_paginator_uses_estimate_above_threshold(self):
+        """Test that large planner estimates replace COUNT(*)."""
+        from unittest import mock
+        from core.paginators import EstimatedCountPaginator
+
+        with mock.patch("core.paginators.estimate_count", return_value=500000):
+            paginator = EstimatedCountPaginator(SessionSlot.objects.all(), 25)
+            self.assertEqual(paginator.count, 500000)
+
+    def test_admin_date_hierarchy_reads_rollup(self):
+        """Test that the session changelist renders the rollup drill-down."""
+        manager = User.objects.create_superuser(
+            username="admin", password="adminpass123", email="admin@test.com"
+        )
+        self.client.force_login(manager)
+        response = self.client.get(
+            reverse("admin:session_slots_sessionslot_changelist")
+        )
+        self.assertEqual(response.status_code, 200)
+        day = timezone.localdate(self.start)
+        self.assertContains(response, 'class="toplinks"')
+        self.assertContains(response, f"start_datetime__day={day.day}")
+
+
+class LoadDataTests(TestCase):
+    """Test the synthetic load data generator."""
+
+    def generate(self, **kwargs):
+        """Generate a small dataset."""
+        from core.load_data import generate_load_data
+
+        options = {"drivers": 60, "days": 3, "history": 4, "karts": 12, "fill": 0.8}
+        options.update(kwargs)
+        return generate_load_data(**options)
+
+    def test_generated_bookings_respect_invariants(self):
+        """Test capacity, driver overlap and kart assignment invariants."""
+        from django.db.models import Count, F, Q
+        from bookings.models import Booking
+
+        counts = self.generate()
+        self.assertEqual(counts["drivers"], 60)
+        self.assertGreater(counts["bookings"], 0)
+        self.assertEqual(Booking.objects.count(), counts["bookings"])
+
+        active = Booking.objects.filter(status__in=["PENDING", "CONFIRMED"])
+        self.assertFalse(
+            SessionSlot.objects.annotate(
+                active=Count(
+                    "bookings",
+                    filter=Q(bookings__status__in=["PENDING", "CONFIRMED"]),
+                )
+            ).filter(active__gt=F("capacity")).exists()
+        )
+        for booking in active.select_related("session_slot"):
+            slot = booking.session_slot
+            self.assertFalse(
+                active.filter(
+                    driver_id=booking.driver_id,
+                    session_slot__start_datetime__lt=slot.end_datetime,
+                    session_slot__end_datetime__gt=slot.start_datetime,
+                ).exclude(pk=booking.pk).exists()
+            )
+        self.assertFalse(
+            Booking.objects.filter(assigned_kart__isnull=False)
+            .values("session_slot", "assigned_kart")
+            .annotate(n=Count("id"))
+            .filter(n__gt=1)
+            .exists()
+        )
+        self.assertFalse(
+            Booking.objects.filter(
+                status="CONFIRMED", assigned_kart__isnull=True
+            ).exists()
+        )
+
+    def test_same_seed_gives_same_bookings(self):
+        """Test that generation is deterministic for a seed."""
+        from bookings.models import Booking
+        from core.load_data import clear_load_data
+
+        def snapshot():
+            return list(
+                Booking.objects.order_by(
+                    "session_slot__start_datetime", "driver__username"
+                ).values_list(
+                    "session_slot__start_datetime", "driver__username", "status"
+                )
+            )
+
+        self.generate(seed=7)
+        first = snapshot()
+        clear_load_data()
+        self.generate(seed=7)
+        self.assertEqual(snapshot(), first)
+
+
+class BenchmarkTests(TestCase):
+    """Test the view benchmark harness."""
+
+    def test_run_benchmarks_reports_timings_and_queries(self):
+        """Test that each measured view reports percentiles and query counts."""
+        from core.benchmark import run_benchmarks
+        from core.load_data import generate_load_data
+
+        generate_load_data(drivers=20, days=2, history=1, karts=12)
+        report = run_benchmarks(iterations=2, warmup=0, only=["session_list"])
+
+        self.assertEqual(
+            set(report["views"]), {"session_list:anonymous", "session_list:driver"}
+        )
+        for result in report["views"].values():
+            self.assertEqual(result["status"], 200)
+            self.assertGreater(result["queries"], 0)
+            self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+
+    def test_compare_reports_flags_regressions(self):
+        """Test that extra queries or a slower p95 count as regressions."""
+        from core.benchmark import compare_reports
+
+        baseline = {"views": {"home:anonymous": {"p95_ms": 20.0, "queries": 5}}}
+        same = {"views": {"home:anonymous": {"p95_ms": 22.0, "queries": 5}}}
+        slower = {"views": {"home:anonymous": {"p95_ms": 40.0, "queries": 6}}}
+
+        self.assertEqual(compare_reports(same, baseline), [])
+        self.assertEqual(len(compare_reports(slower, baseline)), 2)
+
+
+class QueryBudgetTests(TestCase):
+    """Test that page query counts do not grow with the number of rows."""
+
+    def test_fingerprint_strips_literals(self):
+        """Test that queries differing only in literals share a fingerprint."""
+        from core.queries import fingerprint
+
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id = 42 AND s IN ('A', 'B')"),
+            fingerprint("SELECT *  FROM t WHERE id = 7 AND s IN ('C')"),
+        )
+
+    def test_query_counts_do_not_grow_with_rows(self):
+        """Test every page and admin changelist at two data sizes."""
+        from core.benchmark import get_benchmark_users
+        from core.load_data import generate_load_data
+        from core.testing import capture_page_queries, query_growth
+
+        generate_load_data(drivers=10, days=2, history=1, karts=12, fill=0.5)
+        users = get_benchmark_users()
+        small = capture_page_queries(users, users["driver"])
+
+        generate_load_data(drivers=40, days=8, history=8, karts=12, fill=0.8)
+        large = capture_page_queries(users, users["driver"])
+
+        problems = query_growth(small, large)
+        if problems:
+            self.fail("Query count grows with rows:\n" + "\n\n".join(problems))
+
+
+class RequestTimingMiddlewareTests(TestCase):
+    """Test request timing instrumentation."""
+
+    def setUp(self):
+        """Set up a session to render."""
+        track = Track.objects.create(
+            name="Test Track", address="123 Test St", phone="555-1234"
+        )
+        SessionSlot.objects.create(
+            track=track,
+            session_type="OPEN_SESSION",
+            start_datetime=timezone.now() + timedelta(days=1),
+            end_datetime=timezone.now() + timedelta(days=1, hours=1),
+            capacity=10,
+            price=25.00,
+        )
+
+    def test_disabled_by_default(self):
+        """Test that no timing header is added when instrumentation is off."""
+        response = Client().get(reverse("sessions:session_list"))
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(REQUEST_TIMING_ENABLED=True, REQUEST_TIMING_SLOW_MS=60000)
+    def test_logs_timings_and_sets_header(self):
+        """Test that a sampled request is logged and reported in Server-Timing."""
+        import json
+
+        with self.assertLogs("kartcontrol.requests", "INFO") as logs:
+            response = Client().get(reverse("sessions:session_list"))
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["view"], "sessions:session_list")
+        self.assertGreater(record["db_queries"], 0)
+        self.assertGreater(record["template_ms"], 0)
+        self.assertNotIn("sql", record)
+        self.assertIn("db;dur=", response["Server-Timing"])
+
+    @override_settings(REQUEST_TIMING_ENABLED=True, REQUEST_TIMING_SLOW_MS=0)
+    def test_slow_request_logs_sql(self):
+        """Test that requests over the slow threshold log their SQL."""
+        import json
+
+        with self.assertLogs("kartcontrol.requests", "WARNING") as logs:
+            Client().get(reverse("sessions:session_list"))
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(len(record["sql"]), record["db_queries"])
+
+    @override_settings(REQUEST_TIMING_ENABLED=True, REQUEST_TIMING_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_not_instrumented(self):
+        """Test that requests outside the sample pass straight through."""
+        response = Client().get(reverse("sessions:session_list"))
+        self.assertNotIn("Server-Timing", response)
+
+
+class QueryStatsTests(TestCase):
+    """Test the SQL fingerprint aggregator and its admin page."""
+
+    def test_repeated_fingerprint_flags_view(self):
+        """Test that one query shape repeated past the threshold is flagged."""
+        from core.sqlstats import QueryStats
+
+        stats = QueryStats()
+        queries = [(f"SELECT * FROM t WHERE id = {i}", 1.0) for i in range(12)]
+        stats.record_request("sessions:session_list", queries)
+        stats.record_request("core:home", queries[:2])
+
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["requests"], 2)
+        self.assertEqual(snapshot["fingerprints"][0]["calls"], 14)
+        self.assertEqual(len(snapshot["flagged"]), 1)
+        self.assertEqual(snapshot["flagged"][0]["view"], "sessions:session_list")
+        self.assertEqual(snapshot["flagged"][0]["max_repeats"], 12)
+
+    def test_placeholder_in_lists_share_fingerprint(self):
+        """Test that captured SQL with %s lists of any length groups together."""
+        from core.sqlstats import QueryStats
+
+        stats = QueryStats()
+        queries = [
+            (
+                'SELECT * FROM "t" WHERE "id" IN ('
+                + ", ".join(["%s"] * size)
+                + ') AND "x" = %(x)s LIMIT 21',
+                1.0,
+            )
+            for size in range(1, 4)
+        ]
+        stats.record_request("sessions:session_list", queries)
+
+        fingerprints = stats.snapshot()["fingerprints"]
+        self.assertEqual(len(fingerprints), 1)
+        self.assertEqual(fingerprints[0]["calls"], 3)
+        self.assertEqual(
+            fingerprints[0]["fingerprint"],
+            'SELECT * FROM "t" WHERE "id" IN (?) AND "x" = ? LIMIT ?',
+        )
+
+    def test_admin_page_is_manager_only(self):
+        """Test that only managers can view and download the statistics."""
+        staff = User.objects.create_user(username="staff", is_staff=True)
+        self.client.force_login(staff)
+        url = reverse("admin:sql_stats")
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        staff.profile.role = "MANAGER"
+        staff.profile.save()
+        self.assertEqual(self.client.get(url).status_code, 200)
+        response = self.client.get(url, {"format": "json"})
+        self.assertIn("flagged", response.json())
+
+
+class ProfilerMiddlewareTests(TestCase):
+    """Test manager-triggered request profiling and the profile admin pages."""
+
+    def setUp(self):
+        """Use a temporary profile directory and create a manager."""
+        import tempfile
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(PROFILE_DIR=directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.manager = User.objects.create_user(username="manager", is_staff=True)
+        self.manager.profile.role = "MANAGER"
+        self.manager.profile.save()
+
+    def test_manager_request_is_profiled(self):
+        """Test that a manager's ?_profile=1 request saves a profile."""
+        from core.profiling import list_profiles
+
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse("core:home"), {"_profile": "1"})
+
+        profiles = list_profiles()
+        self.assertEqual(len(profiles), 1)
+        self.assertEqual(response["X-Profile-Id"], profiles[0]["name"])
+        self.assertEqual(profiles[0]["label"], "core-home")
+
+    def test_header_triggers_profile(self):
+        """Test that the X-Profile header also triggers profiling."""
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse("core:home"), HTTP_X_PROFILE="1")
+        self.assertIn("X-Profile-Id", response)
+
+    def test_only_exact_trigger_values_profile(self):
+        """Test that only ?_profile=1 and X-Profile: 1 trigger profiling."""
+        from core.profiling import list_profiles
+
+        self.client.force_login(self.manager)
+        for params, headers in (
+            ({"_profile": "0"}, {}),
+            ({"show_profile": "1"}, {}),
+            ({}, {"HTTP_X_PROFILE": "0"}),
+        ):
+            response = self.client.get(reverse("core:about"), params, **headers)
+            self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(list_profiles(), [])
+
+    def test_non_manager_is_not_profiled(self):
+        """Test that drivers and anonymous users cannot trigger profiling."""
+        from core.profiling import list_profiles
+
+        response = self.client.get(reverse("core:home"), {"_profile": "1"})
+        self.assertNotIn("X-Profile-Id", response)
+
+        driver = User.objects.create_user(username="driver")
+        self.client.force_login(driver)
+        response = self.client.get(reverse("core:home"), {"_profile": "1"})
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(list_profiles(), [])
+
+    @override_settings(PROFILE_RING_SIZE=2)
+    def test_ring_keeps_newest_profiles(self):
+        """Test that only PROFILE_RING_SIZE profiles are kept."""
+        from core.profiling import list_profiles
+
+        self.client.force_login(self.manager)
+        names = [
+            self.client.get(reverse("core:about"), {"_profile": "1"})["X-Profile-Id"]
+            for _ in range(3)
+        ]
+        self.assertEqual([p["name"] for p in list_profiles()], names[:0:-1])
+
+    def test_admin_pages_list_and_serve_profiles(self):
+        """Test that managers can list, view and download saved profiles."""
+        self.client.force_login(self.manager)
+        name = self.client.get(reverse("core:home"), {"_profile": "1"})[
+            "X-Profile-Id"
+        ]
+
+        response = self.client.get(reverse("admin:profiles"))
+        self.assertContains(response, name)
+
+        url = reverse("admin:profile_detail", args=[name])
+        response = self.client.get(url, {"format": "text"})
+        self.assertContains(response, "function calls")
+        response = self.client.get(url)
+        self.assertEqual(response["Content-Type"], "application/octet-stream")
+
+        missing = reverse("admin:profile_detail", args=["missing.prof"])
+        self.assertEqual(self.client.get(missing).status_code, 404)
+
+    def test_admin_pages_are_manager_only(self):
+        """Test that staff without the manager role cannot see profiles."""
+        staff = User.objects.create_user(username="staff", is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get(reverse("admin:profiles")).status_code, 403)
+
+
+class MetricsTests(TestCase):
+    """Test Prometheus metrics recording, aggregation and the /metrics view."""
+
+    def setUp(self):
+        """Enable metrics in a temporary directory with a fresh registry."""
+        import tempfile
+        from core.metrics import registry
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.metrics_dir = directory.name
+        settings_override = override_settings(
+            METRICS_ENABLED=True, METRICS_DIR=directory.name, METRICS_TOKEN="secret"
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        registry.reset()
+        self.addCleanup(registry.reset)
+
+        self.track = Track.objects.create(
+            name="Test Track", address="123 Test St", phone="555-1234"
+        )
+        self.session = SessionSlot.objects.create(
+            track=self.track,
+            session_type="OPEN_SESSION",
+            start_datetime=timezone.now() + timedelta(days=1),
+            end_datetime=timezone.now() + timedelta(days=1, hours=1),
+            capacity=2,
+            price=25.00,
+        )
+        self.driver = User.objects.create_user(username="driver")
+
+    def scrape(self):
+        """Return the exposed samples as a dict of series to value."""
+        response = Client().get(
+            reverse("core:metrics"), HTTP_AUTHORIZATION="Bearer secret"
+        )
+        self.assertEqual(response.status_code, 200)
+        return dict(
+            line.rsplit(" ", 1)
+            for line in response.content.decode().splitlines()
+            if not line.startswith("#")
+        )
+
+    def test_endpoint_requires_token_or_manager(self):
+        """Test that the endpoint is protected and 404s when disabled."""
+        url = reverse("core:metrics")
+        self.assertEqual(Client().get(url).status_code, 403)
+        response = Client().get(url, HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(response.status_code, 403)
+
+        self.driver.profile.role = "MANAGER"
+        self.driver.profile.save()
+        self.client.force_login(self.driver)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        with override_settings(METRICS_ENABLED=False):
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_booking_admissions_by_reason(self):
+        """Test that accepted and rejected bookings are counted by reason."""
+        url = reverse("bookings:booking_create", args=[self.session.pk])
+        for username, data in [
+            ("driver", {}),
+            ("driver", {}),
+            ("other", {"chosen_kart_number": 42}),
+            ("other", {}),
+            ("third", {}),
+        ]:
+            user, _ = User.objects.get_or_create(username=username)
+            self.client.force_login(user)
+            self.client.post(url, data)
+
+        samples = self.scrape()
+        name = "kartcontrol_booking_admissions_total"
+        self.assertEqual(samples[f'{name}{{outcome="accepted"}}'], "2")
+        self.assertEqual(samples[f'{name}{{outcome="rejected",reason="full"}}'], "1")
+        self.assertEqual(
+            samples[f'{name}{{outcome="rejected",reason="overlap"}}'], "1"
+        )
+        self.assertEqual(samples[f'{name}{{outcome="rejected",reason="kart"}}'], "1")
+        self.assertIn(
+            'kartcontrol_lock_wait_seconds_count{site="booking_create"}', samples
+        )
+
+    def test_kart_assignment_failure_and_lock_wait(self):
+        """Test that a confirmation without free karts is counted."""
+        from bookings.models import Booking
+        from karts.models import Kart
+
+        other = User.objects.create_user(username="other")
+        Booking.objects.create(
+            session_slot=self.session,
+            driver=other,
+            status="CONFIRMED",
+            assigned_kart=Kart.objects.create(number=1),
+        )
+        booking = Booking.objects.create(session_slot=self.session, driver=self.driver)
+        self.assertFalse(booking.assign_random_kart())
+
+        samples = self.scrape()
+        self.assertEqual(samples["kartcontrol_kart_assignment_failures_total"], "1")
+        self.assertEqual(
+            samples['kartcontrol_lock_wait_seconds_count{site="assign_random_kart"}'],
+            "1",
+        )
+
+    def test_exited_process_files_are_retired(self):
+        """Test that an exited worker's counts are kept and its file folded."""
+        import json
+        import subprocess
+        import sys
+        from pathlib import Path
+
+        exited = subprocess.Popen([sys.executable, "-c", "pass"])
+        exited.wait()
+        name = "kartcontrol_kart_assignment_failures_total"
+        path = Path(self.metrics_dir) / f"{exited.pid}-1.json"
+        path.write_text(json.dumps({"counters": [[name, {}, 3]], "histograms": []}))
+
+        self.assertEqual(self.scrape()[name], "3")
+        self.assertFalse(path.exists())
+        self.assertTrue((Path(self.metrics_dir) / "retired.json").exists())
+        # Retired totals are counted once, on every later scrape
+        self.assertEqual(self.scrape()[name], "3")
+
+    def test_process_file_names_are_unique(self):
+        """Test that a reused pid never overwrites an earlier process's file."""
+        from core.metrics import registry
+
+        first = registry.filename
+        registry.reset()
+        self.assertNotEqual(registry.filename, first)
+        self.assertTrue(registry.filename.startswith(f"{registry.pid}-"))
+
+    def test_concurrent_flushes_write_whole_files(self):
+        """Test that flushes from several threads never corrupt the file."""
+        import json
+        import threading
+        from pathlib import Path
+        from core.metrics import record_admission, registry
+
+        errors = []
+
+        def flush_repeatedly():
+            try:
+                for _ in range(20):
+                    record_admission("accepted")
+                    registry.flush()
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=flush_repeatedly) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        data = json.loads((Path(self.metrics_dir) / registry.filename).read_text())
+        self.assertEqual(data["counters"][0][2], 80)
+        self.assertEqual(list(Path(self.metrics_dir).glob(".*.json.*")), [])
+
+    def test_flush_errors_do_not_escape(self):
+        """Test that a failed metrics write does not fail the caller."""
+        from unittest import mock
+        from core.metrics import record_admission, registry
+
+        registry.last_flush = 0.0
+        with mock.patch("core.metrics._write", side_effect=OSError("disk full")):
+            with self.assertLogs("core.metrics", "ERROR"):
+                record_admission("accepted")
+
+    def test_request_latency_and_cache_ratio(self):
+        """Test that requests are timed per view and the ratio is exposed."""
+        Client().get(reverse("core:about"))
+
+        samples = self.scrape()
+        self.assertEqual(
+            samples[
+                'kartcontrol_request_duration_seconds_bucket'
+                '{view="core:about",le="+Inf"}'
+            ],
+            "1",
+        )
+        self.assertIn("kartcontrol_cache_hit_ratio", samples)
+
+    def test_workers_are_merged(self):
+        """Test that metrics files from other processes are added together."""
+        import json
+        import os
+        from core.metrics import record_admission
+
+        record_admission("accepted")
+        other_worker = {
+            "counters": [
+                ["kartcontrol_booking_admissions_total", {"outcome": "accepted"}, 2]
+            ],
+            "histograms": [],
+        }
+        with open(os.path.join(self.metrics_dir, "99999.json"), "w") as handle:
+            json.dump(other_worker, handle)
+
+        samples = self.scrape()
+        self.assertEqual(
+            samples['kartcontrol_booking_admissions_total{outcome="accepted"}'], "3"
+        )
+
+
+class BookingRushTests(LiveServerTestCase):
+    """
+    Test the booking-rush harness against a live server.
+
+    The in-memory test database shares one connection between server
+    threads, so these tests use a single client thread; the booking_rush
+    command exercises real concurrency against an on-disk database.
+    """
+
+    def test_rush_holds_invariants(self):
+        """Test that a rush respects capacity and kart availability."""
+        from bookings.models import Booking
+        from core.booking_rush import check_invariants, run_rush, seed_rush
+
+        data = seed_rush(drivers=12, sessions=2, capacity=4, karts=3)
+        report = run_rush(self.live_server_url, data, attempts=2, threads=1)
+
+        self.assertEqual(report["book"]["requests"], 24)
+        self.assertEqual(report["book"]["outcomes"]["accepted"], 8)
+        self.assertEqual(
+            Booking.objects.filter(status__in=["PENDING", "CONFIRMED"]).count(), 8
+        )
+        self.assertEqual(
+            report["confirm"]["outcomes"].get("done", 0),
+            report["confirm"]["requests"],
+        )
+        self.assertLessEqual(report["confirmed"], 3)
+        self.assertEqual(
+            report["confirmed"], Booking.objects.filter(status="CONFIRMED").count()
+        )
+        self.assertEqual(check_invariants(data["sessions"]), [])
+
+    def test_violations_are_reported(self):
+        """Test that overbooked sessions and double-assigned karts are found."""
+        from bookings.models import Booking
+        from core.booking_rush import check_invariants, seed_rush
+        from karts.models import Kart
+
+        data = seed_rush(drivers=3, sessions=2, capacity=1, karts=1)
+        first, second = data["sessions"]
+        kart = Kart.objects.get(number=1)
+        drivers = data["drivers"]
+        Booking.objects.bulk_create(
+            [
+                Booking(session_slot=first, driver=drivers[0], status="PENDING"),
+                Booking(session_slot=first, driver=drivers[1], status="PENDING"),
+                Booking(session_slot=second, driver=drivers[1], status="PENDING"),
+                Booking(
+                    session_slot=second,
+                    driver=drivers[2],
+                    status="CONFIRMED",
+                    assigned_kart=kart,
+                ),
+            ]
+        )
+        Booking.objects.filter(driver=drivers[0]).update(
+            status="CONFIRMED", assigned_kart=kart
+        )
+
+        violations = check_invariants(data["sessions"])
+        self.assertEqual(len(violations), 4)
+        self.assertIn("active bookings", violations[0])
+
+
+class SessionPurgeTests(TestCase):
+    """Test the batched purge of expired sessions."""
+
+    def setUp(self):
+        """Create three expired sessions and one live one."""
+        from django.contrib.sessions.models import Session
+
+        now = timezone.now()
+        Session.objects.bulk_create(
+            [
+                Session(
+                    session_key=f"expired{i}",
+                    session_data="",
+                    expire_date=now - timedelta(days=1),
+                )
+                for i in range(3)
+            ]
+            + [
+                Session(
+                    session_key="live",
+                    session_data="",
+                    expire_date=now + timedelta(days=1),
+                )
+            ]
+        )
+
+    def test_purge_deletes_only_expired_sessions(self):
+        """Test that expired sessions are deleted across several batches."""
+        from django.contrib.sessions.models import Session
+        from core.session_cleanup import purge_expired_sessions
+
+        self.assertEqual(purge_expired_sessions(dry_run=True), 3)
+        self.assertEqual(purge_expired_sessions(batch_size=2), 3)
+        self.assertEqual(
+            list(Session.objects.values_list("session_key", flat=True)), ["live"]
+        )
+
+    @override_settings(
+        SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies"
+    )
+    def test_command_skips_engines_without_table(self):
+        """Test that the command does nothing for cookie-based sessions."""
+        from io import StringIO
+        from django.contrib.sessions.models import Session
+        from django.core.management import call_command
+
+        out = StringIO()
+        call_command("purge_sessions", stdout=out)
+        self.assertIn("nothing to purge", out.getvalue())
+        self.assertEqual(Session.objects.count(), 4)
+
+
+@override_settings(PAGE_CACHE_ENABLED=True)
+class PageCacheTests(TestCase):
+    """Test the full-page cache for anonymous visitors."""
+
+    def setUp(self):
+        """Start from an empty cache with a track."""
+        from django.core.cache import cache
+
+        cache.clear()
+        self.track = Track.objects.create(
+            name="Test Track", address="123 Test St", phone="555-1234"
+        )
+
+    def test_anonymous_pages_are_cached(self):
+        """Test that a repeat anonymous visit is served without queries."""
+        url = reverse("core:about")
+        self.assertEqual(Client().get(url)["X-Page-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            response = Client().get(url)
+        self.assertEqual(response["X-Page-Cache"], "HIT")
+        self.assertContains(response, "Test Track")
+        self.assertIn("Cookie", response["Vary"])
+
+    def test_track_change_invalidates(self):
+        """Test that editing the track drops cached pages."""
+        url = reverse("core:about")
+        Client().get(url)
+        self.track.name = "Renamed Circuit"
+        self.track.save()
+
+        response = Client().get(url)
+        self.assertEqual(response["X-Page-Cache"], "MISS")
+        self.assertContains(response, "Renamed Circuit")
+
+    def test_schedule_change_invalidates_home(self):
+        """Test that a new session appears on the cached home page."""
+        url = reverse("core:home")
+        Client().get(url)
+        SessionSlot.objects.create(
+            track=self.track,
+            session_type="GRAND_PRIX",
+            start_datetime=timezone.now() + timedelta(days=1),
+            end_datetime=timezone.now() + timedelta(days=1, hours=1),
+            capacity=10,
+            price=25.00,
+        )
+        self.assertEqual(Client().get(url)["X-Page-Cache"], "MISS")
+
+    def test_visitors_with_state_fall_through(self):
+        """Test that signed-in users and session or message cookies skip the cache."""
+        url = reverse("core:about")
+        Client().get(url)
+
+        user = User.objects.create_user(username="driver")
+        self.client.force_login(user)
+        self.assertNotIn("X-Page-Cache", self.client.get(url))
+
+        client = Client()
+        client.cookies["messages"] = "pending"
+        self.assertNotIn("X-Page-Cache", client.get(url))
+
+    def test_csrf_pages_are_not_stored(self):
+        """Test that pages issuing a CSRF token are never cached."""
+        from django.views.decorators.csrf import ensure_csrf_cookie
+        from django.test import RequestFactory
+        from django.contrib.auth.models import AnonymousUser
+        from django.http import HttpResponse
+        from core.page_cache import cache_public_page
+
+        @cache_public_page()
+        @ensure_csrf_cookie
+        def form_page(request):
+            return HttpResponse("form")
+
+        request = RequestFactory().get("/form/")
+        request.user = AnonymousUser()
+        self.assertNotIn("X-Page-Cache", form_page(request))
+
+    @override_settings(PAGE_CACHE_ENABLED=False)
+    def test_disabled_cache_is_bypassed(self):
+        """Test that pages are not cached when the cache is turned off."""
+        url = reverse("core:about")
+        Client().get(url)
+        self.assertNotIn("X-Page-Cache", Client().get(url))
+
+
+class PrerenderTests(TestCase):
+    """Test pre-rendered public page snapshots and their refresh job."""
+
+    def setUp(self):
+        """Enable snapshots and add a session."""
+        settings_override = override_settings(PRERENDER_ENABLED=True)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.track = Track.objects.create(name="Test Track", address="123 Test St")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.session = SessionSlot.objects.create(
+                track=self.track,
+                session_type="GRAND_PRIX",
+                start_datetime=timezone.now() + timedelta(days=1),
+                end_datetime=timezone.now() + timedelta(days=1, hours=1),
+                capacity=10,
+                price=45.00,
+            )
+        self.driver = User.objects.create_user(username="driver", password="pass")
+
+    def test_snapshots_are_served_with_one_query(self):
+        """Test that anonymous visitors get snapshots from a single lookup."""
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        call_command("prerender_public", stdout=StringIO())
+        url = reverse("sessions:session_detail", args=[self.session.pk])
+        with self.assertNumQueries(1):
+            response = Client().get(url)
+        self.assertEqual(response["X-Prerendered"], "1")
+        self.assertContains(response, "10 spots available")
+        for name in ("core:home", "core:about", "sessions:session_list"):
+            self.assertEqual(Client().get(reverse(name))["X-Prerendered"], "1")
+
+    def test_signed_in_and_filtered_requests_skip_snapshots(self):
+        """Test that sessions and query strings are rendered by the view."""
+        from core.prerender import prerender
+
+        prerender()
+        url = reverse("sessions:session_list")
+        response = Client().get(url, {"session_type": "GRAND_PRIX"})
+        self.assertFalse(response.has_header("X-Prerendered"))
+        self.client.login(username="driver", password="pass")
+        self.assertFalse(self.client.get(url).has_header("X-Prerendered"))
+
+    def test_booking_queues_only_its_session_pages(self):
+        """Test that bookings merge their session's pages into one queued job."""
+        from bookings.models import Booking
+        from core.jobs import run_next_job
+        from core.models import Job
+        from core.prerender import PRERENDER_JOB, get_session_paths
+
+        Job.objects.all().delete()
+        other = User.objects.create_user(username="other")
+        with self.captureOnCommitCallbacks(execute=True):
+            Booking.objects.create(session_slot=self.session, driver=self.driver)
+        with self.captureOnCommitCallbacks(execute=True):
+            Booking.objects.create(session_slot=self.session, driver=other)
+
+        job = Job.objects.get(name=PRERENDER_JOB)
+        self.assertEqual(
+            job.payload["paths"], sorted(get_session_paths(self.session.pk))
+        )
+        run_next_job()
+        job.refresh_from_db()
+        self.assertEqual(job.status, "SUCCEEDED")
+        self.assertEqual(job.result["counts"]["rendered"], 4)
+
+        response = Client().get(
+            reverse("sessions:session_detail", args=[self.session.pk])
+        )
+        self.assertEqual(response["X-Prerendered"], "1")
+        self.assertContains(response, "8 spots available")
+
+    def test_full_run_removes_deleted_sessions(self):
+        """Test that a full run drops snapshots of sessions that are gone."""
+        from core.models import PageSnapshot
+        from core.prerender import prerender
+
+        prerender()
+        path = reverse("sessions:session_detail", args=[self.session.pk])
+        self.assertTrue(PageSnapshot.objects.filter(path=path).exists())
+
+        SessionSlot.objects.filter(pk=self.session.pk).delete()
+        self.assertEqual(prerender()["removed"], 1)
+        self.assertFalse(PageSnapshot.objects.filter(path=path).exists())
+
+    def test_old_snapshots_are_not_served(self):
+        """Test that snapshots past PRERENDER_MAX_AGE fall back to the view."""
+        from core.models import PageSnapshot
+        from core.prerender import prerender
+
+        prerender()
+        url = reverse("sessions:session_list")
+        self.assertEqual(Client().get(url)["X-Prerendered"], "1")
+
+        PageSnapshot.objects.update(rendered_at=timezone.now() - timedelta(seconds=901))
+        with override_settings(PRERENDER_MAX_AGE=900):
+            response = Client().get(url)
+        self.assertFalse(response.has_header("X-Prerendered"))
+        self.assertContains(
+            response, reverse("sessions:session_detail", args=[self.session.pk])
+        )
+
+
+class CompressionTests(TestCase):
+    """Test ETags, conditional GETs and compression of HTML responses."""
+
+    def setUp(self):
+        """Start from an empty cache with a track."""
+        from django.core.cache import cache
+
+        cache.clear()
+        Track.objects.create(name="Test Track", address="123 Test St")
+
+    def test_html_is_gzipped_for_clients_that_accept_it(self):
+        """Test that large HTML is gzipped and decompresses to the page."""
+        import gzip
+
+        url = reverse("core:about")
+        plain = Client().get(url)
+        response = Client().get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertEqual(response["ETag"], plain["ETag"])
+
+    def test_matching_etag_returns_not_modified(self):
+        """Test that a repeat request with If-None-Match gets a 304."""
+        url = reverse("core:about")
+        etag = Client().get(url)["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+
+        response = Client().get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_compressed_copy_is_cached_unless_page_has_csrf_token(self):
+        """Test that shared pages are compressed once and CSRF pages never reuse."""
+        from django.core.cache import cache
+
+        url = reverse("core:about")
+        response = Client().get(url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertIsNotNone(cache.get(f"compressed:gzip:{response['ETag']}"))
+
+        user = User.objects.create_user(username="driver")
+        client = Client(HTTP_ACCEPT_ENCODING="gzip")
+        client.force_login(user)
+        response = client.get(url)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIsNone(cache.get(f"compressed:gzip:{response['ETag']}"))
+
+    def test_csrf_pages_are_padded_even_when_br_is_accepted(self):
+        """Test that clients offering br still get randomly padded gzip."""
+        user = User.objects.create_user(username="driver")
+        client = Client(HTTP_ACCEPT_ENCODING="br, gzip")
+        client.force_login(user)
+        url = reverse("core:about")
+
+        sizes = {len(client.get(url).content) for _ in range(5)}
+        response = client.get(url)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertGreater(len(sizes), 1)
+
+    @override_settings(COMPRESSION_MIN_SIZE=10**7)
+    def test_small_responses_are_not_compressed(self):
+        """Test that responses under COMPRESSION_MIN_SIZE are sent as they are."""
+        response = Client().get(reverse("core:about"), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertTrue(response.has_header("ETag"))
+
+
+class AssetBundleTests(TestCase):
+    """Test the minified, fingerprinted static bundles."""
+
+    def setUp(self):
+        """Start from an empty page cache."""
+        from django.core.cache import cache
+
+        cache.clear()
+
+    def test_minify_css_keeps_strings(self):
+        """Test that comments and whitespace go but quoted strings stay."""
+        from core.assets import minify_css
+
+        source = (
+            "/* Header */\n.a ,\n.b > p {\n  color : red;\n"
+            "  background: url(\"data:a b; c\");\n}\n"
+        )
+        self.assertEqual(
+            minify_css(source), '.a,.b>p{color : red;background: url("data:a b; c")}'
+        )
+
+    def test_minify_js_keeps_template_literals(self):
+        """Test that lines inside a multi-line template literal are untouched."""
+        from core.assets import minify_js
+
+        source = (
+            "// Render a card\n"
+            "function card(name) {\n"
+            "    const url = 'http://example.com'; // link\n"
+            "    return `<div>\n"
+            "      // ${name}\n"
+            "\n"
+            "    </div>`;\n"
+            "}\n"
+        )
+        self.assertEqual(
+            minify_js(source),
+            "function card(name) {\n"
+            "const url = 'http://example.com'; // link\n"
+            "return `<div>\n"
+            "      // ${name}\n"
+            "\n"
+            "    </div>`;\n"
+            "}",
+        )
+
+    def test_source_files_are_linked_without_bundling_storage(self):
+        """Test that development storage links each source file."""
+        response = self.client.get(reverse("core:about"))
+        self.assertContains(response, 'href="/static/css/style.css"')
+        self.assertContains(response, '<script src="/static/js/main.js">')
+
+    def test_collectstatic_builds_hashed_bundles(self):
+        """Test that collectstatic writes hashed bundles that pages link to."""
+        import tempfile
+
+        from django.contrib.staticfiles.storage import staticfiles_storage
+        from django.core.management import call_command
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        with override_settings(
+            STATIC_ROOT=directory.name,
+            STATICFILES_STORAGE="core.assets.BundledManifestStaticFilesStorage",
+        ):
+            call_command("collectstatic", interactive=False, verbosity=0)
+            hashed = staticfiles_storage.stored_name("bundles/site.css")
+            with staticfiles_storage.open(hashed) as bundle:
+                content = bundle.read().decode()
+            response = self.client.get(reverse("core:about"))
+
+        self.assertRegex(hashed, r"^bundles/site\.[0-9a-f]{12}\.css$")
+        self.assertNotIn("/*", content)
+        self.assertIn(".session-card", content)
+        self.assertContains(response, f'href="/static/{hashed}"')
+        self.assertContains(response, 'rel="preload"')
+
+
+class ServiceWorkerTests(TestCase):
+    """Test the service worker script and its cache configuration."""
+
+    def test_worker_unregisters_without_manifest(self):
+        """Test that without a static manifest the worker clears its caches."""
+        response = self.client.get(reverse("core:service_worker"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/javascript")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        self.assertContains(response, "registration.unregister()")
+        self.assertNotContains(response, "const CONFIG")
+
+    def test_worker_caches_are_versioned_by_manifest(self):
+        """Test that the worker precaches hashed bundles under the manifest hash."""
+        import json
+        import tempfile
+
+        from django.contrib.staticfiles.storage import staticfiles_storage
+        from django.core.management import call_command
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        with override_settings(
+            STATIC_ROOT=directory.name,
+            STATICFILES_STORAGE="core.assets.BundledManifestStaticFilesStorage",
+        ):
+            call_command("collectstatic", interactive=False, verbosity=0)
+            version = staticfiles_storage.manifest_hash
+            bundle = staticfiles_storage.url("bundles/site.js")
+            response = self.client.get(reverse("core:service_worker"))
+            with override_settings(SERVICE_WORKER_ENABLED=False):
+                disabled = self.client.get(reverse("core:service_worker"))
+
+        content = response.content.decode()
+        config = json.loads(content.split("const CONFIG = ")[1].split(";\n")[0])
+        self.assertEqual(config["version"], version)
+        self.assertIn(bundle, config["precache"])
+        self.assertIn("https://cdn.jsdelivr.net", config["cdn_origins"])
+        self.assertEqual(config["revalidate"], [reverse("sessions:session_feed")])
+        self.assertContains(disabled, "registration.unregister()")
+
+    def test_pages_link_service_worker(self):
+        """Test that pages tell main.js where the worker is served from."""
+        response = self.client.get(reverse("core:about"))
+        self.assertContains(response, 'data-service-worker="/service-worker.js"')
+
+    def test_signed_in_pages_register_a_per_user_worker(self):
+        """Test that each user registers the worker with their own cache id."""
+        from core.templatetags.service_worker import get_cache_user
+
+        first = User.objects.create_user(username="first")
+        second = User.objects.create_user(username="second")
+        self.assertNotEqual(get_cache_user(first), get_cache_user(second))
+
+        self.client.force_login(first)
+        response = self.client.get(reverse("core:about"))
+        self.assertContains(
+            response,
+            f'data-service-worker="/service-worker.js?user={get_cache_user(first)}"',
+        )
+
+
+class AsyncHomeTests(TestCase):
+    """Test the async homepage served under ASGI."""
+
+    def setUp(self):
+        """Create an upcoming session and start from an empty page cache."""
+        from django.core.cache import cache
+
+        cache.clear()
+        track = Track.objects.create(name="Test Track", address="123 Test St")
+        self.session = SessionSlot.objects.create(
+            track=track,
+            session_type="OPEN_SESSION",
+            start_datetime=timezone.now() + timedelta(days=1),
+            end_datetime=timezone.now() + timedelta(days=1, hours=1),
+            capacity=10,
+            price=45.00,
+        )
+
+    def get_request(self, user=None):
+        """Build an async request for the homepage."""
+        from django.contrib.auth.models import AnonymousUser
+        from django.test import AsyncRequestFactory
+
+        request = AsyncRequestFactory().get(reverse("core:home"))
+        request.user = user or AnonymousUser()
+        return request
+
+    @override_settings(PAGE_CACHE_ENABLED=True)
+    async def test_home_async_uses_page_cache(self):
+        """Test that anonymous async requests are cached like sync ones."""
+        from core.views import home_async
+
+        first = await home_async(self.get_request())
+        second = await home_async(self.get_request())
+
+        self.assertEqual(first["X-Page-Cache"], "MISS")
+        self.assertEqual(second["X-Page-Cache"], "HIT")
+        self.assertEqual(first.content, second.content)
+        self.assertContains(
+            first, reverse("sessions:session_detail", args=[self.session.pk])
+        )
+
+    async def test_home_async_counts_driver_bookings(self):
+        """Test that a signed-in driver sees booking counts and is not cached."""
+        from asgiref.sync import sync_to_async
+        from bookings.models import Booking
+        from core.views import home_async
+
+        driver = await sync_to_async(User.objects.create_user)(
+            username="testdriver", password="testpass123"
+        )
+        await Booking.objects.acreate(
+            session_slot=self.session, driver=driver, status="PENDING"
+        )
+        response = await home_async(self.get_request(driver))
+
+        self.assertFalse(response.has_header("X-Page-Cache"))
+        self.assertContains(response, "1 booking |")
+        self.assertContains(response, "1 pending |")
+
+    async def test_compression_middleware_runs_async(self):
+        """Test that CompressionMiddleware stays async around async views."""
+        from asgiref.sync import iscoroutinefunction
+        from core.middleware import CompressionMiddleware
+        from core.views import home_async
+
+        middleware = CompressionMiddleware(home_async)
+        request = self.get_request()
+        request.META["HTTP_ACCEPT_ENCODING"] = "gzip"
+        response = await middleware(request)
+
+        self.assertTrue(iscoroutinefunction(middleware))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertTrue(response.has_header("ETag"))
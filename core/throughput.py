@@ -0,0 +1,239 @@
+"""
+Concurrent-request throughput of the schedule pages under WSGI and ASGI.
+
+Serves the same database with gunicorn sync workers (``kartcontrol.wsgi``)
+and with uvicorn (``kartcontrol.asgi``, which routes the async views, see
+ASYNC_VIEWS), then fires the same GET requests at each from a thread pool.
+Each server runs in its own process with the current settings module, so
+the comparison includes every middleware a deployment would run.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection
+
+from .benchmark import get_benchmark_users, get_benchmark_views
+from .booking_rush import login_cookie
+from .stats import percentile
+
+# Views measured, with the roles they are requested as
+THROUGHPUT_VIEWS = ("home", "session_list", "session_detail")
+
+# Seconds to wait for a server to accept connections
+SERVER_START_TIMEOUT = 30
+
+REQUEST_TIMEOUT = 30
+
+
+def get_server_command(server, host, port, workers):
+    """
+    Return the command line that serves the site.
+
+    Args:
+        server (str): 'wsgi' for gunicorn sync workers, 'asgi' for uvicorn
+        host (str): Address to bind
+        port (int): Port to bind
+        workers (int): Worker processes
+    """
+    if server == "wsgi":
+        return [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "kartcontrol.wsgi:application",
+            "--worker-class",
+            "sync",
+            "--workers",
+            str(workers),
+            "--bind",
+            f"{host}:{port}",
+            "--log-level",
+            "warning",
+        ]
+    return [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "kartcontrol.asgi:application",
+        "--workers",
+        str(workers),
+        "--host",
+        host,
+        "--port",
+        str(port),
+        "--log-level",
+        "warning",
+        "--no-access-log",
+    ]
+
+
+def get_database_url():
+    """Return a DATABASE_URL for the database this process is using."""
+    database = connection.settings_dict
+    if connection.vendor == "sqlite":
+        return f"sqlite:///{database['NAME']}"
+    credentials = urllib.parse.quote(database["USER"] or "")
+    if database["PASSWORD"]:
+        credentials += ":" + urllib.parse.quote(database["PASSWORD"])
+    location = database["HOST"] or "localhost"
+    if database["PORT"]:
+        location += f":{database['PORT']}"
+    return f"postgres://{credentials}@{location}/{database['NAME']}"
+
+
+def get_free_port(host):
+    """Return a port nothing is listening on."""
+    with socket.socket() as probe:
+        probe.bind((host, 0))
+        return probe.getsockname()[1]
+
+
+def start_server(server, host, workers, log):
+    """
+    Start a server on the current database and wait until it answers.
+
+    Args:
+        log: Open file that receives the server's output
+
+    Returns:
+        tuple: (process, base URL)
+
+    Raises:
+        RuntimeError: If the server exits or does not answer in time
+    """
+    port = get_free_port(host)
+    environment = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE,
+        "DATABASE_URL": get_database_url(),
+        "ASYNC_VIEWS": "True" if server == "asgi" else "False",
+    }
+    process = subprocess.Popen(
+        get_server_command(server, host, port, workers),
+        cwd=settings.BASE_DIR,
+        env=environment,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+    base_url = f"http://{host}:{port}"
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{server} server exited with {process.returncode}")
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return process, base_url
+        except OSError:
+            time.sleep(0.2)
+    stop_server(process)
+    raise RuntimeError(f"{server} server did not start in {SERVER_START_TIMEOUT}s")
+
+
+def stop_server(process):
+    """Stop a server started by start_server()."""
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def get(url, cookie=""):
+    """
+    GET a URL and return (status, milliseconds).
+
+    Status is 0 when the request failed without an HTTP response.
+    """
+    request = urllib.request.Request(url, headers={"Cookie": cookie})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except OSError:
+        status = 0
+    return status, (time.perf_counter() - started) * 1000
+
+
+def measure_throughput(url, cookie, requests, concurrency, warmup=5):
+    """
+    Request a URL from ``concurrency`` threads and summarise the run.
+
+    Returns:
+        dict: Request count, elapsed seconds, requests per second, latency
+        percentiles and the number of responses other than 200
+    """
+    for _ in range(warmup):
+        get(url, cookie)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: get(url, cookie), range(requests)))
+    elapsed = time.perf_counter() - started
+
+    durations = [duration for _, duration in results]
+    return {
+        "requests": len(results),
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(results) / elapsed, 1) if elapsed else 0,
+        "p50_ms": round(percentile(durations, 50), 1),
+        "p95_ms": round(percentile(durations, 95), 1),
+        "p99_ms": round(percentile(durations, 99), 1),
+        "errors": sum(1 for status, _ in results if status != 200),
+    }
+
+
+def run_throughput(
+    servers=("wsgi", "asgi"),
+    workers=2,
+    requests=200,
+    concurrency=32,
+    host="127.0.0.1",
+    log=subprocess.DEVNULL,
+):
+    """
+    Measure every throughput view under each server.
+
+    Args:
+        servers (tuple): Any of 'wsgi' and 'asgi'
+        workers (int): Worker processes per server
+        requests (int): Timed requests per view
+        concurrency (int): Client threads sending requests at once
+        host (str): Address the servers bind to
+        log: File that receives the servers' output
+
+    Returns:
+        dict: {server: {'name:role': result}}
+    """
+    users = get_benchmark_users()
+    cookies = {
+        role: login_cookie(user)[0] if user is not None else ""
+        for role, user in users.items()
+    }
+    cases = [case for case in get_benchmark_views() if case[0] in THROUGHPUT_VIEWS]
+
+    results = {}
+    for server in servers:
+        process, base_url = start_server(server, host, workers, log)
+        try:
+            results[server] = {
+                f"{name}:{role}": measure_throughput(
+                    base_url + url, cookies[role], requests, concurrency
+                )
+                for name, role, url in cases
+            }
+        finally:
+            stop_server(process)
+    return results
@@ -2,15 +2,21 @@
 URL patterns for core app (public pages).
 """
 
+from django.conf import settings
 from django.urls import path
 from . import views
 
 app_name = "core"
 
+# ASGI processes serve the async homepage (see ASYNC_VIEWS)
+home = views.home_async if getattr(settings, "ASYNC_VIEWS", False) else views.home
+
 urlpatterns = [
-    path("", views.home, name="home"),
+    path("", home, name="home"),
     path("about/", views.about, name="about"),
     path("contact/", views.contact, name="contact"),
     path("privacy/", views.privacy_policy, name="privacy_policy"),
     path("terms/", views.terms_of_service, name="terms_of_service"),
+    path("metrics", views.metrics, name="metrics"),
+    path("service-worker.js", views.service_worker, name="service_worker"),
 ]
@@ -2,21 +2,40 @@
 Core views for KartControl application.
 """
 
+import hmac
+import json
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
 from django.shortcuts import render, redirect
 from django.contrib import messages
+from django.http import Http404, HttpResponse
+from django.urls import reverse
 from django.utils import timezone
 from sessions.models import SessionSlot, Track
+from .assets import CDN_ASSETS, get_bundle_urls
+from .async_utils import aget_user, arender
+from .decorators import is_manager
 from .forms import ContactForm
+from .metrics import render_metrics
+from .page_cache import cache_public_page
+
 
+def get_home_sessions():
+    """Return the next six sessions shown on the homepage."""
+    return (
+        SessionSlot.objects.with_booking_counts()
+        .filter(start_datetime__gte=timezone.now())
+        .order_by("start_datetime")[:6]
+    )
 
+
+@cache_public_page("PAGE_CACHE_HOME_TIMEOUT")
 def home(request):
     """Display homepage with upcoming sessions."""
-    upcoming_sessions = SessionSlot.objects.filter(
-        start_datetime__gte=timezone.now()
-    ).order_by("start_datetime")[:6]
-
     context = {
-        "upcoming_sessions": upcoming_sessions,
+        "upcoming_sessions": get_home_sessions(),
     }
 
     # Add user booking statistics if authenticated
@@ -33,6 +52,32 @@ def home(request):
     return render(request, "core/home.html", context)
 
 
+@cache_public_page("PAGE_CACHE_HOME_TIMEOUT")
+async def home_async(request):
+    """Async home, routed in place of it under ASGI (ASYNC_VIEWS)."""
+    context = {
+        "upcoming_sessions": [
+            session async for session in get_home_sessions().aiterator()
+        ],
+    }
+
+    user = await aget_user(request)
+    if user.is_authenticated:
+        from bookings.models import Booking
+
+        user_bookings = Booking.objects.filter(driver=user)
+        context["user_bookings_count"] = await user_bookings.acount()
+        context["user_pending_count"] = await user_bookings.filter(
+            status="PENDING"
+        ).acount()
+        context["user_confirmed_count"] = await user_bookings.filter(
+            status="CONFIRMED"
+        ).acount()
+
+    return await arender(request, "core/home.html", context)
+
+
+@cache_public_page()
 def about(request):
     """Display about page with track information."""
     track = Track.objects.first()
@@ -58,11 +103,73 @@ def contact(request):
     return render(request, "core/contact.html", {"form": form})
 
 
+@cache_public_page()
 def privacy_policy(request):
     """Display privacy policy page."""
     return render(request, "core/privacy.html")
 
 
+@cache_public_page()
 def terms_of_service(request):
     """Display terms of service page."""
     return render(request, "core/terms.html")
+
+
+def metrics(request):
+    """
+    Expose Prometheus metrics for all worker processes.
+
+    Scrapers authenticate with ``Authorization: Bearer <METRICS_TOKEN>``;
+    signed-in managers can also open the page. Returns 404 unless
+    METRICS_ENABLED is on.
+    """
+    if not getattr(settings, "METRICS_ENABLED", False):
+        raise Http404
+    token = getattr(settings, "METRICS_TOKEN", "")
+    supplied = request.META.get("HTTP_AUTHORIZATION", "").removeprefix("Bearer ")
+    authorised = bool(token) and hmac.compare_digest(supplied, token)
+    if not authorised and not is_manager(request.user):
+        return HttpResponse("Forbidden", status=403, content_type="text/plain")
+    return HttpResponse(
+        render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+def service_worker(request):
+    """
+    Serve the service worker from the site root so it controls every page.
+
+    Its caches are named after the static manifest hash, so each deploy
+    replaces them. Without a manifest, or with SERVICE_WORKER_ENABLED off,
+    the worker removes its caches and unregisters instead.
+    """
+    version = getattr(staticfiles_storage, "manifest_hash", "")
+    enabled = getattr(settings, "SERVICE_WORKER_ENABLED", True) and bool(version)
+    config = {
+        "version": version,
+        "static_url": settings.STATIC_URL,
+        "precache": [
+            url for name in ("site.css", "site.js") for url in get_bundle_urls(name)
+        ]
+        + CDN_ASSETS,
+        # Font Awesome loads its fonts from the same host at runtime
+        "cdn_origins": sorted(
+            {"{0.scheme}://{0.netloc}".format(urlsplit(url)) for url in CDN_ASSETS}
+        ),
+        # Only pages that are the same for every visitor; per-user pages
+        # are network-first so a signed-out browser never sees them
+        "revalidate": [reverse("sessions:session_feed")],
+        "offline_prefixes": [
+            reverse("sessions:session_list"),
+            reverse("bookings:booking_list"),
+        ],
+    }
+    response = render(
+        request,
+        "core/service_worker.js",
+        {"enabled": enabled, "config": json.dumps(config)},
+        content_type="application/javascript",
+    )
+    # Browsers must always check for a new worker after a deploy
+    response["Cache-Control"] = "no-cache"
+    return response
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "kartcontrol.settings.production")
+# Route the schedule pages to their async views (see ASYNC_VIEWS)
+os.environ.setdefault("ASYNC_VIEWS", "True")
 
 application = get_asgi_application()
@@ -25,19 +25,24 @@ INSTALLED_APPS = [
     # Local apps
     "accounts.apps.AccountsConfig",
     "bookings",
-    "karts",
+    "karts.apps.KartsConfig",
     "sessions.apps.SessionsConfig",
-    "core",
+    "core.apps.CoreConfig",
 ]
 
 MIDDLEWARE = [
+    "core.middleware.RequestTimingMiddleware",
+    "core.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.ProfilerMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.PrerenderedPageMiddleware",
 ]
 
 ROOT_URLCONF = "kartcontrol.urls"
@@ -60,6 +65,15 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "kartcontrol.wsgi.application"
 
+# ProfileBackend loads user.profile with the user, so role checks need no
+# extra query. ModelBackend stays listed for one release so sessions signed
+# in before ProfileBackend, which name ModelBackend, are still restored.
+# Remove it afterwards: until then a failed login hashes the password twice.
+AUTHENTICATION_BACKENDS = [
+    "accounts.backends.ProfileBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -102,5 +116,122 @@ LOGIN_URL = "accounts:login"
 LOGIN_REDIRECT_URL = "core:home"
 LOGOUT_REDIRECT_URL = "core:home"
 
+# Cache: Redis when REDIS_URL is set, otherwise per-process local memory.
+# Heroku Redis serves TLS (rediss://) with a self-signed certificate, so it
+# needs REDIS_SSL_CERT_REQS=none; "required" verifies the certificate.
+REDIS_URL = os.getenv("REDIS_URL", "")
+REDIS_SSL_CERT_REQS = os.getenv("REDIS_SSL_CERT_REQS", "required")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+    if REDIS_URL.startswith("rediss://"):
+        CACHES["default"]["OPTIONS"] = {"ssl_cert_reqs": REDIS_SSL_CERT_REQS}
+else:
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+
+# Seconds a worker trusts its in-memory kart roster (karts.roster) when the
+# cache is not shared and it cannot see version bumps from other workers
+ROSTER_MAX_AGE = int(os.getenv("ROSTER_MAX_AGE", "60"))
+
+# Full-page cache for anonymous visitors (core.page_cache). The home page
+# shows free places, which change with every booking, so it expires sooner.
+# It is on by default only with Redis: invalidation bumps a counter in the
+# cache, which the local-memory cache keeps per process, so other workers
+# would serve a stale page until its timeout.
+PAGE_CACHE_ENABLED = (
+    os.getenv("PAGE_CACHE_ENABLED", "True" if REDIS_URL else "False") == "True"
+)
+PAGE_CACHE_TIMEOUT = int(os.getenv("PAGE_CACHE_TIMEOUT", "600"))
+PAGE_CACHE_HOME_TIMEOUT = int(os.getenv("PAGE_CACHE_HOME_TIMEOUT", "60"))
+
+# Seconds a rendered session card is cached. Cards are keyed on the session's
+# updated_at, booked count and whether it is past, so edits, bookings and the
+# Past Session badge show up straight away.
+SESSION_CARD_CACHE_TIMEOUT = int(os.getenv("SESSION_CARD_CACHE_TIMEOUT", "300"))
+
+# Seconds browsers may reuse the session list's JSON feed (sessions.feed)
+SESSION_FEED_MAX_AGE = int(os.getenv("SESSION_FEED_MAX_AGE", "30"))
+
+# Pre-rendered snapshots of public pages (core.prerender), written to the
+# database by the prerender_public command and the worker and served to
+# anonymous visitors. Snapshots older than PRERENDER_MAX_AGE seconds are
+# left to the views, so the scheduled prerender_public run must be more
+# frequent than that.
+PRERENDER_ENABLED = os.getenv("PRERENDER_ENABLED", "False") == "True"
+PRERENDER_MAX_AGE = int(os.getenv("PRERENDER_MAX_AGE", "900"))
+
+# Background jobs (core.jobs). A running job with no progress for
+# JOB_STALE_TIMEOUT seconds is taken to have lost its worker and is failed.
+JOB_STALE_TIMEOUT = int(os.getenv("JOB_STALE_TIMEOUT", "1800"))
+
+# Compression and ETags for HTML and JSON responses (core.compression).
+# Compressed copies of unchanged pages are cached for reuse.
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "True") == "True"
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_CACHE_TIMEOUT = int(os.getenv("COMPRESSION_CACHE_TIMEOUT", "300"))
+
+# Service worker (core.views.service_worker) that caches static files, the
+# session feed and the driver's bookings. It only installs once collectstatic
+# has written a manifest to version its caches by.
+SERVICE_WORKER_ENABLED = os.getenv("SERVICE_WORKER_ENABLED", "True") == "True"
+
+# Serve the async home, session list and session detail views, which read
+# the schedule with the async ORM. kartcontrol/asgi.py turns this on, so an
+# ASGI server gets the async views while gunicorn keeps the sync ones.
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", "False") == "True"
+
+# Session storage, chosen with SESSION_STORE. "cached_db" and "cache" need a
+# cache shared by every worker (REDIS_URL); "signed_cookies" keeps every
+# session, signed-in or not, in the browser and never touches the database.
+SESSION_ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "cache": "django.contrib.sessions.backends.cache",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+SESSION_STORE = os.getenv("SESSION_STORE", "cached_db" if REDIS_URL else "db")
+SESSION_ENGINE = SESSION_ENGINES[SESSION_STORE]
+
 # Security settings
 X_FRAME_OPTIONS = "DENY"
+
+# Request timing instrumentation (core.middleware.RequestTimingMiddleware)
+REQUEST_TIMING_ENABLED = os.getenv("REQUEST_TIMING_ENABLED", "False") == "True"
+REQUEST_TIMING_SAMPLE_RATE = float(os.getenv("REQUEST_TIMING_SAMPLE_RATE", "1.0"))
+REQUEST_TIMING_SLOW_MS = int(os.getenv("REQUEST_TIMING_SLOW_MS", "500"))
+REQUEST_TIMING_HEADER = os.getenv("REQUEST_TIMING_HEADER", "True") == "True"
+SQL_STATS_ENABLED = os.getenv("SQL_STATS_ENABLED", "True") == "True"
+SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", "10"))
+
+# Manager-triggered profiling (core.middleware.ProfilerMiddleware)
+PROFILE_DIR = os.getenv("PROFILE_DIR", "")
+PROFILE_RING_SIZE = int(os.getenv("PROFILE_RING_SIZE", "20"))
+
+# Prometheus metrics at /metrics (core.metrics); METRICS_DIR must be shared
+# by all worker processes on a host
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "False") == "True"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+
+# Logging
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "kartcontrol.requests": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
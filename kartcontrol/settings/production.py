@@ -22,8 +22,13 @@ DATABASES = {
 }
 
 # WhiteNoise static files configuration
-MIDDLEWARE.insert(1, "whitenoise.middleware.WhiteNoiseMiddleware")
-STATICFILES_STORAGE = "whitenoise.storage.CompressedStaticFilesStorage"
+MIDDLEWARE.insert(
+    MIDDLEWARE.index("django.middleware.security.SecurityMiddleware") + 1,
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+)
+# Bundles, hashes and compresses static files at collectstatic; WhiteNoise
+# serves the hashed names with a far-future immutable Cache-Control header
+STATICFILES_STORAGE = "core.assets.BundledManifestStaticFilesStorage"
 
 # Security settings for production
 CSRF_TRUSTED_ORIGINS = os.getenv("CSRF_TRUSTED_ORIGINS", "").split(",")
@@ -8,7 +8,11 @@ from django.utils.safestring import mark_safe
 from django.utils import timezone
 from .models import Kart
 from bookings.models import Booking
-from core.admin_utils import KART_STATUS_COLORS, create_kart_status_badge
+from core.admin_utils import (
+    KART_STATUS_COLORS,
+    create_kart_status_badge,
+    enqueue_admin_job,
+)
 
 
 class KartBookingInline(admin.TabularInline):
@@ -151,15 +155,27 @@ class KartAdmin(admin.ModelAdmin):
     actions = ["mark_active", "mark_maintenance"]
 
     def mark_active(self, request, queryset):
-        """Bulk action to mark karts as active."""
-        updated = queryset.update(status="ACTIVE")
-        self.message_user(request, f"{updated} kart(s) marked as active.")
+        """Bulk action to mark karts as active in the background."""
+        return enqueue_admin_job(
+            self,
+            request,
+            queryset,
+            "karts.set_status",
+            "Mark selected karts as Active",
+            status="ACTIVE",
+        )
 
     mark_active.short_description = "Mark selected karts as Active"
 
     def mark_maintenance(self, request, queryset):
-        """Bulk action to mark karts in maintenance."""
-        updated = queryset.update(status="MAINTENANCE")
-        self.message_user(request, f"{updated} kart(s) marked as maintenance.")
+        """Bulk action to mark karts in maintenance in the background."""
+        return enqueue_admin_job(
+            self,
+            request,
+            queryset,
+            "karts.set_status",
+            "Mark selected karts as Maintenance",
+            status="MAINTENANCE",
+        )
 
     mark_maintenance.short_description = "Mark selected karts as Maintenance"
@@ -0,0 +1,16 @@
+"""
+Karts app configuration.
+"""
+
+from django.apps import AppConfig
+
+
+class KartsConfig(AppConfig):
+    """Configuration for the karts app."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "karts"
+
+    def ready(self):
+        """Import signals when app is ready."""
+        import karts.signals  # noqa: F401
@@ -0,0 +1,20 @@
+"""
+Background jobs for bulk kart actions queued from the admin.
+"""
+
+from django.utils import timezone
+from core.jobs import register_job
+from .models import Kart
+from .roster import bump_roster_version
+
+
+@register_job("karts.set_status")
+def set_kart_status(job, ids, status):
+    """Set the operational status of the selected karts."""
+    for batch in job.batches(ids):
+        updated = Kart.objects.filter(pk__in=batch).update(
+            status=status, updated_at=timezone.now()
+        )
+        # update() skips the post_save signal that normally bumps the roster
+        bump_roster_version()
+        job.advance(len(batch), updated=updated)
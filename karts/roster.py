@@ -0,0 +1,106 @@
+"""
+In-process kart roster shared by forms, validation and kart assignment.
+
+The roster holds the id, number and status of every kart. Each process keeps
+its own copy and checks it against a version stamp in the default cache, so
+one cache read replaces a kart query. Any kart change bumps the stamp, which
+makes every worker reload on its next lookup. The stamp is only shared across
+workers when the cache is (REDIS_URL); with the per-process local memory
+cache other workers catch up after ROSTER_MAX_AGE seconds.
+"""
+
+import threading
+import time
+import uuid
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+ROSTER_VERSION_KEY = "karts:roster_version"
+
+# Seconds a process trusts its roster without a version change
+DEFAULT_ROSTER_MAX_AGE = 60
+
+
+class RosterKart(NamedTuple):
+    """A kart as held in the roster."""
+
+    id: int
+    number: int
+    status: str
+
+    def is_available(self):
+        """Check if kart is available for booking (ACTIVE status)."""
+        return self.status == "ACTIVE"
+
+
+_lock = threading.Lock()
+_state = {"version": None, "loaded_at": 0.0, "karts": {}}
+
+
+def _get_version():
+    version = cache.get(ROSTER_VERSION_KEY)
+    if version is None:
+        cache.add(ROSTER_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(ROSTER_VERSION_KEY)
+    return version
+
+
+def get_roster():
+    """
+    Return the kart roster as a dict of kart number to RosterKart.
+
+    Reloads from the database when the version stamp has changed or the
+    local copy is older than ROSTER_MAX_AGE.
+    """
+    from .models import Kart
+
+    version = _get_version()
+    max_age = getattr(settings, "ROSTER_MAX_AGE", DEFAULT_ROSTER_MAX_AGE)
+    state = _state
+    if state["version"] == version and time.monotonic() - state["loaded_at"] < max_age:
+        return state["karts"]
+
+    karts = {
+        number: RosterKart(pk, number, status)
+        for pk, number, status in Kart.objects.order_by("number").values_list(
+            "pk", "number", "status"
+        )
+    }
+    with _lock:
+        _state.update(version=version, loaded_at=time.monotonic(), karts=karts)
+    return karts
+
+
+def get_kart(number):
+    """Return the RosterKart with this number, or None."""
+    return get_roster().get(number)
+
+
+def get_active_numbers():
+    """Return the numbers of karts available for booking, in order."""
+    return [kart.number for kart in get_roster().values() if kart.is_available()]
+
+
+def clear_roster():
+    """Drop this process's copy of the roster."""
+    with _lock:
+        _state.update(version=None, loaded_at=0.0, karts={})
+
+
+def bump_roster_version():
+    """
+    Invalidate the roster in every process.
+
+    The stamp changes now and again when the transaction commits, so no
+    worker can cache rows read before the change became visible.
+    """
+
+    def bump():
+        cache.set(ROSTER_VERSION_KEY, uuid.uuid4().hex, None)
+        clear_roster()
+
+    bump()
+    transaction.on_commit(bump)
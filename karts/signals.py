@@ -0,0 +1,15 @@
+"""
+Signal handlers that keep the kart roster in line with the Kart table.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Kart
+from .roster import bump_roster_version
+
+
+@receiver(post_save, sender=Kart)
+@receiver(post_delete, sender=Kart)
+def invalidate_roster(sender, **kwargs):
+    """Make every process reload the roster after a kart changes."""
+    bump_roster_version()
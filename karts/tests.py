@@ -199,3 +199,72 @@ class KartModelTests(TestCase):
         result = booking.assign_random_kart()
         self.assertFalse(result)
         self.assertIsNone(booking.assigned_kart)
+
+
+class KartRosterTests(TestCase):
+    """Test the cached kart roster and its invalidation."""
+
+    def setUp(self):
+        """Create one active and one maintenance kart."""
+        self.kart1 = Kart.objects.create(number=1, status="ACTIVE")
+        self.kart2 = Kart.objects.create(number=2, status="MAINTENANCE")
+
+    def test_roster_is_served_from_memory(self):
+        """Test that only the first lookup after a change queries karts."""
+        from .roster import get_active_numbers, get_kart
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_active_numbers(), [1])
+        with self.assertNumQueries(0):
+            self.assertEqual(get_kart(2).id, self.kart2.pk)
+            self.assertFalse(get_kart(2).is_available())
+            self.assertIsNone(get_kart(3))
+
+    def test_kart_save_bumps_version(self):
+        """Test that saving a kart makes the roster reload."""
+        from .roster import get_active_numbers
+
+        self.assertEqual(get_active_numbers(), [1])
+        self.kart2.status = "ACTIVE"
+        self.kart2.save()
+        self.assertEqual(get_active_numbers(), [1, 2])
+        self.kart1.delete()
+        self.assertEqual(get_active_numbers(), [2])
+
+    def test_other_process_sees_new_version(self):
+        """Test that a stamp bumped elsewhere invalidates the local copy."""
+        from django.core.cache import cache
+        from .roster import ROSTER_VERSION_KEY, get_active_numbers
+
+        self.assertEqual(get_active_numbers(), [1])
+        # Another worker changed a kart with update() and bumped the stamp
+        Kart.objects.filter(pk=self.kart2.pk).update(status="ACTIVE")
+        cache.set(ROSTER_VERSION_KEY, "bumped-elsewhere", None)
+        self.assertEqual(get_active_numbers(), [1, 2])
+
+    def test_status_job_bumps_version(self):
+        """Test that the bulk status job invalidates the roster."""
+        from core.jobs import enqueue, run_next_job
+        from .roster import get_active_numbers
+
+        self.assertEqual(get_active_numbers(), [1])
+        enqueue(
+            "karts.set_status",
+            payload={"ids": [self.kart1.pk, self.kart2.pk], "status": "ACTIVE"},
+            total=2,
+        )
+        run_next_job()
+        self.assertEqual(get_active_numbers(), [1, 2])
+
+    def test_booking_form_uses_roster(self):
+        """Test that the booking form builds and validates without kart queries."""
+        from bookings.forms import BookingForm
+        from .roster import get_roster
+
+        get_roster()
+        with self.assertNumQueries(0):
+            form = BookingForm(data={"chosen_kart_number": 2})
+            help_text = form.fields["chosen_kart_number"].help_text
+            self.assertIn("Available karts: 1", help_text)
+            self.assertFalse(form.is_valid())
+        self.assertIn("maintenance", form.errors["chosen_kart_number"][0])
@@ -6,8 +6,11 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.utils import timezone
-from .models import Track, SessionSlot
+from .exports import SESSION_EXPORT_COLUMNS, session_export_rows
+from .models import ScheduleRule, Track, SessionSlot
+from core.exports import stream_export
 from core.admin_utils import create_session_type_badge, SessionBookingInline
+from core.paginators import EstimatedCountPaginator
 
 
 @admin.register(Track)
@@ -88,6 +91,60 @@ class TrackAdmin(admin.ModelAdmin):
     get_track_stats.short_description = "Statistics"
 
 
+@admin.register(ScheduleRule)
+class ScheduleRuleAdmin(admin.ModelAdmin):
+    """
+    Admin interface for recurring schedule rules.
+
+    Saving a rule regenerates its future sessions (see sessions.signals).
+    """
+
+    list_display = (
+        "name",
+        "get_session_type_badge",
+        "get_weekdays_display",
+        "hours",
+        "duration_minutes",
+        "capacity",
+        "price",
+        "valid_from",
+        "valid_until",
+        "is_active",
+        "materialized_until",
+    )
+    list_filter = ("session_type", "is_active")
+    list_editable = ("is_active",)
+    search_fields = ("name",)
+    readonly_fields = ("materialized_until", "created_at", "updated_at")
+
+    fieldsets = (
+        ("Rule", {"fields": ("name", "session_type", "is_active")}),
+        ("Timetable", {"fields": ("weekdays", "hours", "duration_minutes")}),
+        ("Capacity & Pricing", {"fields": ("capacity", "price")}),
+        (
+            "Validity",
+            {"fields": ("valid_from", "valid_until", "materialized_until")},
+        ),
+        (
+            "Timestamps",
+            {"fields": ("created_at", "updated_at"), "classes": ("collapse",)},
+        ),
+    )
+
+    def get_session_type_badge(self, obj):
+        """Display session type with color badge."""
+        return create_session_type_badge(obj.session_type, obj.get_session_type_display())
+
+    get_session_type_badge.short_description = "Type"
+    get_session_type_badge.admin_order_field = "session_type"
+
+    def get_weekdays_display(self, obj):
+        """Display weekday names."""
+        return obj.get_weekdays_display()
+
+    get_weekdays_display.short_description = "Days"
+
+
 @admin.register(SessionSlot)
 class SessionSlotAdmin(admin.ModelAdmin):
     """Admin interface for SessionSlot model."""
@@ -112,8 +169,12 @@ class SessionSlotAdmin(admin.ModelAdmin):
         "get_session_summary",
     )
     date_hierarchy = "start_datetime"
+    date_hierarchy_rollup = "session_count"
     ordering = ("-start_datetime",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     inlines = [SessionBookingInline]
+    actions = ["export_csv", "export_jsonl"]
 
     fieldsets = (
         (None, {"fields": ("get_session_summary",)}),
@@ -139,6 +200,10 @@ class SessionSlotAdmin(admin.ModelAdmin):
         ),
     )
 
+    def get_queryset(self, request):
+        """Annotate booking counts so list columns need no per-row queries."""
+        return super().get_queryset(request).with_booking_counts()
+
     def get_session_name(self, obj):
         """Display session type and date."""
         return str(obj)
@@ -147,7 +212,7 @@ class SessionSlotAdmin(admin.ModelAdmin):
 
     def get_booked_count(self, obj):
         """Display count of confirmed/pending bookings."""
-        count = obj.bookings.filter(status__in=["PENDING", "CONFIRMED"]).count()
+        count = obj.get_booked_count()
         if count >= obj.capacity:
             return f"{count} (FULL)"
         return count
@@ -178,7 +243,7 @@ class SessionSlotAdmin(admin.ModelAdmin):
 
     def get_capacity_display(self, obj):
         """Display capacity with visual indicator."""
-        booked = obj.bookings.filter(status__in=["PENDING", "CONFIRMED"]).count()
+        booked = obj.get_booked_count()
         percentage = (booked / obj.capacity * 100) if obj.capacity > 0 else 0
 
         if percentage >= 90:
@@ -199,7 +264,7 @@ class SessionSlotAdmin(admin.ModelAdmin):
 
     def get_session_summary(self, obj):
         """Display comprehensive session summary."""
-        booked_count = obj.bookings.filter(status__in=["PENDING", "CONFIRMED"]).count()
+        booked_count = obj.get_booked_count()
         available = obj.get_available_spots()
         percentage = (booked_count / obj.capacity * 100) if obj.capacity > 0 else 0
 
@@ -228,3 +293,19 @@ class SessionSlotAdmin(admin.ModelAdmin):
         return mark_safe(html)
 
     get_session_summary.short_description = "Session Summary"
+
+    def export_csv(self, request, queryset):
+        """Stream the selected sessions as CSV."""
+        return stream_export(
+            SESSION_EXPORT_COLUMNS, session_export_rows(queryset), "csv", "sessions"
+        )
+
+    export_csv.short_description = "Export selected sessions as CSV"
+
+    def export_jsonl(self, request, queryset):
+        """Stream the selected sessions as JSON Lines."""
+        return stream_export(
+            SESSION_EXPORT_COLUMNS, session_export_rows(queryset), "jsonl", "sessions"
+        )
+
+    export_jsonl.short_description = "Export selected sessions as JSON Lines"
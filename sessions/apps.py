@@ -6,3 +6,7 @@ class SessionsConfig(AppConfig):
     name = "sessions"
     label = "session_slots"
     verbose_name = "Sessions"
+
+    def ready(self):
+        """Import signals when app is ready."""
+        import sessions.signals  # noqa: F401
@@ -0,0 +1,53 @@
+"""
+Streaming export of session slots with booking totals.
+"""
+
+from django.db.models import Count, Q
+from core.exports import EXPORT_CHUNK_SIZE
+
+SESSION_EXPORT_COLUMNS = [
+    "session_id",
+    "session_type",
+    "start",
+    "end",
+    "capacity",
+    "price",
+    "booked",
+    "confirmed",
+    "completed",
+    "cancelled",
+]
+
+
+def session_export_rows(queryset):
+    """
+    Yield one tuple per session in SESSION_EXPORT_COLUMNS order.
+
+    Booking totals are aggregated in the same query rather than counted
+    per session.
+    """
+    queryset = (
+        queryset.annotate(
+            booked=Count(
+                "bookings", filter=Q(bookings__status__in=["PENDING", "CONFIRMED"])
+            ),
+            confirmed=Count("bookings", filter=Q(bookings__status="CONFIRMED")),
+            completed=Count("bookings", filter=Q(bookings__status="COMPLETED")),
+            cancelled=Count("bookings", filter=Q(bookings__status="CANCELLED")),
+        )
+        .values_list(
+            "id",
+            "session_type",
+            "start_datetime",
+            "end_datetime",
+            "capacity",
+            "price",
+            "booked",
+            "confirmed",
+            "completed",
+            "cancelled",
+        )
+        .order_by("start_datetime", "id")
+    )
+    for row in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield (row[0], row[1], row[2].isoformat(), row[3].isoformat()) + row[4:]
@@ -0,0 +1,57 @@
+"""
+Compact columnar JSON feed of upcoming sessions for client-side filtering.
+
+The session list page loads the feed once and filters, sorts and renders
+cards in the browser (static/js/main.js), so changing a filter needs no
+round trip. Each column is one array, indexed by row, which keeps the
+payload small and quick to parse.
+"""
+
+from django.conf import settings
+from django.urls import reverse
+from .models import SessionSlot
+
+SESSION_FEED_COLUMNS = ["id", "start", "end", "type", "capacity", "booked", "price"]
+
+# Orderings shared by the server-rendered list and the browser
+SESSION_SORTS = {
+    "start": ["start_datetime"],
+    "price": ["price", "start_datetime"],
+    "availability": ["-available", "start_datetime"],
+}
+
+
+def build_session_feed(queryset):
+    """
+    Return the feed for a queryset of sessions.
+
+    Args:
+        queryset: SessionSlot queryset annotated with_booking_counts()
+
+    Returns:
+        dict: 'columns' ({name: list}), plus the labels, time zone and URL
+        prefix the browser needs to render cards like the server does
+    """
+    columns = {name: [] for name in SESSION_FEED_COLUMNS}
+    rows = queryset.order_by("start_datetime").values_list(
+        "id",
+        "start_datetime",
+        "end_datetime",
+        "session_type",
+        "capacity",
+        "active_booking_count",
+        "price",
+    )
+    for row in rows:
+        for name, value in zip(SESSION_FEED_COLUMNS, row):
+            columns[name].append(value)
+    # Whole seconds since the epoch are shorter than ISO strings
+    columns["start"] = [int(value.timestamp()) for value in columns["start"]]
+    columns["end"] = [int(value.timestamp()) for value in columns["end"]]
+    columns["price"] = [str(value) for value in columns["price"]]
+    return {
+        "columns": columns,
+        "types": dict(SessionSlot.SESSION_TYPE_CHOICES),
+        "time_zone": settings.TIME_ZONE,
+        "detail_url_prefix": reverse("sessions:session_list"),
+    }
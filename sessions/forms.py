@@ -6,6 +6,7 @@ from django import forms
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from .models import SessionSlot
+from core.forms import ExportFilterForm
 
 
 class SessionSlotForm(forms.ModelForm):
@@ -75,3 +76,22 @@ class SessionSlotForm(forms.ModelForm):
                 )
 
         return cleaned_data
+
+
+class SessionExportForm(ExportFilterForm):
+    """Filters for the streaming session export."""
+
+    session_type = forms.MultipleChoiceField(
+        choices=SessionSlot.SESSION_TYPE_CHOICES,
+        required=False,
+        help_text="Limit to these session types (default: all)",
+    )
+
+    def filter_queryset(self, queryset):
+        """Apply the date range and session type filters."""
+        queryset = self.filter_date_range(queryset, "start_datetime")
+        if self.cleaned_data.get("session_type"):
+            queryset = queryset.filter(
+                session_type__in=self.cleaned_data["session_type"]
+            )
+        return queryset
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:02
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def merge_duplicate_slots(apps, schema_editor):
+    """
+    Merge sessions that share a track, start time and session type.
+
+    The oldest session of each group is kept and the bookings of the others
+    are moved onto it before they are deleted, so the unique constraint can
+    be added to databases that already hold duplicates.
+    """
+    SessionSlot = apps.get_model("session_slots", "SessionSlot")
+    Booking = apps.get_model("bookings", "Booking")
+
+    groups = (
+        SessionSlot.objects.values("track_id", "start_datetime", "session_type")
+        .annotate(total=Count("id"))
+        .filter(total__gt=1)
+        .order_by()
+    )
+    for group in groups.iterator():
+        pks = list(
+            SessionSlot.objects.filter(
+                track_id=group["track_id"],
+                start_datetime=group["start_datetime"],
+                session_type=group["session_type"],
+            )
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        keep, duplicates = pks[0], pks[1:]
+        Booking.objects.filter(session_slot_id__in=duplicates).update(
+            session_slot_id=keep
+        )
+        SessionSlot.objects.filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    # The merge commits on its own, since PostgreSQL will not alter a table
+    # with deferred foreign key checks still pending in the same transaction
+    atomic = False
+
+    dependencies = [
+        ('session_slots', '0001_initial'),
+        ('bookings', '0003_add_created_at_index'),
+    ]
+
+    # Rollups count sessions per day, so duplicates go before the backfill
+    run_before = [
+        ('core', '0002_backfill_daily_rollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            merge_duplicate_slots, migrations.RunPython.noop, atomic=True
+        ),
+        migrations.AddConstraint(
+            model_name='sessionslot',
+            constraint=models.UniqueConstraint(fields=('track', 'start_datetime', 'session_type'), name='unique_session_slot_start'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:06
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('session_slots', '0002_unique_session_slot_start'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Rule name', max_length=100)),
+                ('session_type', models.CharField(choices=[('OPEN_SESSION', 'Open Session'), ('GRAND_PRIX', 'Grand Prix')], default='OPEN_SESSION', help_text='Type of racing session', max_length=20)),
+                ('weekdays', models.CharField(help_text='Comma-separated weekdays, 0=Monday to 6=Sunday', max_length=20)),
+                ('hours', models.CharField(help_text='Comma-separated start hours, e.g. 9,10,11', max_length=100)),
+                ('duration_minutes', models.PositiveIntegerField(help_text='Session length in minutes', validators=[django.core.validators.MinValueValidator(1)])),
+                ('capacity', models.PositiveIntegerField(help_text='Maximum number of drivers allowed', validators=[django.core.validators.MinValueValidator(1)])),
+                ('price', models.DecimalField(decimal_places=2, help_text='Session price in euros', max_digits=6, validators=[django.core.validators.MinValueValidator(0)])),
+                ('valid_from', models.DateField(help_text='First day the rule applies')),
+                ('valid_until', models.DateField(blank=True, help_text='Last day the rule applies (blank = open-ended)', null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('materialized_until', models.DateField(blank=True, editable=False, help_text='Last day sessions have been generated for', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Schedule Rule',
+                'verbose_name_plural': 'Schedule Rules',
+                'ordering': ['session_type', 'name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='sessionslot',
+            name='schedule_rule',
+            field=models.ForeignKey(blank=True, help_text='Rule that generated this session, if any', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sessions', to='session_slots.schedulerule'),
+        ),
+    ]
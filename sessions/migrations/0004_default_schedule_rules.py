@@ -0,0 +1,59 @@
+"""
+Seed schedule rules matching the previously hard-coded create_schedule
+timetable: hourly 9am-10pm, Grand Prix at 6pm on weekdays and at 12pm,
+3pm and 6pm at weekends.
+"""
+
+from django.db import migrations
+from django.utils import timezone
+
+WEEKDAYS = "0,1,2,3,4"
+WEEKEND = "5,6"
+
+DEFAULT_RULES = [
+    ("Weekday Open Sessions", "OPEN_SESSION", WEEKDAYS,
+     "9,10,11,12,13,14,15,16,17,19,20,21,22", 60, 10, "35.00"),
+    ("Weekday Grand Prix", "GRAND_PRIX", WEEKDAYS, "18", 90, 12, "55.00"),
+    ("Weekend Open Sessions", "OPEN_SESSION", WEEKEND,
+     "9,10,11,13,14,16,17,19,20,21,22", 60, 10, "35.00"),
+    ("Weekend Grand Prix", "GRAND_PRIX", WEEKEND, "12,15,18", 90, 12, "55.00"),
+]
+
+
+def create_default_rules(apps, schema_editor):
+    """Create the default weekday and weekend rules, starting today."""
+    ScheduleRule = apps.get_model("session_slots", "ScheduleRule")
+    today = timezone.localdate()
+    ScheduleRule.objects.bulk_create(
+        [
+            ScheduleRule(
+                name=name,
+                session_type=session_type,
+                weekdays=weekdays,
+                hours=hours,
+                duration_minutes=duration,
+                capacity=capacity,
+                price=price,
+                valid_from=today,
+            )
+            for name, session_type, weekdays, hours, duration, capacity, price
+            in DEFAULT_RULES
+        ]
+    )
+
+
+def delete_default_rules(apps, schema_editor):
+    """Remove the default rules."""
+    ScheduleRule = apps.get_model("session_slots", "ScheduleRule")
+    ScheduleRule.objects.filter(name__in=[rule[0] for rule in DEFAULT_RULES]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("session_slots", "0003_schedule_rule"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_default_rules, delete_default_rules),
+    ]
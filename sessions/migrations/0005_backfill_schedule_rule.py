@@ -0,0 +1,64 @@
+"""
+Link sessions created before schedule rules existed to the seeded rule that
+generates the same weekday, start hour and session type, so editing or
+deleting the rule also updates them.
+"""
+
+from django.db import migrations
+from django.utils import timezone
+
+BATCH_SIZE = 500
+
+
+def parse_int_list(value):
+    return {int(part) for part in value.split(",") if part.strip()}
+
+
+def rule_produces(rule, start, session_type):
+    day = start.date()
+    return (
+        rule.is_active
+        and session_type == rule.session_type
+        and start.minute == 0
+        and start.hour in parse_int_list(rule.hours)
+        and day.weekday() in parse_int_list(rule.weekdays)
+        and day >= rule.valid_from
+        and (rule.valid_until is None or day <= rule.valid_until)
+    )
+
+
+def backfill_schedule_rule(apps, schema_editor):
+    """Set schedule_rule on unlinked sessions that a rule would generate."""
+    ScheduleRule = apps.get_model("session_slots", "ScheduleRule")
+    SessionSlot = apps.get_model("session_slots", "SessionSlot")
+    rules = list(ScheduleRule.objects.all())
+    if not rules:
+        return
+
+    claimed = {}
+    slots = SessionSlot.objects.filter(schedule_rule__isnull=True).values_list(
+        "pk", "start_datetime", "session_type"
+    )
+    for pk, start_datetime, session_type in slots.iterator():
+        start = timezone.localtime(start_datetime)
+        for rule in rules:
+            if rule_produces(rule, start, session_type):
+                claimed.setdefault(rule.pk, []).append(pk)
+                break
+
+    for rule_pk, pks in claimed.items():
+        for index in range(0, len(pks), BATCH_SIZE):
+            SessionSlot.objects.filter(pk__in=pks[index:index + BATCH_SIZE]).update(
+                schedule_rule_id=rule_pk
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("session_slots", "0004_default_schedule_rules"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_schedule_rule, migrations.RunPython.noop),
+    ]
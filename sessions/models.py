@@ -39,6 +39,45 @@ class Track(models.Model):
         return super().save(*args, **kwargs)
 
 
+class SessionSlotQuerySet(models.QuerySet):
+    """Custom QuerySet for SessionSlot model with reusable filters."""
+
+    def upcoming(self):
+        """Return sessions that have not started yet."""
+        return self.filter(start_datetime__gte=timezone.now())
+
+    def with_booking_counts(self):
+        """
+        Annotate active (pending/confirmed) and total booking counts.
+
+        Lets lists call ``get_available_spots()`` and ``is_full()`` per row
+        without a COUNT query each.
+        """
+        return self.annotate(
+            active_booking_count=models.Count(
+                "bookings",
+                filter=models.Q(bookings__status__in=["PENDING", "CONFIRMED"]),
+            ),
+            booking_total=models.Count("bookings"),
+        )
+
+
+class SessionSlotManager(models.Manager):
+    """Custom Manager for SessionSlot model."""
+
+    def get_queryset(self):
+        """Return custom QuerySet."""
+        return SessionSlotQuerySet(self.model, using=self._db)
+
+    def upcoming(self):
+        """Return sessions that have not started yet."""
+        return self.get_queryset().upcoming()
+
+    def with_booking_counts(self):
+        """Annotate active and total booking counts."""
+        return self.get_queryset().with_booking_counts()
+
+
 class SessionSlot(models.Model):
     """
     Represents a bookable time slot at the track.
@@ -71,9 +110,20 @@ class SessionSlot(models.Model):
     description = models.TextField(
         blank=True, help_text="Session description or special notes"
     )
+    schedule_rule = models.ForeignKey(
+        "ScheduleRule",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="sessions",
+        help_text="Rule that generated this session, if any",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Custom manager
+    objects = SessionSlotManager()
+
     class Meta:
         ordering = ["start_datetime"]
         verbose_name = "Session Slot"
@@ -82,6 +132,14 @@ class SessionSlot(models.Model):
             models.Index(fields=["track", "start_datetime"]),
             models.Index(fields=["start_datetime"]),
         ]
+        constraints = [
+            # One slot per type and start time lets schedule generation use
+            # bulk_create(ignore_conflicts=True) safely
+            models.UniqueConstraint(
+                fields=["track", "start_datetime", "session_type"],
+                name="unique_session_slot_start",
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -113,16 +171,120 @@ class SessionSlot(models.Model):
         now = timezone.now()
         return self.start_datetime <= now <= self.end_datetime
 
-    def get_available_spots(self):
+    def get_booked_count(self):
         """
-        Calculate remaining capacity.
-        Uses reverse relation from SessionSlot -> Booking (no import needed).
+        Count pending and confirmed bookings.
+        Uses the with_booking_counts() annotation when present.
         """
-        confirmed_count = self.bookings.filter(
-            status__in=["PENDING", "CONFIRMED"]
-        ).count()
-        return self.capacity - confirmed_count
+        if hasattr(self, "active_booking_count"):
+            return self.active_booking_count
+        return self.bookings.filter(status__in=["PENDING", "CONFIRMED"]).count()
+
+    def get_available_spots(self):
+        """Calculate remaining capacity."""
+        return self.capacity - self.get_booked_count()
 
     def is_full(self):
         """Check if session is at capacity."""
         return self.get_available_spots() <= 0
+
+
+def parse_int_list(value):
+    """Parse a comma-separated list of integers such as '0,1,2'."""
+    return sorted({int(part) for part in value.split(",") if part.strip()})
+
+
+class ScheduleRule(models.Model):
+    """
+    A recurring pattern of sessions, e.g. Open Sessions hourly on weekdays.
+
+    Rules are materialized into SessionSlot rows up to a rolling horizon by
+    ``sessions.scheduling.materialize_schedule``.
+    """
+
+    WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+    name = models.CharField(max_length=100, help_text="Rule name")
+    session_type = models.CharField(
+        max_length=20,
+        choices=SessionSlot.SESSION_TYPE_CHOICES,
+        default="OPEN_SESSION",
+        help_text="Type of racing session",
+    )
+    weekdays = models.CharField(
+        max_length=20,
+        help_text="Comma-separated weekdays, 0=Monday to 6=Sunday",
+    )
+    hours = models.CharField(
+        max_length=100,
+        help_text="Comma-separated start hours, e.g. 9,10,11",
+    )
+    duration_minutes = models.PositiveIntegerField(
+        validators=[MinValueValidator(1)], help_text="Session length in minutes"
+    )
+    capacity = models.PositiveIntegerField(
+        validators=[MinValueValidator(1)], help_text="Maximum number of drivers allowed"
+    )
+    price = models.DecimalField(
+        max_digits=6,
+        decimal_places=2,
+        validators=[MinValueValidator(0)],
+        help_text="Session price in euros",
+    )
+    valid_from = models.DateField(help_text="First day the rule applies")
+    valid_until = models.DateField(
+        null=True,
+        blank=True,
+        help_text="Last day the rule applies (blank = open-ended)",
+    )
+    is_active = models.BooleanField(default=True)
+    materialized_until = models.DateField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Last day sessions have been generated for",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["session_type", "name"]
+        verbose_name = "Schedule Rule"
+        verbose_name_plural = "Schedule Rules"
+
+    def __str__(self):
+        return f"{self.name} ({self.get_session_type_display()})"
+
+    def clean(self):
+        """Validate weekday and hour lists and the validity window."""
+        try:
+            weekdays = self.get_weekdays()
+            hours = self.get_hours()
+        except ValueError:
+            raise ValidationError("Weekdays and hours must be comma-separated numbers")
+        if not weekdays or not all(0 <= day <= 6 for day in weekdays):
+            raise ValidationError("Weekdays must be between 0 (Monday) and 6 (Sunday)")
+        if not hours or not all(0 <= hour <= 23 for hour in hours):
+            raise ValidationError("Hours must be between 0 and 23")
+        if self.valid_until and self.valid_from and self.valid_until < self.valid_from:
+            raise ValidationError("Valid until must not be before valid from")
+
+    def get_weekdays(self):
+        """Return the rule's weekdays as a sorted list of integers."""
+        return parse_int_list(self.weekdays)
+
+    def get_hours(self):
+        """Return the rule's start hours as a sorted list of integers."""
+        return parse_int_list(self.hours)
+
+    def get_weekdays_display(self):
+        """Return weekday names, e.g. 'Mon, Tue, Wed'."""
+        return ", ".join(self.WEEKDAY_NAMES[day] for day in self.get_weekdays())
+
+    def applies_on(self, day):
+        """Check if the rule generates sessions on a given date."""
+        if not self.is_active or day < self.valid_from:
+            return False
+        if self.valid_until and day > self.valid_until:
+            return False
+        return day.weekday() in self.get_weekdays()
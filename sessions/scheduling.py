@@ -0,0 +1,332 @@
+"""
+Bulk materialization of session slots.
+
+Schedule rules are turned into SessionSlot rows up to a rolling horizon.
+``materialize_schedule()`` only generates days past each rule's
+``materialized_until`` mark, and ``rematerialize_rule()`` rewrites just the
+future days a rule edit touches.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Max, Q
+from django.utils import timezone
+from .models import ScheduleRule, SessionSlot, Track
+
+# Rows per INSERT when materializing a schedule
+SCHEDULE_BATCH_SIZE = 500
+
+# Days ahead that rule-based sessions are generated for
+DEFAULT_SCHEDULE_HORIZON_DAYS = 60
+
+
+def get_schedule_horizon():
+    """Return the configured materialization horizon in days."""
+    return getattr(settings, "SCHEDULE_HORIZON_DAYS", DEFAULT_SCHEDULE_HORIZON_DAYS)
+
+
+def date_range(start, end):
+    """Yield each date from start to end inclusive."""
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+def build_rule_slots(rule, track, days):
+    """
+    Build unsaved sessions for a rule on the given days.
+
+    Days the rule does not apply to and start times already in the past
+    are skipped.
+    """
+    now = timezone.now()
+    hours = rule.get_hours()
+    slots = []
+    for day in days:
+        if not rule.applies_on(day):
+            continue
+        for hour in hours:
+            start = timezone.make_aware(datetime.combine(day, time(hour=hour)))
+            if start < now:
+                continue
+            slots.append(
+                SessionSlot(
+                    track=track,
+                    schedule_rule=rule,
+                    session_type=rule.session_type,
+                    start_datetime=start,
+                    end_datetime=start + timedelta(minutes=rule.duration_minutes),
+                    capacity=rule.capacity,
+                    price=rule.price,
+                )
+            )
+    return slots
+
+
+def slot_key(slot):
+    """Return the natural key enforced by the unique_session_slot_start constraint."""
+    return (slot.track_id, slot.start_datetime, slot.session_type)
+
+
+def rule_produces(rule, slot):
+    """Return True if the rule would generate a session like the slot."""
+    start = timezone.localtime(slot.start_datetime)
+    return (
+        slot.session_type == rule.session_type
+        and start.minute == 0
+        and start.second == 0
+        and start.hour in rule.get_hours()
+        and rule.applies_on(start.date())
+    )
+
+
+def existing_slot_keys(slots):
+    """Return the natural keys of slots that are already in the database."""
+    if not slots:
+        return set()
+    bounds = {"start_datetime__gte": min(s.start_datetime for s in slots)}
+    bounds["start_datetime__lte"] = max(s.start_datetime for s in slots)
+    return set(
+        SessionSlot.objects.filter(**bounds).values_list(
+            "track_id", "start_datetime", "session_type"
+        )
+    )
+
+
+def materialize_slots(slots, batch_size=SCHEDULE_BATCH_SIZE, dry_run=False):
+    """
+    Insert the slots that do not exist yet, in batches.
+
+    Existing slots are found with one range query up front; inserts use
+    ``bulk_create(ignore_conflicts=True)`` so a concurrent run cannot create
+    duplicates. Rows skipped as conflicts are left out of the result, which
+    is checked against the table after the insert. Daily rollups for the
+    affected range are rebuilt afterwards because bulk inserts bypass model
+    signals.
+
+    Args:
+        slots (list): Unsaved SessionSlot instances
+        batch_size (int): Rows per INSERT
+        dry_run (bool): Only report what would be created
+
+    Returns:
+        list: The slots that were (or would be) created
+    """
+    from core.models import DailyRollup
+    from core.page_cache import invalidate_public_pages
+    from core.prerender import schedule_prerender
+
+    existing = existing_slot_keys(slots)
+    new_slots = {}
+    for slot in slots:
+        # Two rules may produce the same slot; only one row can be inserted
+        key = slot_key(slot)
+        if key not in existing:
+            new_slots.setdefault(key, slot)
+    new_slots = list(new_slots.values())
+    if dry_run or not new_slots:
+        return new_slots
+
+    SessionSlot.objects.bulk_create(
+        new_slots, batch_size=batch_size, ignore_conflicts=True
+    )
+    # ignore_conflicts sets no primary keys, so rows this insert wrote are
+    # told apart from conflicting ones by the created_at it stamped on them
+    inserted = set(
+        SessionSlot.objects.filter(
+            start_datetime__gte=min(s.start_datetime for s in new_slots),
+            start_datetime__lte=max(s.start_datetime for s in new_slots),
+        ).values_list("track_id", "start_datetime", "session_type", "created_at")
+    )
+    new_slots = [
+        slot for slot in new_slots if (*slot_key(slot), slot.created_at) in inserted
+    ]
+    if not new_slots:
+        return new_slots
+    DailyRollup.objects.rebuild(
+        start=timezone.localdate(min(s.start_datetime for s in new_slots)),
+        end=timezone.localdate(max(s.start_datetime for s in new_slots)),
+    )
+    # bulk_create skips the signals that normally drop cached public pages
+    invalidate_public_pages()
+    schedule_prerender()
+    return new_slots
+
+
+def schedule_summary(since):
+    """
+    Summarize upcoming sessions with a single aggregate query.
+
+    Returns:
+        dict: total, open_sessions, grand_prix, first and last start times
+    """
+    return SessionSlot.objects.filter(start_datetime__gte=since).aggregate(
+        total=Count("id"),
+        open_sessions=Count("id", filter=Q(session_type="OPEN_SESSION")),
+        grand_prix=Count("id", filter=Q(session_type="GRAND_PRIX")),
+        first=Min("start_datetime"),
+        last=Max("start_datetime"),
+    )
+
+
+def materialize_schedule(horizon_days=None, dry_run=False):
+    """
+    Extend every active rule's sessions up to the horizon.
+
+    Only days after a rule's ``materialized_until`` mark are generated, so
+    running this daily touches one new day per rule.
+
+    Returns:
+        list: The slots that were (or would be) created
+    """
+    track = Track.objects.first()
+    if track is None:
+        return []
+
+    today = timezone.localdate()
+    horizon_end = today + timedelta(days=(horizon_days or get_schedule_horizon()) - 1)
+    slots = []
+    done = {}
+    for rule in ScheduleRule.objects.filter(is_active=True):
+        start = max(today, rule.valid_from)
+        if rule.materialized_until:
+            start = max(start, rule.materialized_until + timedelta(days=1))
+        end = min(horizon_end, rule.valid_until) if rule.valid_until else horizon_end
+        if start > end:
+            continue
+        slots.extend(build_rule_slots(rule, track, date_range(start, end)))
+        done[rule.pk] = end
+
+    created = materialize_slots(slots, dry_run=dry_run)
+    if not dry_run:
+        for pk, end in done.items():
+            # update() rather than save() so the rule edit signal does not fire
+            ScheduleRule.objects.filter(pk=pk).update(materialized_until=end)
+    return created
+
+
+@transaction.atomic
+def rematerialize_rule(rule, previous=None):
+    """
+    Bring a rule's future sessions in line after it was created or edited.
+
+    Only days that the old or new version of the rule applies to are
+    touched. Sessions that already have bookings are never changed or
+    removed; unbooked ones are updated in place, deleted when the rule no
+    longer produces them, and missing ones are bulk inserted.
+
+    Args:
+        rule (ScheduleRule): The saved rule
+        previous (ScheduleRule, optional): The rule as it was before the edit
+
+    Returns:
+        dict: Counts of created, updated, deleted and kept (booked) sessions
+    """
+    from core.models import DailyRollup
+    from core.page_cache import invalidate_public_pages
+    from core.prerender import schedule_prerender
+    from core.signals import rollups_suspended
+
+    counts = {"created": 0, "updated": 0, "deleted": 0, "kept": 0}
+    track = Track.objects.first()
+    if track is None:
+        return counts
+
+    today = timezone.localdate()
+    horizon_end = today + timedelta(days=get_schedule_horizon() - 1)
+    days = [
+        day
+        for day in date_range(today, horizon_end)
+        if rule.applies_on(day) or (previous and previous.applies_on(day))
+    ]
+    if not days:
+        return counts
+
+    wanted = {slot_key(slot): slot for slot in build_rule_slots(rule, track, days)}
+    day_set = set(days)
+    # Sessions created before rules existed are claimed when this rule
+    # (or its previous version) would have generated them
+    candidates = SessionSlot.objects.filter(
+        Q(schedule_rule=rule) | Q(schedule_rule__isnull=True),
+        start_datetime__gte=timezone.now(),
+        start_datetime__lt=timezone.make_aware(
+            datetime.combine(days[-1] + timedelta(days=1), time.min)
+        ),
+    ).annotate(booking_total=Count("bookings"))
+    existing = [
+        slot
+        for slot in candidates
+        if timezone.localdate(slot.start_datetime) in day_set
+        and (
+            slot.schedule_rule_id == rule.pk
+            or slot_key(slot) in wanted
+            or (previous is not None and rule_produces(previous, slot))
+        )
+    ]
+    claimed = [slot.pk for slot in existing if slot.schedule_rule_id is None]
+    if claimed:
+        SessionSlot.objects.filter(pk__in=claimed).update(schedule_rule=rule)
+
+    now = timezone.now()
+    to_update, to_delete = [], []
+    for slot in existing:
+        target = wanted.pop(slot_key(slot), None)
+        if slot.booking_total:
+            counts["kept"] += 1
+        elif target is None:
+            to_delete.append(slot.pk)
+        else:
+            slot.end_datetime = target.end_datetime
+            slot.capacity = target.capacity
+            slot.price = target.price
+            slot.updated_at = now
+            to_update.append(slot)
+
+    if to_update:
+        SessionSlot.objects.bulk_update(
+            to_update,
+            ["end_datetime", "capacity", "price", "updated_at"],
+            batch_size=SCHEDULE_BATCH_SIZE,
+        )
+        invalidate_public_pages()
+        schedule_prerender()
+    if to_delete:
+        with rollups_suspended():
+            SessionSlot.objects.filter(pk__in=to_delete).delete()
+        DailyRollup.objects.rebuild(start=days[0], end=days[-1])
+    created = materialize_slots(list(wanted.values()))
+
+    if rule.is_active:
+        ScheduleRule.objects.filter(pk=rule.pk).update(materialized_until=horizon_end)
+    counts.update(
+        created=len(created), updated=len(to_update), deleted=len(to_delete)
+    )
+    return counts
+
+
+def clear_rule_sessions(rule):
+    """
+    Delete a rule's future sessions that nobody has booked.
+
+    Booked sessions are left in place. Returns the number deleted.
+    """
+    from core.models import DailyRollup
+    from core.signals import rollups_suspended
+
+    unbooked = list(
+        rule.sessions.filter(
+            start_datetime__gte=timezone.now(), bookings__isnull=True
+        ).values_list("pk", "start_datetime")
+    )
+    if not unbooked:
+        return 0
+    with rollups_suspended():
+        SessionSlot.objects.filter(pk__in=[pk for pk, _ in unbooked]).delete()
+    starts = [start for _, start in unbooked]
+    DailyRollup.objects.rebuild(
+        start=timezone.localdate(min(starts)), end=timezone.localdate(max(starts))
+    )
+    return len(unbooked)
@@ -0,0 +1,29 @@
+"""
+Signal handlers that keep rule-generated sessions in line with their rules.
+"""
+
+from django.db.models.signals import post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from .models import ScheduleRule
+from .scheduling import clear_rule_sessions, rematerialize_rule
+
+
+@receiver(pre_save, sender=ScheduleRule)
+def remember_previous_rule(sender, instance, raw=False, **kwargs):
+    """Keep a copy of the stored rule so an edit knows which days it affects."""
+    instance._previous_rule = None
+    if instance.pk and not raw:
+        instance._previous_rule = ScheduleRule.objects.filter(pk=instance.pk).first()
+
+
+@receiver(post_save, sender=ScheduleRule)
+def rematerialize_saved_rule(sender, instance, raw=False, **kwargs):
+    """Regenerate the future days touched by a new or edited rule."""
+    if not raw:
+        rematerialize_rule(instance, getattr(instance, "_previous_rule", None))
+
+
+@receiver(pre_delete, sender=ScheduleRule)
+def clear_deleted_rule_sessions(sender, instance, **kwargs):
+    """Remove unbooked future sessions of a rule that is being deleted."""
+    clear_rule_sessions(instance)
@@ -382,3 +382,475 @@ class SessionViewTests(TestCase):
         self.assertEqual(response.context["user_bookings_count"], 1)
         self.assertIn("user_booked_sessions", response.context)
         self.assertIn(self.session1.pk, response.context["user_booked_sessions"])
+
+
+class SessionCardCacheTests(TestCase):
+    """Test cases for the cached session cards on the session list."""
+
+    def setUp(self):
+        """Set up test data."""
+        from django.core.cache import cache
+
+        cache.clear()
+        self.track = Track.objects.create(name="Test Track", address="123 Test St")
+        self.driver = User.objects.create_user(
+            username="testdriver", password="testpass123"
+        )
+        self.session = SessionSlot.objects.create(
+            track=self.track,
+            session_type="OPEN_SESSION",
+            start_datetime=timezone.now() + timedelta(days=1),
+            end_datetime=timezone.now() + timedelta(days=1, hours=1),
+            capacity=10,
+            price=25.00,
+        )
+
+    def test_card_is_reused_until_session_is_saved(self):
+        """Test that a card is served from cache until updated_at changes."""
+        url = reverse("sessions:session_list")
+        self.client.get(url)
+
+        # update() leaves updated_at alone, so the cached card is still used
+        SessionSlot.objects.filter(pk=self.session.pk).update(price=99)
+        self.assertContains(self.client.get(url), "&euro;25.00")
+
+        self.session.refresh_from_db()
+        self.session.save()
+        self.assertContains(self.client.get(url), "&euro;99.00")
+
+    def test_card_is_refreshed_when_booked_count_changes(self):
+        """Test that a new booking re-renders the availability on the card."""
+        from bookings.models import Booking
+
+        url = reverse("sessions:session_list")
+        self.assertContains(self.client.get(url), "10 / 10 spots available")
+
+        Booking.objects.create(
+            session_slot=self.session, driver=self.driver, status="PENDING"
+        )
+        self.assertContains(self.client.get(url), "9 / 10 spots available")
+
+    def test_card_is_refreshed_when_session_becomes_past(self):
+        """Test that the Available badge does not outlive the session."""
+        from unittest import mock
+
+        url = reverse("sessions:session_list")
+        self.assertContains(self.client.get(url), "Available</span>")
+
+        with mock.patch.object(SessionSlot, "is_past", return_value=True):
+            response = self.client.get(url)
+        self.assertContains(response, "Past Session")
+        self.assertNotContains(response, "Available</span>")
+
+    def test_booked_badge_is_not_cached_with_the_card(self):
+        """Test that the Booked badge is drawn per user over the shared card."""
+        from bookings.models import Booking
+
+        Booking.objects.create(
+            session_slot=self.session, driver=self.driver, status="PENDING"
+        )
+        url = reverse("sessions:session_list")
+
+        self.client.login(username="testdriver", password="testpass123")
+        self.assertContains(self.client.get(url), "booked-overlay")
+
+        self.client.logout()
+        response = self.client.get(url)
+        self.assertContains(response, "9 / 10 spots available")
+        self.assertNotContains(response, "booked-overlay")
+
+
+class SessionFeedTests(TestCase):
+    """Test cases for the session list's JSON feed and sorting."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.track = Track.objects.create(name="Test Track", address="123 Test St")
+        self.driver = User.objects.create_user(
+            username="testdriver", password="testpass123"
+        )
+        self.late = SessionSlot.objects.create(
+            track=self.track,
+            session_type="GRAND_PRIX",
+            start_datetime=timezone.now() + timedelta(days=2),
+            end_datetime=timezone.now() + timedelta(days=2, hours=1),
+            capacity=8,
+            price=25.00,
+        )
+        self.early = SessionSlot.objects.create(
+            track=self.track,
+            session_type="OPEN_SESSION",
+            start_datetime=timezone.now() + timedelta(days=1),
+            end_datetime=timezone.now() + timedelta(days=1, hours=1),
+            capacity=10,
+            price=45.00,
+        )
+        SessionSlot.objects.create(
+            track=self.track,
+            session_type="OPEN_SESSION",
+            start_datetime=timezone.now() - timedelta(days=1),
+            end_datetime=timezone.now() - timedelta(days=1, hours=-1),
+            capacity=10,
+            price=25.00,
+        )
+
+    def test_feed_has_columns_for_upcoming_sessions(self):
+        """Test that the feed lists upcoming sessions column by column."""
+        from bookings.models import Booking
+
+        Booking.objects.create(
+            session_slot=self.late, driver=self.driver, status="PENDING"
+        )
+        response = self.client.get(reverse("sessions:session_feed"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("public", response["Cache-Control"])
+        columns = response.json()["columns"]
+        self.assertEqual(columns["id"], [self.early.pk, self.late.pk])
+        self.assertEqual(columns["type"], ["OPEN_SESSION", "GRAND_PRIX"])
+        self.assertEqual(columns["capacity"], [10, 8])
+        self.assertEqual(columns["booked"], [0, 1])
+        self.assertEqual(columns["price"], ["45.00", "25.00"])
+        self.assertEqual(
+            columns["start"],
+            [
+                int(self.early.start_datetime.timestamp()),
+                int(self.late.start_datetime.timestamp()),
+            ],
+        )
+
+    def test_session_list_sorts_like_the_feed(self):
+        """Test that the server-rendered list honours the sort parameter."""
+        url = reverse("sessions:session_list")
+        response = self.client.get(url, {"sort": "price"})
+        self.assertEqual(list(response.context["sessions"]), [self.late, self.early])
+
+        response = self.client.get(url, {"sort": "bogus"})
+        self.assertEqual(response.context["sort"], "start")
+        self.assertEqual(list(response.context["sessions"]), [self.early, self.late])
+
+    def test_session_list_exposes_booked_ids_to_scripts(self):
+        """Test that signed-in users' booked sessions are embedded as JSON."""
+        from bookings.models import Booking
+
+        Booking.objects.create(
+            session_slot=self.early, driver=self.driver, status="CONFIRMED"
+        )
+        self.client.login(username="testdriver", password="testpass123")
+        response = self.client.get(reverse("sessions:session_list"))
+
+        self.assertContains(response, 'data-feed-url="/sessions/feed.json"')
+        self.assertContains(
+            response,
+            f'<script id="user-booked-sessions" type="application/json">'
+            f"[{self.early.pk}]</script>",
+            html=False,
+        )
+
+
+class SessionExportTests(TestCase):
+    """Test streaming session exports."""
+
+    def test_export_includes_booking_totals(self):
+        """Test that session export aggregates booking counts per session."""
+        from bookings.models import Booking
+
+        track = Track.objects.create(
+            name="Test Track", address="123 Test St", phone="555-1234"
+        )
+        session = SessionSlot.objects.create(
+            track=track,
+            session_type="OPEN_SESSION",
+            start_datetime=timezone.now() + timedelta(days=1),
+            end_datetime=timezone.now() + timedelta(days=1, hours=1),
+            capacity=10,
+            price=25.00,
+        )
+        for i, status in enumerate(["PENDING", "CONFIRMED", "CANCELLED"]):
+            Booking.objects.create(
+                session_slot=session,
+                driver=User.objects.create_user(username=f"driver{i}"),
+                status=status,
+            )
+        manager = User.objects.create_user(username="manager", password="pass123")
+        manager.profile.role = "MANAGER"
+        manager.profile.save()
+        self.client.login(username="manager", password="pass123")
+
+        response = self.client.get(reverse("sessions:session_export"))
+        lines = b"".join(response.streaming_content).decode().strip().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].endswith(",10,25.00,2,1,0,1"))
+
+
+class CreateScheduleCommandTests(TestCase):
+    """Test bulk schedule materialization."""
+
+    def setUp(self):
+        """Set up a track for scheduling."""
+        Track.objects.create(name="Test Track", address="123 Test St", phone="555-1234")
+
+    def run_command(self, *args):
+        """Run create_schedule and return its output."""
+        from io import StringIO
+        from django.core.management import call_command
+
+        out = StringIO()
+        call_command("create_schedule", "--days", "3", *args, stdout=out)
+        return out.getvalue()
+
+    def test_rerun_creates_nothing(self):
+        """Test that running the command twice does not duplicate sessions."""
+        self.run_command()
+        count = SessionSlot.objects.count()
+        self.assertGreater(count, 0)
+
+        output = self.run_command()
+        self.assertIn("Created 0 new sessions", output)
+        self.assertEqual(SessionSlot.objects.count(), count)
+
+    def test_dry_run_writes_nothing(self):
+        """Test that --dry-run only reports what would be created."""
+        output = self.run_command("--dry-run")
+        self.assertIn("[dry run] Would create", output)
+        self.assertEqual(SessionSlot.objects.count(), 0)
+
+    def test_rollups_match_created_sessions(self):
+        """Test that daily rollups are rebuilt after the bulk insert."""
+        from core.models import DailyRollup
+
+        self.run_command()
+        total = sum(DailyRollup.objects.values_list("session_count", flat=True))
+        self.assertEqual(total, SessionSlot.objects.count())
+
+    def test_conflicting_slots_are_not_counted_as_created(self):
+        """Test that slots skipped by ignore_conflicts are left out of the result."""
+        from unittest import mock
+        from .scheduling import materialize_slots
+
+        track = Track.objects.get()
+        start = timezone.now() + timedelta(days=1)
+
+        def build(hour):
+            return SessionSlot(
+                track=track,
+                session_type="OPEN_SESSION",
+                start_datetime=start + timedelta(hours=hour),
+                end_datetime=start + timedelta(hours=hour, minutes=30),
+                capacity=10,
+                price=25.00,
+            )
+
+        build(0).save()
+        # A concurrent run inserted hour 0 after the existing-slot lookup
+        with mock.patch("sessions.scheduling.existing_slot_keys", return_value=set()):
+            created = materialize_slots([build(0), build(1), build(1)])
+
+        self.assertEqual(
+            [s.start_datetime for s in created], [start + timedelta(hours=1)]
+        )
+        self.assertEqual(SessionSlot.objects.count(), 2)
+
+
+class ScheduleRuleTests(TestCase):
+    """Test rule-based schedule materialization."""
+
+    def setUp(self):
+        """Set up a track and a single rule on every day of the week."""
+        from .models import ScheduleRule
+
+        ScheduleRule.objects.all().delete()
+        self.track = Track.objects.create(
+            name="Test Track", address="123 Test St", phone="555-1234"
+        )
+        self.rule = ScheduleRule.objects.create(
+            name="Evening Grand Prix",
+            session_type="GRAND_PRIX",
+            weekdays="0,1,2,3,4,5,6",
+            hours="23",
+            duration_minutes=30,
+            capacity=12,
+            price=55.00,
+            valid_from=timezone.localdate(),
+        )
+
+    def test_rule_save_materializes_horizon(self):
+        """Test that saving a rule generates its sessions up to the horizon."""
+        from .scheduling import get_schedule_horizon
+
+        self.rule.refresh_from_db()
+        sessions = self.rule.sessions.all()
+        self.assertGreaterEqual(sessions.count(), get_schedule_horizon() - 1)
+        self.assertEqual(
+            self.rule.materialized_until,
+            timezone.localdate() + timedelta(days=get_schedule_horizon() - 1),
+        )
+
+    def test_materialize_only_touches_new_days(self):
+        """Test that the rolling materializer only generates missing days."""
+        from .scheduling import materialize_schedule
+
+        self.assertEqual(materialize_schedule(), [])
+
+        created = materialize_schedule(horizon_days=70)
+        self.assertEqual(len(created), 10)
+
+    def test_rule_edit_updates_unbooked_and_keeps_booked(self):
+        """Test that editing a rule rewrites unbooked sessions only."""
+        from bookings.models import Booking
+
+        booked = self.rule.sessions.order_by("start_datetime").last()
+        Booking.objects.create(
+            session_slot=booked, driver=User.objects.create_user(username="driver")
+        )
+
+        self.rule.price = 60.00
+        self.rule.save()
+
+        self.assertEqual(SessionSlot.objects.get(pk=booked.pk).price, 55)
+        self.assertFalse(
+            self.rule.sessions.exclude(pk=booked.pk).exclude(price=60).exists()
+        )
+
+    def test_removing_weekday_deletes_only_that_day(self):
+        """Test that dropping a weekday removes just that day's sessions."""
+        before = self.rule.sessions.count()
+        dropped = [
+            s for s in self.rule.sessions.all()
+            if timezone.localtime(s.start_datetime).weekday() == 6
+        ]
+
+        self.rule.weekdays = "0,1,2,3,4,5"
+        self.rule.save()
+
+        self.assertEqual(self.rule.sessions.count(), before - len(dropped))
+        self.assertFalse(SessionSlot.objects.filter(pk=dropped[0].pk).exists())
+
+    def test_rule_edit_claims_sessions_created_before_rules(self):
+        """Test that an edit also updates matching sessions with no rule."""
+        legacy = self.rule.sessions.order_by("start_datetime").last()
+        SessionSlot.objects.filter(pk=legacy.pk).update(schedule_rule=None)
+
+        self.rule.price = 60.00
+        self.rule.save()
+
+        legacy.refresh_from_db()
+        self.assertEqual(legacy.schedule_rule, self.rule)
+        self.assertEqual(legacy.price, 60)
+
+    def test_backfill_migration_links_matching_sessions(self):
+        """Test that the backfill migration links sessions to their rule."""
+        from importlib import import_module
+        from django.apps import apps
+
+        migration = import_module("sessions.migrations.0005_backfill_schedule_rule")
+        self.rule.sessions.update(schedule_rule=None)
+        other = SessionSlot.objects.create(
+            track=self.track,
+            session_type="OPEN_SESSION",
+            start_datetime=timezone.now() + timedelta(days=1, minutes=7),
+            end_datetime=timezone.now() + timedelta(days=1, hours=1),
+            capacity=10,
+            price=25.00,
+        )
+
+        migration.backfill_schedule_rule(apps, None)
+
+        self.assertFalse(
+            SessionSlot.objects.filter(
+                session_type="GRAND_PRIX", schedule_rule__isnull=True
+            ).exists()
+        )
+        other.refresh_from_db()
+        self.assertIsNone(other.schedule_rule)
+
+    def test_deleting_rule_clears_unbooked_sessions(self):
+        """Test that deleting a rule removes its unbooked future sessions."""
+        self.rule.delete()
+        self.assertFalse(SessionSlot.objects.exists())
+
+
+class AsyncSessionViewTests(TestCase):
+    """Test cases for the async session views served under ASGI."""
+
+    def setUp(self):
+        """Set up test data."""
+        from bookings.models import Booking
+
+        self.track = Track.objects.create(name="Test Track", address="123 Test St")
+        self.driver = User.objects.create_user(
+            username="testdriver", password="testpass123"
+        )
+        self.booked = SessionSlot.objects.create(
+            track=self.track,
+            session_type="OPEN_SESSION",
+            start_datetime=timezone.now() + timedelta(days=1),
+            end_datetime=timezone.now() + timedelta(days=1, hours=1),
+            capacity=10,
+            price=45.00,
+        )
+        self.grand_prix = SessionSlot.objects.create(
+            track=self.track,
+            session_type="GRAND_PRIX",
+            start_datetime=timezone.now() + timedelta(days=2),
+            end_datetime=timezone.now() + timedelta(days=2, hours=1),
+            capacity=8,
+            price=25.00,
+        )
+        Booking.objects.create(
+            session_slot=self.booked, driver=self.driver, status="CONFIRMED"
+        )
+
+    def get_request(self, path, data=None, user=None):
+        """Build an async request for a user, anonymous by default."""
+        from django.contrib.auth.models import AnonymousUser
+        from django.test import AsyncRequestFactory
+
+        request = AsyncRequestFactory().get(path, data)
+        request.user = user or AnonymousUser()
+        return request
+
+    async def test_session_list_async_filters_and_marks_bookings(self):
+        """Test that the async list filters sessions and counts bookings."""
+        from .views import session_list_async
+
+        request = self.get_request(
+            reverse("sessions:session_list"),
+            {"session_type": "OPEN_SESSION"},
+            self.driver,
+        )
+        response = await session_list_async(request)
+
+        self.assertContains(response, "You have 1 active booking.")
+        self.assertContains(response, "booked-overlay", count=1)
+        self.assertContains(
+            response, reverse("sessions:session_detail", args=[self.booked.pk])
+        )
+        self.assertNotContains(
+            response, reverse("sessions:session_detail", args=[self.grand_prix.pk])
+        )
+
+    async def test_session_detail_async_shows_booking(self):
+        """Test that the async detail page knows the driver has booked."""
+        from .views import session_detail_async
+
+        path = reverse("sessions:session_detail", args=[self.booked.pk])
+        response = await session_detail_async(
+            self.get_request(path, user=self.driver), pk=self.booked.pk
+        )
+        anonymous = await session_detail_async(
+            self.get_request(path), pk=self.booked.pk
+        )
+
+        self.assertContains(response, "You already have a booking for this session.")
+        self.assertNotContains(
+            anonymous, "You already have a booking for this session."
+        )
+
+    async def test_session_detail_async_missing_session(self):
+        """Test that an unknown session raises Http404."""
+        from django.http import Http404
+        from .views import session_detail_async
+
+        with self.assertRaises(Http404):
+            await session_detail_async(self.get_request("/sessions/999/"), pk=999)
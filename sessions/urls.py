@@ -2,14 +2,23 @@
 URL patterns for sessions app (session slot management).
 """
 
+from django.conf import settings
 from django.urls import path
 from . import views
 
 app_name = "sessions"
 
+# ASGI processes serve the async versions of the schedule views
+if getattr(settings, "ASYNC_VIEWS", False):
+    session_list, session_detail = views.session_list_async, views.session_detail_async
+else:
+    session_list, session_detail = views.session_list, views.session_detail
+
 urlpatterns = [
     # Public session listing and detail
-    path("", views.session_list, name="session_list"),
-    path("<int:pk>/", views.session_detail, name="session_detail"),
+    path("", session_list, name="session_list"),
+    path("<int:pk>/", session_detail, name="session_detail"),
+    path("feed.json", views.session_feed, name="session_feed"),
+    path("export/", views.session_export, name="session_export"),
     # Manager session management now handled via Django admin
 ]
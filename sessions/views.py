@@ -2,24 +2,43 @@
 Views for sessions app (session slot management).
 """
 
+from django.conf import settings
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.db.models import F
+from django.http import Http404, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import render, get_object_or_404
 from django.utils import timezone
+from django.views.decorators.cache import cache_control
+from .exports import SESSION_EXPORT_COLUMNS, session_export_rows
+from .feed import SESSION_SORTS, build_session_feed
+from .forms import SessionExportForm
 from .models import SessionSlot
+from core.async_utils import aget_user, arender
+from core.decorators import is_manager
+from core.exports import stream_export
 
 
-def session_list(request):
+def get_listed_sessions(params):
     """
-    Display list of all sessions with filtering.
-    Public view - accessible to all users.
+    Return the upcoming sessions matching the list's filters, and the sort.
+
+    Shared by session_list and session_list_async.
     """
+    sort = params.get("sort")
+    if sort not in SESSION_SORTS:
+        sort = "start"
+
     # Get all upcoming sessions
-    sessions = SessionSlot.objects.filter(start_datetime__gte=timezone.now()).order_by(
-        "start_datetime"
+    sessions = (
+        SessionSlot.objects.with_booking_counts()
+        .filter(start_datetime__gte=timezone.now())
+        .annotate(available=F("capacity") - F("active_booking_count"))
+        .order_by(*SESSION_SORTS[sort])
     )
 
     # Apply filters
-    session_type = request.GET.get("session_type")
-    date = request.GET.get("date")
+    session_type = params.get("session_type")
+    date = params.get("date")
 
     if session_type:
         sessions = sessions.filter(session_type=session_type)
@@ -28,32 +47,89 @@ def session_list(request):
         # Filter sessions for the specific date
         sessions = sessions.filter(start_datetime__date=date)
 
+    return sessions, sort
+
+
+def get_active_bookings(user):
+    """Return the user's pending and confirmed bookings."""
+    from bookings.models import Booking
+
+    return Booking.objects.filter(driver=user, status__in=["PENDING", "CONFIRMED"])
+
+
+def session_list(request):
+    """
+    Display list of all sessions with filtering and sorting.
+    Public view - accessible to all users. With JavaScript the page filters
+    the session_feed payload in the browser instead of reloading.
+    """
+    sessions, sort = get_listed_sessions(request.GET)
     context = {
         "sessions": sessions,
+        "sort": sort,
+        "session_card_timeout": getattr(settings, "SESSION_CARD_CACHE_TIMEOUT", 300),
     }
 
     # Add user booking information if authenticated
     if request.user.is_authenticated:
-        from bookings.models import Booking
-
-        user_bookings = Booking.objects.filter(
-            driver=request.user, status__in=["PENDING", "CONFIRMED"]
-        )
+        user_bookings = get_active_bookings(request.user)
         context["user_bookings_count"] = user_bookings.count()
-        context["user_booked_sessions"] = list(
+        context["user_booked_sessions"] = set(
             user_bookings.values_list("session_slot_id", flat=True)
         )
+        # For the Booked badges on cards rendered in the browser
+        context["user_booked_ids"] = sorted(context["user_booked_sessions"])
 
     return render(request, "sessions/session_list.html", context)
 
 
+async def session_list_async(request):
+    """
+    Async session_list, routed in place of it under ASGI (ASYNC_VIEWS).
+    Same context, with the sessions read through the async ORM.
+    """
+    sessions, sort = get_listed_sessions(request.GET)
+    context = {
+        "sessions": [session async for session in sessions.aiterator()],
+        "sort": sort,
+        "session_card_timeout": getattr(settings, "SESSION_CARD_CACHE_TIMEOUT", 300),
+    }
+
+    user = await aget_user(request)
+    if user.is_authenticated:
+        user_bookings = get_active_bookings(user)
+        context["user_bookings_count"] = await user_bookings.acount()
+        context["user_booked_sessions"] = {
+            pk
+            async for pk in user_bookings.values_list(
+                "session_slot_id", flat=True
+            ).aiterator()
+        }
+        context["user_booked_ids"] = sorted(context["user_booked_sessions"])
+
+    return await arender(request, "sessions/session_list.html", context)
+
+
+@cache_control(public=True, max_age=getattr(settings, "SESSION_FEED_MAX_AGE", 30))
+def session_feed(request):
+    """
+    Return upcoming sessions as compact columnar JSON.
+    Public and the same for every visitor, so browsers and proxies may
+    cache it briefly.
+    """
+    sessions = SessionSlot.objects.with_booking_counts().upcoming()
+    return JsonResponse(
+        build_session_feed(sessions), json_dumps_params={"separators": (",", ":")}
+    )
+
+
 def session_detail(request, pk):
     """
     Display detailed information about a specific session.
     Shows capacity, bookings, and availability.
     Public view - accessible to all users.
     """
-    session = get_object_or_404(SessionSlot, pk=pk)
+    session = get_object_or_404(SessionSlot.objects.with_booking_counts(), pk=pk)
 
     # Calculate availability
     available_spots = session.get_available_spots()
@@ -77,3 +153,51 @@ def session_detail(request, pk):
         "user_has_booking": user_has_booking,
     }
     return render(request, "sessions/session_detail.html", context)
+
+
+async def session_detail_async(request, pk):
+    """
+    Async session_detail, routed in place of it under ASGI (ASYNC_VIEWS).
+    """
+    try:
+        session = await SessionSlot.objects.with_booking_counts().aget(pk=pk)
+    except SessionSlot.DoesNotExist:
+        raise Http404("No SessionSlot matches the given query.")
+
+    user_has_booking = False
+    user = await aget_user(request)
+    if user.is_authenticated:
+        user_has_booking = await session.bookings.filter(
+            driver=user, status__in=["PENDING", "CONFIRMED"]
+        ).aexists()
+
+    context = {
+        "session": session,
+        "available_spots": session.get_available_spots(),
+        "is_full": session.is_full(),
+        "confirmed_bookings": session.bookings.filter(
+            status__in=["CONFIRMED", "COMPLETED"]
+        ),
+        "user_has_booking": user_has_booking,
+    }
+    return await arender(request, "sessions/session_detail.html", context)
+
+
+@login_required
+@user_passes_test(is_manager)
+def session_export(request):
+    """
+    Stream sessions with booking totals as CSV or JSON Lines.
+    Manager-only. Filters: format, start, end and session_type.
+    """
+    form = SessionExportForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest(form.errors.as_text())
+
+    sessions = form.filter_queryset(SessionSlot.objects.all())
+    return stream_export(
+        SESSION_EXPORT_COLUMNS,
+        session_export_rows(sessions),
+        form.cleaned_data["format"],
+        "sessions",
+    )
@@ -35,3 +35,220 @@ document.addEventListener("DOMContentLoaded", function () {
     });
   });
 });
+
+// Register the service worker, which caches static files and keeps the
+// session feed and bookings list available offline. The URL carries the
+// signed-in user's cache id, so a different user re-installs the worker.
+if ("serviceWorker" in navigator) {
+  window.addEventListener("load", function () {
+    const url = document.body.dataset.serviceWorker;
+    if (url) {
+      navigator.serviceWorker.register(url).catch(function () {});
+    }
+  });
+}
+
+// Session list: filter, sort and render cards in the browser from one
+// columnar JSON feed, so changing a filter needs no page load. Without
+// JavaScript the form submits and the server renders the same cards.
+document.addEventListener("DOMContentLoaded", function () {
+  const results = document.getElementById("session-results");
+  const form = document.getElementById("session-filters");
+  if (!results || !form || !window.fetch) {
+    return;
+  }
+
+  const bookedScript = document.getElementById("user-booked-sessions");
+  const booked = new Set(bookedScript ? JSON.parse(bookedScript.textContent) : []);
+
+  fetch(results.dataset.feedUrl, { credentials: "omit" })
+    .then(function (response) {
+      if (!response.ok) {
+        throw new Error("Session feed returned " + response.status);
+      }
+      return response.json();
+    })
+    .then(function (feed) {
+      const sessions = feedToSessions(feed);
+      const formats = feedFormats(feed.time_zone);
+      const update = function () {
+        const params = new URLSearchParams(new FormData(form));
+        renderSessions(results, filterSessions(sessions, params, formats), {
+          feed: feed,
+          formats: formats,
+          booked: booked,
+          filtered: Boolean(params.get("session_type") || params.get("date")),
+        });
+        // Keep the URL shareable and reloadable as the server-rendered page
+        history.replaceState(null, "", "?" + params.toString());
+      };
+      form.addEventListener("change", update);
+      form.addEventListener("submit", function (e) {
+        e.preventDefault();
+        update();
+      });
+    })
+    .catch(function () {
+      // Leave the server-rendered cards and full-page filtering in place
+    });
+});
+
+// Turn the feed's column arrays into one object per session
+function feedToSessions(feed) {
+  const columns = feed.columns;
+  return columns.id.map(function (id, i) {
+    return {
+      id: id,
+      start: new Date(columns.start[i] * 1000),
+      end: new Date(columns.end[i] * 1000),
+      type: columns.type[i],
+      capacity: columns.capacity[i],
+      booked: columns.booked[i],
+      price: columns.price[i],
+      available: columns.capacity[i] - columns.booked[i],
+    };
+  });
+}
+
+// Date formats matching the server's, in the track's time zone
+function feedFormats(timeZone) {
+  return {
+    day: new Intl.DateTimeFormat("en-US", {
+      weekday: "long",
+      month: "long",
+      day: "numeric",
+      year: "numeric",
+      timeZone: timeZone,
+    }),
+    time: new Intl.DateTimeFormat("en-US", {
+      hour: "numeric",
+      minute: "2-digit",
+      timeZone: timeZone,
+    }),
+    // en-CA formats dates as YYYY-MM-DD, like the date input's value
+    isoDate: new Intl.DateTimeFormat("en-CA", {
+      year: "numeric",
+      month: "2-digit",
+      day: "2-digit",
+      timeZone: timeZone,
+    }),
+  };
+}
+
+const SESSION_SORTS = {
+  start: function (a, b) {
+    return a.start - b.start;
+  },
+  price: function (a, b) {
+    return parseFloat(a.price) - parseFloat(b.price) || a.start - b.start;
+  },
+  availability: function (a, b) {
+    return b.available - a.available || a.start - b.start;
+  },
+};
+
+function filterSessions(sessions, params, formats) {
+  const type = params.get("session_type");
+  const date = params.get("date");
+  const sort = SESSION_SORTS[params.get("sort")] || SESSION_SORTS.start;
+  return sessions
+    .filter(function (session) {
+      return (
+        (!type || session.type === type) &&
+        (!date || formats.isoDate.format(session.start) === date)
+      );
+    })
+    .sort(sort);
+}
+
+function escapeHtml(value) {
+  const div = document.createElement("div");
+  div.textContent = String(value);
+  return div.innerHTML;
+}
+
+// Mirrors templates/sessions/session_card.html
+function sessionCard(session, options) {
+  const grandPrix = session.type === "GRAND_PRIX";
+  const formats = options.formats;
+  let availability = "text-success";
+  if (session.available <= 3) {
+    availability = "text-danger";
+  } else if (session.available <= 5) {
+    availability = "text-warning";
+  }
+  const status =
+    session.available <= 0
+      ? '<span class="badge bg-danger">Fully Booked</span>'
+      : '<span class="badge bg-success">Available</span>';
+  const bookedBadge = options.booked.has(session.id)
+    ? '<span class="badge bg-info booked-overlay"><i class="fas fa-bookmark"></i> Booked</span>'
+    : "";
+  const time = function (date) {
+    return formats.time.format(date).replace(/\s/g, " ");
+  };
+  return (
+    '<div class="col-md-6 col-lg-4">' +
+    '<article class="card session-card h-100">' +
+    '<div class="card-header ' +
+    (grandPrix ? "bg-warning" : "bg-info text-white") +
+    '"><h3 class="h5 mb-0"><i class="fas fa-' +
+    (grandPrix ? "trophy" : "users") +
+    '" aria-hidden="true"></i> ' +
+    escapeHtml(options.feed.types[session.type] || session.type) +
+    "</h3></div>" +
+    '<div class="card-body d-flex flex-column"><div class="mb-3">' +
+    '<p class="mb-2"><strong><i class="far fa-calendar" aria-hidden="true"></i> Date:</strong><br />' +
+    escapeHtml(formats.day.format(session.start)) +
+    "</p>" +
+    '<p class="mb-2"><strong><i class="far fa-clock" aria-hidden="true"></i> Time:</strong><br />' +
+    escapeHtml(time(session.start) + " - " + time(session.end)) +
+    "</p>" +
+    '<p class="mb-2"><strong><i class="fas fa-tag" aria-hidden="true"></i> Price:</strong><br />' +
+    '<span class="h5 text-primary mb-0">&euro;' +
+    escapeHtml(session.price) +
+    "</span></p>" +
+    '<p class="mb-2"><strong><i class="fas fa-users" aria-hidden="true"></i> Availability:</strong><br />' +
+    '<span class="' +
+    availability +
+    '">' +
+    session.available +
+    " / " +
+    session.capacity +
+    " spots available</span></p>" +
+    status +
+    "</div>" +
+    '<div class="mt-auto"><a href="' +
+    escapeHtml(options.feed.detail_url_prefix + session.id + "/") +
+    '" class="btn btn-primary w-100"><i class="fas fa-info-circle"></i> View Details</a></div>' +
+    "</div>" +
+    bookedBadge +
+    "</article></div>"
+  );
+}
+
+function renderSessions(results, sessions, options) {
+  const heading = results.querySelector("#sessions-heading");
+  let html;
+  if (sessions.length) {
+    html =
+      '<div class="row g-4">' +
+      sessions
+        .map(function (session) {
+          return sessionCard(session, options);
+        })
+        .join("") +
+      "</div>";
+  } else {
+    html =
+      '<div class="alert alert-info" role="status"><h3 class="h5">' +
+      '<i class="fas fa-info-circle"></i> No Sessions Found</h3><p class="mb-0">' +
+      (options.filtered
+        ? "No sessions match your current filters. Try adjusting your search criteria or clearing the filters."
+        : "There are currently no upcoming racing sessions available. Please check back later or contact us for more information.") +
+      "</p></div>";
+  }
+  results.innerHTML = "";
+  results.appendChild(heading);
+  results.insertAdjacentHTML("beforeend", html);
+}
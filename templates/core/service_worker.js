@@ -0,0 +1,168 @@
+// KartControl service worker, rendered by core.views.service_worker.
+// Cache names carry the static manifest hash, so every deploy starts with
+// fresh caches and the old ones are deleted when this worker activates.
+// Pages are also cached per user: pages register the worker with a
+// ?user= id (core.templatetags.service_worker), and signing in as someone
+// else installs it again under a new page cache.
+{% if enabled %}
+const CONFIG = {{ config|safe }};
+const USER = new URL(self.location.href).searchParams.get("user") || "anonymous";
+const STATIC_CACHE = "kartcontrol-static-" + CONFIG.version;
+const PAGE_CACHE = "kartcontrol-pages-" + CONFIG.version + "-" + USER;
+
+self.addEventListener("install", function (event) {
+  event.waitUntil(
+    caches
+      .open(STATIC_CACHE)
+      .then(function (cache) {
+        return cache.addAll(CONFIG.precache);
+      })
+      .then(function () {
+        return self.skipWaiting();
+      }),
+  );
+});
+
+self.addEventListener("activate", function (event) {
+  event.waitUntil(
+    caches
+      .keys()
+      .then(function (names) {
+        return Promise.all(
+          names
+            .filter(function (name) {
+              return name !== STATIC_CACHE && name !== PAGE_CACHE;
+            })
+            .map(function (name) {
+              return caches.delete(name);
+            }),
+        );
+      })
+      .then(function () {
+        return self.clients.claim();
+      }),
+  );
+});
+
+self.addEventListener("fetch", function (event) {
+  const request = event.request;
+  const url = new URL(request.url);
+  const sameOrigin = url.origin === self.location.origin;
+
+  if (request.method !== "GET") {
+    // Bookings, cancellations and logging out all POST, and each makes the
+    // cached pages (which hold the driver's own bookings) out of date
+    if (sameOrigin) {
+      event.waitUntil(caches.delete(PAGE_CACHE));
+    }
+    return;
+  }
+  if (sameOrigin && url.pathname.startsWith(CONFIG.static_url)) {
+    event.respondWith(cacheFirst(request));
+  } else if (CONFIG.cdn_origins.indexOf(url.origin) !== -1) {
+    event.respondWith(cacheFirst(request));
+  } else if (sameOrigin && CONFIG.revalidate.indexOf(url.pathname) !== -1) {
+    event.respondWith(staleWhileRevalidate(event, request));
+  } else if (
+    sameOrigin &&
+    request.mode === "navigate" &&
+    CONFIG.offline_prefixes.some(function (prefix) {
+      return url.pathname.startsWith(prefix);
+    })
+  ) {
+    event.respondWith(networkFirst(request));
+  }
+});
+
+// Only complete, unredirected responses are worth keeping; a redirect
+// usually means the login page
+function isCacheable(response) {
+  return response.ok && !response.redirected;
+}
+
+// Navigations see redirects as opaque responses, other fetches follow them
+function isRedirect(response) {
+  return response.type === "opaqueredirect" || response.redirected;
+}
+
+function cacheFirst(request) {
+  return caches.match(request).then(function (cached) {
+    if (cached) {
+      return cached;
+    }
+    return fetch(request).then(function (response) {
+      if (isCacheable(response)) {
+        const copy = response.clone();
+        caches.open(STATIC_CACHE).then(function (cache) {
+          cache.put(request, copy);
+        });
+      }
+      return response;
+    });
+  });
+}
+
+// Answer from the cache at once and refresh it in the background
+function staleWhileRevalidate(event, request) {
+  return caches.open(PAGE_CACHE).then(function (cache) {
+    return cache.match(request).then(function (cached) {
+      const network = fetch(request).then(function (response) {
+        if (isCacheable(response)) {
+          return cache.put(request, response.clone()).then(function () {
+            return response;
+          });
+        }
+        return response;
+      });
+      if (cached) {
+        event.waitUntil(network.catch(function () {}));
+        return cached;
+      }
+      return network;
+    });
+  });
+}
+
+// Session and booking pages come from the network, falling back to this
+// user's last copy when offline. A redirect (signed out, or the session
+// expired) drops the copy so it cannot be shown to whoever signs in next.
+function networkFirst(request) {
+  return caches.open(PAGE_CACHE).then(function (cache) {
+    return fetch(request)
+      .then(function (response) {
+        if (isCacheable(response)) {
+          cache.put(request, response.clone());
+        } else if (isRedirect(response)) {
+          cache.delete(request);
+        }
+        return response;
+      })
+      .catch(function () {
+        return cache.match(request).then(function (cached) {
+          return cached || Response.error();
+        });
+      });
+  });
+}
+{% else %}
+// Disabled, or no static manifest to version the caches by: remove the
+// caches of any earlier worker and unregister
+self.addEventListener("install", function () {
+  self.skipWaiting();
+});
+
+self.addEventListener("activate", function (event) {
+  event.waitUntil(
+    caches
+      .keys()
+      .then(function (names) {
+        return Promise.all(names.map(function (name) {
+          return caches.delete(name);
+        }));
+      })
+      .then(function () {
+        return self.registration.unregister();
+      }),
+  );
+});
+{% endif %}